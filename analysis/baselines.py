@@ -0,0 +1,174 @@
+"""
+Références de consommation par équipement et heure de la journée, et z-scores.
+
+Chaque mesure est comparée à la moyenne et à l'écart-type des mesures du même
+équipement à la même heure (une climatisation chargée à 14 h n'est pas comparée
+à un éclairage la nuit). Quand un groupe équipement × heure compte trop peu de
+mesures, la référence de l'équipement entier est utilisée, puis la référence
+globale. Tous les calculs sont des réductions groupées NumPy (np.bincount) :
+aucune boucle Python par mesure ni par groupe.
+"""
+import numpy as np
+
+# Niveau de la référence retenue pour chaque mesure
+NIVEAU_EQUIPEMENT_HEURE = 0
+NIVEAU_EQUIPEMENT = 1
+NIVEAU_GLOBAL = 2
+
+
+def _codes_denses(entiers):
+    """Indices 0..k-1 pour des identifiants entiers (directs s'ils sont petits et positifs)."""
+    entiers = np.asarray(entiers, dtype=np.int64)
+    if len(entiers) and entiers.min() >= 0 and entiers.max() <= 4 * len(entiers) + 1024:
+        return entiers, int(entiers.max()) + 1
+    uniques, inverse = np.unique(entiers, return_inverse=True)
+    return inverse.ravel(), len(uniques)
+
+
+def stats_groupes(codes, valeurs, nb_groupes):
+    """
+    Effectif, moyenne et écart-type (de population) de chaque groupe, en deux
+    passes np.bincount (la seconde sur les écarts à la moyenne, numériquement stable).
+
+    Returns:
+        tuple: (effectifs, moyennes, ecarts_types), tableaux de longueur nb_groupes.
+    """
+    effectifs = np.bincount(codes, minlength=nb_groupes)
+    sommes = np.bincount(codes, weights=valeurs, minlength=nb_groupes)
+    moyennes = np.divide(sommes, effectifs, out=np.zeros(nb_groupes), where=effectifs > 0)
+    ecarts = valeurs - moyennes[codes]
+    m2 = np.bincount(codes, weights=ecarts * ecarts, minlength=nb_groupes)
+    variances = np.divide(m2, effectifs, out=np.zeros(nb_groupes), where=effectifs > 0)
+    return effectifs, moyennes, np.sqrt(variances)
+
+
+def scores_z(valeurs, id_equipement, heures, min_mesures=3):
+    """
+    Z-score de chaque mesure par rapport à la référence équipement × heure.
+
+    Args:
+        valeurs (array-like): Énergies (float64).
+        id_equipement (array-like): Identifiant d'équipement de chaque mesure.
+        heures (array-like): Heure 0..23 de chaque mesure (-1 si inconnue, voir
+            utils.date_utils.heure_du_jour) ; sans heure, la référence de l'équipement est utilisée.
+        min_mesures (int): Effectif minimal d'un groupe pour servir de référence.
+
+    Returns:
+        dict: {
+            "z_score": float64 (0 si la référence n'a aucune dispersion),
+            "moyenne": float64, "ecart_type": float64 (référence retenue),
+            "niveau": int8 (NIVEAU_EQUIPEMENT_HEURE, NIVEAU_EQUIPEMENT ou NIVEAU_GLOBAL)
+        }
+    """
+    valeurs = np.asarray(valeurs, dtype=np.float64)
+    heures = np.asarray(heures, dtype=np.int64)
+    n = len(valeurs)
+    if n == 0:
+        vide = np.empty(0)
+        return {"z_score": vide, "moyenne": vide, "ecart_type": vide, "niveau": np.empty(0, dtype=np.int8)}
+
+    equipements, nb_equipements = _codes_denses(id_equipement)
+    # 25 créneaux par équipement : 24 heures + « heure inconnue », jamais retenu comme référence
+    creneaux = np.where(heures >= 0, heures, 24)
+    codes_fins = equipements * 25 + creneaux
+
+    eff_fin, moy_fin, et_fin = stats_groupes(codes_fins, valeurs, nb_equipements * 25)
+    eff_eq, moy_eq, et_eq = stats_groupes(equipements, valeurs, nb_equipements)
+    moy_glob, et_glob = valeurs.mean(), valeurs.std()
+
+    fin_valide = (eff_fin[codes_fins] >= min_mesures) & (creneaux < 24)
+    eq_valide = eff_eq[equipements] >= min_mesures
+    niveau = np.where(fin_valide, NIVEAU_EQUIPEMENT_HEURE,
+                      np.where(eq_valide, NIVEAU_EQUIPEMENT, NIVEAU_GLOBAL)).astype(np.int8)
+    moyenne = np.where(fin_valide, moy_fin[codes_fins], np.where(eq_valide, moy_eq[equipements], moy_glob))
+    ecart_type = np.where(fin_valide, et_fin[codes_fins], np.where(eq_valide, et_eq[equipements], et_glob))
+
+    # Écart-type nul aux arrondis près (groupe de valeurs identiques) : pas d'écart significatif
+    disperse = ecart_type > 1e-9 * np.maximum(np.abs(moyenne), 1.0)
+    z = np.divide(valeurs - moyenne, ecart_type, out=np.zeros(n), where=disperse)
+    return {"z_score": z, "moyenne": moyenne, "ecart_type": ecart_type, "niveau": niveau}
+
+
+def _milieux(effectifs):
+    """Indices des deux éléments centraux d'une ligne triée de `effectifs` valeurs."""
+    return (effectifs - 1) // 2, effectifs // 2
+
+
+def _mediane_triee(lignes_triees, milieux):
+    bas, haut = milieux
+    return 0.5 * (np.take_along_axis(lignes_triees, bas[:, None], axis=1)[:, 0]
+                  + np.take_along_axis(lignes_triees, haut[:, None], axis=1)[:, 0])
+
+
+def scores_robustes_glissants(valeurs, id_equipement, fenetre=24, min_mesures=None, taille_lot=8192):
+    """
+    Score robuste de chaque mesure par rapport aux `fenetre` mesures précédentes du
+    même équipement : (x - médiane) / (1.4826 * MAD), insensible aux pics isolés
+    qui gonflent un écart-type.
+
+    Les séries de chaque équipement sont mises bout à bout, précédées de `fenetre`
+    NaN, et découpées en fenêtres par sliding_window_view (vue sans copie). Médiane
+    et MAD sont lues dans les fenêtres triées, par lots de `taille_lot` fenêtres
+    (O(N · fenetre · log fenetre) en C, mémoire bornée) ; les fenêtres incomplètes
+    du début de chaque série n'utilisent que leurs mesures disponibles.
+
+    Args:
+        valeurs (array-like): Énergies, dans l'ordre chronologique.
+        id_equipement (array-like): Équipement de chaque mesure.
+        fenetre (int): Nombre de mesures précédentes servant de référence.
+        min_mesures (int, optional): Mesures précédentes minimales pour noter une
+            mesure (par défaut la moitié de la fenêtre) ; sinon le score vaut NaN.
+
+    Returns:
+        dict: {"score": float64 (NaN si non noté), "mediane": float64, "mad": float64},
+              dans l'ordre des mesures en entrée.
+    """
+    if fenetre < 1:
+        raise ValueError("La fenêtre doit contenir au moins une mesure.")
+    if min_mesures is None:
+        min_mesures = max(1, fenetre // 2)
+    valeurs = np.asarray(valeurs, dtype=np.float64)
+    n = len(valeurs)
+    score, mediane, mad = np.full(n, np.nan), np.full(n, np.nan), np.full(n, np.nan)
+    if n == 0:
+        return {"score": score, "mediane": mediane, "mad": mad}
+
+    # Tri stable par équipement : chaque série reste chronologique
+    equipements, _ = _codes_denses(id_equipement)
+    ordre = np.argsort(equipements, kind="stable")
+    triees = valeurs[ordre]
+    nouveau_groupe = np.r_[True, equipements[ordre][1:] != equipements[ordre][:-1]]
+    numero_groupe = np.cumsum(nouveau_groupe) - 1
+    debut_groupe = np.flatnonzero(nouveau_groupe)
+    rang = np.arange(n) - debut_groupe[numero_groupe] # Nombre de mesures précédentes
+
+    # Chaque série précédée de `fenetre` NaN : la fenêtre de la mesure i finit juste avant elle
+    position = np.arange(n) + fenetre * (numero_groupe + 1)
+    completees = np.full(n + fenetre * len(debut_groupe), np.nan)
+    completees[position] = triees
+    fenetres = np.lib.stride_tricks.sliding_window_view(completees, fenetre)
+
+    med_triee, mad_triee = np.full(n, np.nan), np.full(n, np.nan)
+    notees = np.flatnonzero(rang >= min_mesures)
+    for i in range(0, len(notees), taille_lot):
+        lot = notees[i:i + taille_lot]
+        # Tri de petites lignes : plus rapide que np.median ; les NaN de bord finissent en queue
+        valeurs_fenetres = np.sort(fenetres[position[lot] - fenetre], axis=1)
+        milieux = _milieux(np.minimum(rang[lot], fenetre))
+        med = _mediane_triee(valeurs_fenetres, milieux)
+        med_triee[lot] = med
+        mad_triee[lot] = _mediane_triee(np.sort(np.abs(valeurs_fenetres - med[:, None]), axis=1), milieux)
+
+    # 1.4826 * MAD estime l'écart-type d'une loi normale
+    echelle = 1.4826 * mad_triee
+    ecarts = triees - med_triee
+    score_trie = np.full(n, np.nan)
+    disperse = echelle > 1e-9 * np.maximum(np.abs(med_triee), 1.0)
+    score_trie[disperse] = ecarts[disperse] / echelle[disperse]
+    # MAD nulle (fenêtre en majorité constante) : seul un écart à la médiane est anormal
+    constante = ~disperse & ~np.isnan(med_triee)
+    score_trie[constante] = np.where(np.abs(ecarts[constante]) > 1e-9 * np.maximum(np.abs(med_triee[constante]), 1.0),
+                                     np.copysign(np.inf, ecarts[constante]), 0.0)
+
+    score[ordre], mediane[ordre], mad[ordre] = score_trie, med_triee, mad_triee
+    return {"score": score, "mediane": mediane, "mad": mad}
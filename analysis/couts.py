@@ -1,12 +1,30 @@
+from datetime import date
+
+import numpy as np
+
+from analysis.reechantillonnage import repartir_sur_grille, totaux_par_periode
+from analysis.simulation_coupures import profil_horaire, simuler_monte_carlo
+from model.agregat_model import AgregatModel
+from model.batiment_model import BatimentModel
 from model.consommation_model import ConsommationModel
+from model.coupure_model import CoupureModel
 from model.source_model import SourceModel
-from datetime import datetime
+from model.tarif_model import TarifModel
+from utils.date_utils import regrouper_periodes, formater_cles
 
 
 class Couts:
+    # Chaque scénario Monte Carlo coûte quelques tableaux float64 temporaires :
+    # au-delà, la mémoire demandée (plusieurs Go) ferait tomber l'application
+    NB_SCENARIOS_MAX = 1_000_000
+
     def __init__(self):
         self.consommation_model = ConsommationModel()
         self.source_model = SourceModel()
+        self.agregat_model = AgregatModel()
+        self.batiment_model = BatimentModel()
+        self.tarif_model = TarifModel()
+        self.coupure_model = CoupureModel()
 
     # ---------------------------
     # Récupération coût kWh
@@ -14,18 +32,25 @@ class Couts:
     def _get_cout_kwh(self, nom_source):
         return self.source_model.get_cout_kwh_by_source_name(nom_source)
 
+    def _couts_horaires(self, id_batiment=None, id_source=None):
+        """
+        Énergie horaire des agrégats (voir AgregatModel.get_energie_horaire) et son
+        coût au tarif en vigueur à chaque heure (historique TARIF_SOURCE), en une passe.
+        """
+        horaire = self.agregat_model.get_energie_horaire(id_batiment=id_batiment, id_source=id_source)
+        grille = self.tarif_model.get_grille()
+        horaire["cout"] = grille.couts(horaire["id_source"], horaire["heure"], horaire["energie_kwh"])
+        return horaire
+
     # ---------------------------
     # Coût total par source
     # ---------------------------
     def calculer_cout_total_par_source(self, nom_source):
-        cout_kwh = self._get_cout_kwh(nom_source)
-        if cout_kwh is None:
+        id_source = self.source_model.get_source_id_by_name(nom_source)
+        if id_source is None:
             return 0.0
 
-        consommations = self.consommation_model.get_consommation_by_source(nom_source)
-        total_energie_kwh = sum(item["energie_kwh"] for item in consommations)
-
-        return total_energie_kwh * cout_kwh
+        return float(self._couts_horaires(id_source=id_source)["cout"].sum())
 
     def calculer_cout_total_jirama(self):
         return self.calculer_cout_total_par_source("JIRAMA")
@@ -49,30 +74,100 @@ class Couts:
     # ---------------------------
     # Coût par période
     # ---------------------------
-    def calculer_cout_par_periode(self, periode="jour"):
-        all_consommations = self.consommation_model.get_all_consommation()
-        couts_agreges = {}
+    def calculer_cout_par_periode(self, periode="jour", id_batiment=None, repartir=False, colonnes=None):
+        """
+        Coût total par période ('jour', 'semaine' ou 'mois'), calculé sur l'agrégat
+        horaire (voir model.agregat_model) au tarif en vigueur à chaque heure.
+
+        Les agrégats attribuent chaque mesure à la période de son début. Avec
+        repartir=True, le coût de chaque mesure est réparti au prorata de sa durée
+        (voir analysis.reechantillonnage) : une mesure de 3 h commencée à 23 h le
+        dernier jour du mois compte pour 2 h dans le mois suivant. `colonnes` évite
+        de relire CONSOMMATION (voir repartir_couts).
+
+        Returns:
+            dict: {cle_periode: cout}, dans l'ordre chronologique.
+        """
+        if periode not in ("jour", "semaine", "mois"):
+            raise ValueError("La période doit être 'jour', 'semaine' ou 'mois'.")
+
+        if repartir:
+            grille = self.repartir_couts(id_batiment=id_batiment, colonnes=colonnes)
+            totaux = totaux_par_periode(grille, periode)
+            return dict(zip(totaux["cles"].tolist(), totaux["totaux"][0].tolist()))
 
-        for conso in all_consommations:
-            date_heure = datetime.fromisoformat(conso["date_heure"])
-            energie_kwh = conso["energie_kwh"]
-            nom_source = conso["nom_source"]
+        horaire = self._couts_horaires(id_batiment=id_batiment)
+        debuts, codes = regrouper_periodes(horaire["heure"], periode)
+        totaux = np.bincount(codes, weights=horaire["cout"], minlength=len(debuts))
+        return dict(zip(formater_cles(debuts, periode).tolist(), totaux.tolist()))
 
-            cout_kwh = self._get_cout_kwh(nom_source)
-            if cout_kwh is None:
-                continue
+    def repartir_couts(self, pas_minutes=60, par=None, id_batiment=None, date_debut=None, date_fin=None,
+                       colonnes=None):
+        """
+        Coût des consommations (au tarif en vigueur au début de chaque mesure)
+        réparti sur une grille régulière au prorata de la durée de chaque mesure.
 
-            if periode == "jour":
-                cle = date_heure.date().isoformat()
-            elif periode == "mois":
-                cle = date_heure.strftime("%Y-%m")
-            else:
-                raise ValueError("La période doit être 'jour' ou 'mois'.")
+        Args:
+            pas_minutes (int): Pas de la grille (15, 60...).
+            par (str, optional): Colonne de ventilation ('id_equipement',
+                'id_source' ou 'id_batiment') ; None pour une seule ligne de totaux.
+            id_batiment (int, optional): Restreindre à un bâtiment.
+            date_debut, date_fin (optional): Bornes sur le début des mesures.
+            colonnes (dict, optional): Colonnes déjà chargées par
+                ConsommationModel.get_consommation_colonnes avec les mêmes filtres.
 
-            couts_agreges.setdefault(cle, 0.0)
-            couts_agreges[cle] += energie_kwh * cout_kwh
+        Returns:
+            dict: Résultat de repartir_sur_grille ("grille", "etiquettes", "matrice").
+        """
+        if colonnes is None:
+            colonnes = self.consommation_model.get_consommation_colonnes(
+                building_id=id_batiment, date_debut=date_debut, date_fin=date_fin
+            )
+        couts = self.tarif_model.get_grille().couts(colonnes["id_source"], colonnes["date_heure"], colonnes["energie_kwh"])
 
-        return couts_agreges
+        return repartir_sur_grille(
+            colonnes["date_heure"], colonnes["duree_minutes"], couts,
+            pas_minutes=pas_minutes, lignes=None if par is None else colonnes[par],
+        )
+
+    def calculer_cout_par_periode_detaille(self, periode="jour", par_batiment=True, par_source=True):
+        """
+        Coût par période ventilé par bâtiment et/ou par source, en un aller-retour.
+
+        Returns:
+            list: Dicts {"periode", ["batiment"], ["nom_source"], "energie_kwh", "cout"}.
+        """
+        if periode not in ("jour", "semaine", "mois"):
+            raise ValueError("La période doit être 'jour', 'semaine' ou 'mois'.")
+
+        horaire = self._couts_horaires()
+        batiments = {b["id_batiment"]: b["nom"] for b in self.batiment_model.get_all_batiments()}
+        sources = {s["id_source"]: s["nom_source"] for s in self.source_model.get_all_sources()}
+        connus = np.isin(horaire["id_batiment"], list(batiments)) & np.isin(horaire["id_source"], list(sources))
+        debuts, codes = regrouper_periodes(horaire["heure"][connus], periode)
+
+        # Groupes (période, [bâtiment], [source]), dans l'ordre de ces clés
+        colonnes = [codes]
+        if par_batiment:
+            colonnes.append(horaire["id_batiment"][connus])
+        if par_source:
+            colonnes.append(horaire["id_source"][connus])
+        groupes, inverse = np.unique(np.column_stack(colonnes), axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+        energies = np.bincount(inverse, weights=horaire["energie_kwh"][connus], minlength=len(groupes))
+        couts = np.bincount(inverse, weights=horaire["cout"][connus], minlength=len(groupes))
+
+        cles = formater_cles(debuts, periode)
+        resultats = []
+        for groupe, energie, cout in zip(groupes.tolist(), energies.tolist(), couts.tolist()):
+            ligne = {"periode": str(cles[groupe[0]])}
+            if par_batiment:
+                ligne["batiment"] = batiments[groupe[1]]
+            if par_source:
+                ligne["nom_source"] = sources[groupe[-1]]
+            ligne.update(energie_kwh=energie, cout=cout)
+            resultats.append(ligne)
+        return resultats
 
     # ---------------------------
     # Surcoût des coupures (placeholder)
@@ -104,17 +199,20 @@ class Couts:
             return None, "Coût du 'Groupe électrogène' non trouvé. Assurez-vous qu'il est configuré."
 
         # 2. Estimate average consumption per hour
-        all_consos = self.consommation_model.get_all_consommation()
-        if not all_consos:
+        total_kwh = 0.0
+        total_duree_minutes = 0
+        nb_consos = 0
+        for conso in self.consommation_model.iter_all_consommation():
+            total_kwh += conso["energie_kwh"]
+            # Calculate total duration in hours for all recorded consumptions
+            # This is a simplification; a more accurate model would consider only "active" hours or specific periods.
+            total_duree_minutes += conso["duree_minutes"]
+            nb_consos += 1
+        if nb_consos == 0:
             return None, "Aucune donnée de consommation disponible pour estimer l'impact."
-        
-        total_kwh = sum(c["energie_kwh"] for c in all_consos)
-        
-        # Calculate total duration in hours for all recorded consumptions
-        # This is a simplification; a more accurate model would consider only "active" hours or specific periods.
-        total_duree_minutes = sum(c["duree_minutes"] for c in all_consos)
+
         total_duree_hours = total_duree_minutes / 60.0
-        
+
         if total_duree_hours == 0:
             return None, "Durée totale de consommation enregistrée est nulle, impossible d'estimer la moyenne."
 
@@ -128,3 +226,47 @@ class Couts:
         
         return estimated_cost, None
 
+    def simuler_coupures_monte_carlo(self, id_batiment=None, nb_scenarios=100_000, graine=None):
+        """
+        Distribution du coût des coupures d'un bâtiment (voir analysis.simulation_coupures).
+
+        Les heures de début et durées sont tirées dans l'historique des coupures
+        terminées du bâtiment, la charge suit son profil horaire de consommation et
+        l'énergie est payée au tarif horaire actuel du groupe électrogène.
+
+        Args:
+            id_batiment (int, optional): Bâtiment simulé ; None pour l'ensemble du parc.
+            nb_scenarios (int): Nombre de coupures tirées (au plus NB_SCENARIOS_MAX).
+            graine (int, optional): Graine pour des résultats reproductibles.
+
+        Returns:
+            tuple: (resultat, error_message) ; resultat est le dict de
+                   simuler_monte_carlo ("moyenne", "p50", "p95", "pire"...) ou None.
+        """
+        if nb_scenarios <= 0:
+            return None, "Le nombre de scénarios doit être un nombre positif."
+        if nb_scenarios > self.NB_SCENARIOS_MAX:
+            return None, f"Le nombre de scénarios est limité à {self.NB_SCENARIOS_MAX:,}."
+
+        id_groupe = self.source_model.get_source_id_by_name("Groupe électrogène")
+        if id_groupe is None:
+            return None, "Coût du 'Groupe électrogène' non trouvé. Assurez-vous qu'il est configuré."
+
+        coupures = self.coupure_model.get_coupures_colonnes()
+        terminees = ~coupures["en_cours"]
+        if id_batiment is not None:
+            terminees &= coupures["id_batiment"] == id_batiment
+        debuts = coupures["debut_coupure"][terminees]
+        if len(debuts) == 0:
+            return None, "Aucune coupure terminée dans l'historique pour tirer des scénarios."
+        heures_debut = (debuts - debuts.astype("datetime64[D]")) / np.timedelta64(1, "h")
+        durees = (coupures["fin_coupure"][terminees] - debuts) / np.timedelta64(1, "h")
+
+        colonnes = self.consommation_model.get_consommation_colonnes(building_id=id_batiment)
+        profil = profil_horaire(colonnes["date_heure"], colonnes["duree_minutes"], colonnes["energie_kwh"])
+        if not profil.any():
+            return None, "Aucune donnée de consommation disponible pour estimer l'impact."
+
+        heures = np.datetime64(date.today(), "h") + np.arange(24)
+        prix_groupe = self.tarif_model.get_grille().prix(np.full(24, id_groupe), heures)
+        return simuler_monte_carlo(heures_debut, durees, profil, prix_groupe, nb_scenarios, graine), None
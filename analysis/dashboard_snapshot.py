@@ -0,0 +1,162 @@
+"""
+Instantané du tableau de bord (MainView) calculé en une passe par rafraîchissement.
+
+Avant, chaque composant (CardsFrame, MainChart, SidebarStats, AlertsTable)
+créait ses propres Couts / Statistique / Efficacite et relisait des données
+communes : coupures en cours et historique, anomalies, bilan des équipements.
+DashboardService lit chaque donnée une seule fois (les colonnes de CONSOMMATION
+servent à la fois aux anomalies et au coût mensuel réparti) et remet aux
+composants un DashboardSnapshot immuable, avec la durée de chaque étape :
+
+    snapshot = DashboardService().snapshot(id_batiment)
+    cards_frame.update_data(snapshot)
+    print(f"{snapshot.duree_totale * 1000:.0f} ms", dict(snapshot.durees))
+
+Pour l'actualisation automatique, seuls les champs qui dépendent des tables
+modifiées (voir DEPENDANCES et model.modification_model) sont recalculés ; les
+autres sont repris de l'instantané précédent :
+
+    champs = champs_a_recalculer({"COUPURE"}) # {"coupures"}
+    snapshot = service.snapshot(id_batiment, champs=champs, precedent=snapshot)
+"""
+import time
+from dataclasses import dataclass, replace
+from types import MappingProxyType
+
+from analysis.couts import Couts
+from analysis.efficacite import Efficacite
+from analysis.statistiques import Statistique
+from model.agregat_model import AgregatModel
+from model.coupure_model import CoupureModel
+
+# Tables lues pour calculer chaque champ de l'instantané
+DEPENDANCES = {
+    "coupures": ("COUPURE", "BATIMENT"),
+    "anomalies": ("CONSOMMATION", "EQUIPEMENT", "SOURCE_ENERGIE", "BATIMENT"),
+    "couts_par_mois": ("CONSOMMATION", "EQUIPEMENT", "SOURCE_ENERGIE", "BATIMENT", "TARIF_SOURCE"),
+    "comparaison_couts": ("CONSOMMATION", "SOURCE_ENERGIE", "TARIF_SOURCE"),
+    "top_equipements": ("CONSOMMATION", "EQUIPEMENT", "TYPE_EQUIPEMENT", "BATIMENT"),
+    "totaux_heure": ("CONSOMMATION", "EQUIPEMENT"), # Agrégats par bâtiment de l'équipement
+}
+
+# Étape de calcul -> champs qui en ont besoin (les colonnes servent à deux champs)
+ETAPES = {
+    "coupures": {"coupures"},
+    "colonnes": {"anomalies", "couts_par_mois"},
+    "anomalies": {"anomalies"},
+    "couts_mois": {"couts_par_mois"},
+    "comparaison_couts": {"comparaison_couts"},
+    "bilan_equipements": {"top_equipements"},
+    "top_equipements": {"top_equipements"},
+    "courbe": {"totaux_heure"},
+}
+
+
+def champs_a_recalculer(tables_modifiees):
+    """Champs de l'instantané qui lisent au moins une des tables modifiées."""
+    tables_modifiees = set(tables_modifiees)
+    return {champ for champ, tables in DEPENDANCES.items() if tables_modifiees.intersection(tables)}
+
+
+def _figer(lignes):
+    """Liste de dicts -> tuple de mappings en lecture seule."""
+    return tuple(MappingProxyType(dict(ligne)) for ligne in lignes)
+
+
+@dataclass(frozen=True)
+class DashboardSnapshot:
+    id_batiment: object
+    coupures: tuple # Toutes les coupures, les plus récentes d'abord
+    coupures_en_cours: tuple
+    anomalies: tuple # Anomalies contextuelles (z-score équipement × heure)
+    couts_par_mois: MappingProxyType # {'YYYY-MM': coût}, réparti au prorata des durées
+    comparaison_couts: MappingProxyType # Comme Couts.comparer_couts_sources
+    top_equipements: tuple
+    totaux_heure: MappingProxyType # {'YYYY-MM-DD HH:00:00': kWh} du bâtiment sélectionné
+    durees: MappingProxyType # {étape: secondes}, étapes faites pour cet instantané
+    recalcules: frozenset # Champs calculés pour cet instantané (les autres viennent du précédent)
+
+    @property
+    def duree_totale(self):
+        return sum(self.durees.values())
+
+    @property
+    def source_actuelle(self):
+        return "Groupe électrogène" if self.coupures_en_cours else "JIRAMA"
+
+    @property
+    def nombre_alertes(self):
+        return len(self.coupures_en_cours) + len(self.anomalies)
+
+
+class DashboardService:
+    """Analyseurs partagés par tous les rafraîchissements du tableau de bord."""
+
+    def __init__(self):
+        self.couts = Couts()
+        self.statistique = Statistique()
+        self.efficacite = Efficacite()
+        self.coupure_model = CoupureModel()
+        self.agregat_model = AgregatModel()
+
+    def snapshot(self, id_batiment=None, top_n=5, progression=None, champs=None, precedent=None):
+        """
+        Calcule les données du tableau de bord.
+
+        Args:
+            id_batiment (int, optional): Bâtiment de la courbe horaire ; les
+                cartes, la barre latérale et les alertes restent globales.
+            top_n (int): Nombre d'équipements énergivores.
+            progression (callable, optional): Appelé avec le pourcentage d'étapes
+                terminées après chacune (voir view.chargement).
+            champs (iterable, optional): Champs à recalculer (clés de DEPENDANCES) ;
+                tous par défaut.
+            precedent (DashboardSnapshot, optional): Instantané dont on reprend
+                les autres champs ; sans lui, tout est calculé.
+
+        Returns:
+            DashboardSnapshot
+        """
+        a_calculer = set(DEPENDANCES) if champs is None or precedent is None else set(champs)
+        if precedent is not None and precedent.id_batiment != id_batiment:
+            a_calculer.add("totaux_heure")
+        etapes = [etape for etape, besoins in ETAPES.items() if besoins & a_calculer]
+        durees = {}
+
+        def mesurer(etape, fonction, *args, **kwargs):
+            debut = time.perf_counter()
+            resultat = fonction(*args, **kwargs)
+            durees[etape] = time.perf_counter() - debut
+            if progression is not None:
+                progression(100 * len(durees) // len(etapes))
+            return resultat
+
+        valeurs = {}
+        if "coupures" in a_calculer:
+            coupures = mesurer("coupures", self.coupure_model.get_all_coupures)
+            valeurs["coupures"] = _figer(coupures)
+            valeurs["coupures_en_cours"] = _figer(c for c in coupures if c["fin_coupure"] is None)
+        if "colonnes" in etapes:
+            colonnes = mesurer("colonnes", self.statistique.model.get_consommation_colonnes)
+        if "anomalies" in a_calculer:
+            valeurs["anomalies"] = _figer(mesurer("anomalies", self.statistique.anomalies_contextuelles,
+                                                  colonnes=colonnes))
+        if "couts_par_mois" in a_calculer:
+            valeurs["couts_par_mois"] = MappingProxyType(mesurer(
+                "couts_mois", self.couts.calculer_cout_par_periode, "mois", repartir=True, colonnes=colonnes))
+        if "comparaison_couts" in a_calculer:
+            valeurs["comparaison_couts"] = MappingProxyType(mesurer("comparaison_couts",
+                                                                    self.couts.comparer_couts_sources))
+        if "top_equipements" in a_calculer:
+            # Le bilan d'Efficacite est mis en cache par instance : on le recalcule à chaque instantané
+            mesurer("bilan_equipements", self.efficacite.calculer_bilan)
+            valeurs["top_equipements"] = _figer(mesurer("top_equipements",
+                                                        self.efficacite.get_equipements_plus_energivores, top_n=top_n))
+        if "totaux_heure" in a_calculer:
+            valeurs["totaux_heure"] = MappingProxyType(mesurer("courbe", self.agregat_model.totaux_par_periode,
+                                                               "heure", id_batiment=id_batiment or None))
+
+        valeurs.update(id_batiment=id_batiment, durees=MappingProxyType(durees), recalcules=frozenset(a_calculer))
+        if precedent is None:
+            return DashboardSnapshot(**valeurs)
+        return replace(precedent, **valeurs)
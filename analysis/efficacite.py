@@ -1,8 +1,9 @@
 import numpy as np
-from datetime import datetime, timedelta
 
+from analysis.intervalles import joindre_intervalles
 from model.consommation_model import ConsommationModel
 from model.equipement_model import EquipementModel
+from model.source_model import SourceModel
 from model.type_equipement_model import TypeEquipementModel
 from model.coupure_model import CoupureModel # Import CoupureModel
 
@@ -12,6 +13,73 @@ class Efficacite:
         self.equipement_model = EquipementModel()
         self.type_equipement_model = TypeEquipementModel()
         self.coupure_model = CoupureModel() # Instantiate CoupureModel
+        self.source_model = SourceModel()
+        self._bilan = None # Résultat de calculer_bilan(), réutilisé par les lectures
+
+    def calculer_bilan(self):
+        """
+        Calcule en une seule passe groupée les indicateurs de tous les équipements
+        et de tous les types, puis les garde en mémoire pour les méthodes de lecture.
+
+        Returns:
+            dict: {
+                "equipements": {id_equipement: {"nom_equipement", "nom_batiment", "id_type",
+                                "conso_reelle_totale", "duree_minutes", "nb_mesures",
+                                "kwh_par_heure", "conso_theorique_estimee", "ecart_kwh",
+                                "pourcentage_ecart"}},
+                "types": {id_type: {"nom_type", "conso_theorique_type",
+                          "conso_reelle_moyenne_par_heure", "pourcentage_rendement"}}
+            }
+        """
+        totaux = self.consommation_model.get_totaux_par_equipement()
+
+        equipements = {}
+        cumul_types = {}
+        for equip in self.equipement_model.get_all_equipements():
+            total = totaux.get(equip["id_equipement"])
+            conso_reelle_totale = total["energie_kwh"] if total else 0.0
+            duree_minutes = total["duree_minutes"] if total else 0
+            heures = duree_minutes / 60.0
+
+            conso_theorique_estimee = equip["conso_theorique_type"] * heures # kWh
+            ecart_kwh = conso_reelle_totale - conso_theorique_estimee
+            equipements[equip["id_equipement"]] = {
+                "nom_equipement": equip["nom_equipement"],
+                "nom_batiment": equip["nom_batiment"],
+                "id_type": equip["id_type"],
+                "conso_reelle_totale": conso_reelle_totale,
+                "duree_minutes": duree_minutes,
+                "nb_mesures": total["nb_mesures"] if total else 0,
+                "kwh_par_heure": conso_reelle_totale / heures if heures else 0.0,
+                "conso_theorique_estimee": conso_theorique_estimee,
+                "ecart_kwh": ecart_kwh,
+                "pourcentage_ecart": (ecart_kwh / conso_theorique_estimee * 100) if conso_theorique_estimee else 0.0,
+            }
+
+            cumul = cumul_types.setdefault(equip["id_type"], [0.0, 0.0])
+            cumul[0] += conso_reelle_totale
+            cumul[1] += heures
+
+        types = {}
+        for type_equip in self.type_equipement_model.get_all_types_equipement():
+            conso_theorique_type = type_equip["consommation_theorique"] # kWh/heure
+            total_kwh, total_heures = cumul_types.get(type_equip["id_type"], (0.0, 0.0))
+            conso_reelle_moyenne_par_heure = total_kwh / total_heures if total_heures else 0.0
+            types[type_equip["id_type"]] = {
+                "nom_type": type_equip["nom_type"],
+                "conso_theorique_type": conso_theorique_type,
+                "conso_reelle_moyenne_par_heure": conso_reelle_moyenne_par_heure,
+                # >100% : l'équipement consomme plus que prévu (moins efficace)
+                "pourcentage_rendement": (conso_reelle_moyenne_par_heure / conso_theorique_type * 100) if conso_theorique_type else 0.0,
+            }
+
+        self._bilan = {"equipements": equipements, "types": types}
+        return self._bilan
+
+    def _get_bilan(self):
+        if self._bilan is None:
+            return self.calculer_bilan()
+        return self._bilan
 
     def calculer_efficacite_equipement(self, id_equipement):
         """
@@ -20,75 +88,35 @@ class Efficacite:
         Returns:
             dict: {
                 "nom_equipement": str,
+                "nom_batiment": str,
                 "conso_reelle_totale": float (kWh),
                 "conso_theorique_estimee": float (kWh),
                 "ecart_kwh": float,
                 "pourcentage_ecart": float (positive if real > theoretical)
             }
         """
-        equip_details = self.equipement_model.get_equipement_details(id_equipement)
-        if not equip_details:
+        equip = self._get_bilan()["equipements"].get(id_equipement)
+        if not equip:
             return None
-
-        conso_theorique_type = equip_details["conso_theorique_type"] # kWh/heure pour le type
-        
-        # Obtenir toutes les consommations pour cet équipement
-        all_conso_equip = self.consommation_model.get_consommation_by_equipement(id_equipement)
-        if not all_conso_equip:
-            return {
-                "nom_equipement": equip_details["nom_equipement"],
-                "conso_reelle_totale": 0.0,
-                "conso_theorique_estimee": 0.0,
-                "ecart_kwh": 0.0,
-                "pourcentage_ecart": 0.0
-            }
-
-        conso_reelle_totale = sum(item[1] for item in all_conso_equip) # sum of energie_kwh
-
-        # Estimer la consommation théorique basée sur la durée d'utilisation réelle
-        # et la consommation théorique par heure du type d'équipement
-        total_duree_minutes = sum(conso_item["duree_minutes"] for conso_item in self.consommation_model.get_all_consommation() if conso_item["id_equipement"] == id_equipement)
-        total_heures_utilisation = total_duree_minutes / 60.0
-        
-        conso_theorique_estimee = conso_theorique_type * total_heures_utilisation # kWh
-
-        ecart_kwh = conso_reelle_totale - conso_theorique_estimee
-        pourcentage_ecart = (ecart_kwh / conso_theorique_estimee * 100) if conso_theorique_estimee else 0.0
-
         return {
-            "nom_equipement": equip_details["nom_equipement"],
-            "nom_batiment": equip_details["nom_batiment"], # Added nom_batiment
-            "conso_reelle_totale": conso_reelle_totale,
-            "conso_theorique_estimee": conso_theorique_estimee,
-            "ecart_kwh": ecart_kwh,
-            "pourcentage_ecart": pourcentage_ecart
+            cle: equip[cle]
+            for cle in ("nom_equipement", "nom_batiment", "conso_reelle_totale",
+                        "conso_theorique_estimee", "ecart_kwh", "pourcentage_ecart")
         }
 
     def get_equipements_plus_energivores(self, top_n=5):
         """
         Identifie les équipements avec la consommation d'énergie totale la plus élevée.
         """
-        all_consommations = self.consommation_model.get_all_consommation()
-        
-        # Agrégation par équipement
-        conso_par_equipement = {}
-        for conso in all_consommations:
-            id_equipement = conso["id_equipement"]
-            if id_equipement not in conso_par_equipement:
-                conso_par_equipement[id_equipement] = 0.0
-            conso_par_equipement[id_equipement] += conso["energie_kwh"]
-
-        # Récupérer les détails des équipements et les trier
-        equipements_energivores = []
-        for id_equipement, total_kwh in conso_par_equipement.items():
-            equip_details = self.equipement_model.get_equipement_details(id_equipement)
-            if equip_details:
-                equipements_energivores.append({
-                    "nom_equipement": equip_details["nom_equipement"],
-                    "total_kwh": total_kwh,
-                    "nom_batiment": equip_details["nom_batiment"]
-                })
-        
+        equipements_energivores = [
+            {
+                "nom_equipement": equip["nom_equipement"],
+                "total_kwh": equip["conso_reelle_totale"],
+                "nom_batiment": equip["nom_batiment"]
+            }
+            for equip in self._get_bilan()["equipements"].values()
+            if equip["nb_mesures"]
+        ]
         equipements_energivores.sort(key=lambda x: x["total_kwh"], reverse=True)
         return equipements_energivores[:top_n]
 
@@ -96,18 +124,8 @@ class Efficacite:
         """
         Calcule la consommation moyenne en kWh par heure d'utilisation pour un équipement.
         """
-        all_conso_equip = self.consommation_model.get_consommation_by_equipement(id_equipement)
-        if not all_conso_equip:
-            return 0.0
-
-        total_energie_kwh = sum(item[1] for item in all_conso_equip)
-        total_duree_minutes = sum(conso_item["duree_minutes"] for conso_item in self.consommation_model.get_all_consommation() if conso_item["id_equipement"] == id_equipement)
-        
-        if total_duree_minutes == 0:
-            return 0.0
-        
-        total_heures_utilisation = total_duree_minutes / 60.0
-        return total_energie_kwh / total_heures_utilisation if total_heures_utilisation else 0.0
+        equip = self._get_bilan()["equipements"].get(id_equipement)
+        return equip["kwh_par_heure"] if equip else 0.0
     
     def calculer_rendement_par_type_equipement(self, id_type):
         """
@@ -122,101 +140,82 @@ class Efficacite:
                 "pourcentage_rendement": float (basé sur l'inverse de l'écart)
             }
         """
-        type_details = self.type_equipement_model.get_type_equipement_details(id_type)
-        if not type_details:
-            return None
-
-        conso_theorique_type = type_details["consommation_theorique"] # kWh/heure
-
-        equipements_de_ce_type = [e for e in self.equipement_model.get_all_equipements() if e["id_type"] == id_type]
-        if not equipements_de_ce_type:
-            return {
-                "nom_type": type_details["nom_type"],
-                "conso_theorique_type": conso_theorique_type,
-                "conso_reelle_moyenne_par_heure": 0.0,
-                "pourcentage_rendement": 0.0
-            }
-
-        total_conso_reelle = 0.0
-        total_heures_utilisation = 0.0
-
-        for equip in equipements_de_ce_type:
-            id_equipement = equip["id_equipement"]
-            all_conso_equip = self.consommation_model.get_consommation_by_equipement(id_equipement)
-            
-            if all_conso_equip:
-                total_conso_reelle += sum(item[1] for item in all_conso_equip)
-                total_duree_minutes = sum(conso_item["duree_minutes"] for conso_item in self.consommation_model.get_all_consommation() if conso_item["id_equipement"] == id_equipement)
-                total_heures_utilisation += total_duree_minutes / 60.0
-        
-        conso_reelle_moyenne_par_heure = total_conso_reelle / total_heures_utilisation if total_heures_utilisation else 0.0
-        
-        if conso_theorique_type == 0: # Avoid division by zero
-            pourcentage_rendement = 0.0 # Or handle as error/undefined
-        else:
-            # If real is less than theoretical, efficiency > 100% (good)
-            # If real is more than theoretical, efficiency < 100% (bad)
-            # percentage_rendement = (conso_theorique_type / conso_reelle_moyenne_par_heure) * 100
-            # A more intuitive "efficiency" might be how far real is from theoretical
-            # (conso_theorique_type - conso_reelle_moyenne_par_heure) / conso_theorique_type * 100
-            # Let's define it as how much "theoretical" is realized by "actual"
-            pourcentage_rendement = (conso_reelle_moyenne_par_heure / conso_theorique_type) * 100 # >100% is less efficient
+        type_equip = self._get_bilan()["types"].get(id_type)
+        return dict(type_equip) if type_equip else None
 
-        return {
-            "nom_type": type_details["nom_type"],
-            "conso_theorique_type": conso_theorique_type,
-            "conso_reelle_moyenne_par_heure": conso_reelle_moyenne_par_heure,
-            "pourcentage_rendement": pourcentage_rendement
-        }
+    def get_rendements_par_type(self):
+        """Rendement de tous les types d'équipement, dans l'ordre des identifiants."""
+        return [dict(type_equip) for type_equip in self._get_bilan()["types"].values()]
 
     def detecter_gaspillage(self, seuil_ecart_pourcentage=20):
         """
         Détecte les équipements où la consommation réelle dépasse significativement
         la consommation théorique, indiquant un potentiel gaspillage.
+
+        Comme les autres lectures, utilise le dernier bilan calculé : appeler
+        calculer_bilan() pour prendre en compte de nouvelles consommations.
         """
         equipements_en_gaspillage = []
-        all_equipements = self.equipement_model.get_all_equipements()
-
-        for equip in all_equipements:
-            id_equipement = equip["id_equipement"]
-            efficacite_data = self.calculer_efficacite_equipement(id_equipement)
-            
-            if efficacite_data and efficacite_data["pourcentage_ecart"] > seuil_ecart_pourcentage:
-                equipements_en_gaspillage.append(efficacite_data)
-        
+        for id_equipement, equip in self._get_bilan()["equipements"].items():
+            if equip["pourcentage_ecart"] > seuil_ecart_pourcentage:
+                equipements_en_gaspillage.append(self.calculer_efficacite_equipement(id_equipement))
         return equipements_en_gaspillage
     
-    def analyze_conso_during_coupure(self):
+    def analyze_conso_during_coupure(self, maintenant=None):
         """
-        Détecte la consommation d'énergie qui a eu lieu pendant une période de coupure.
-        
+        Détecte la consommation d'énergie qui a eu lieu pendant une période de coupure
+        du même bâtiment.
+
+        Une consommation couvre [date_heure, date_heure + duree_minutes[ ; elle est
+        signalée si cet intervalle chevauche [debut_coupure, fin_coupure[ (une coupure
+        en cours se termine à `maintenant`). La jointure est faite par
+        analysis.intervalles.joindre_intervalles, sans double boucle.
+
         Returns:
             list: Une liste de dictionnaires, chaque dictionnaire représentant une instance
-                  de consommation détectée pendant une coupure, avec les détails pertinents.
+                  de consommation détectée pendant une coupure, au format des alertes
+                  d'AlertesView (date, type, source, equip_bat, description, status).
         """
+        coupures = self.coupure_model.get_coupures_colonnes(maintenant)
+        conso = self.consommation_model.get_consommation_colonnes()
+
+        valides = ~np.isnat(conso["date_heure"])
+        debut_conso = conso["date_heure"][valides]
+        fin_conso = debut_conso + conso["duree_minutes"][valides].astype("timedelta64[m]")
+        indices_coupure, indices_conso = joindre_intervalles(
+            coupures["id_batiment"], coupures["debut_coupure"], coupures["fin_coupure"],
+            conso["id_batiment"][valides], debut_conso, fin_conso,
+        )
+        if len(indices_coupure) == 0:
+            return []
+        indices_conso = np.flatnonzero(valides)[indices_conso]
+
+        equipements = {e["id_equipement"]: e for e in self.equipement_model.get_all_equipements()}
+        sources = {s["id_source"]: s["nom_source"] for s in self.source_model.get_all_sources()}
+
         alerts = []
-        all_coupures = self.coupure_model.get_all_coupures()
-        all_consommations = self.consommation_model.get_all_consommation()
-
-        for coupure in all_coupures:
-            debut_coupure = datetime.fromisoformat(coupure["debut_coupure"])
-            fin_coupure = datetime.fromisoformat(coupure["fin_coupure"]) if coupure["fin_coupure"] else datetime.now() # Assume ongoing coupures end now for analysis
-            nom_batiment = coupure["nom_batiment"]
-
-            for conso in all_consommations:
-                conso_datetime = datetime.fromisoformat(conso["date_heure"])
-                
-                # Check if consumption occurred during the outage
-                if debut_coupure <= conso_datetime <= fin_coupure:
-                    alerts.append({
-                        "type": "Consommation pdt Coupure",
-                        "date": conso_datetime,
-                        "description": f"Consommation de {conso['energie_kwh']:.2f} kWh sur {conso['nom_equipement']} ({nom_batiment}) "
-                                       f"pendant une coupure (Début: {coupure['debut_coupure']}, Fin: {coupure['fin_coupure'] or 'En cours'})",
-                        "equip_bat": f"{conso['nom_equipement']} ({nom_batiment})",
-                        "energie_kwh": conso['energie_kwh'],
-                        "id_conso": conso['id_conso'],
-                        "id_equipement": conso['id_equipement']
-                    })
+        for i_coupure, i_conso in zip(indices_coupure.tolist(), indices_conso.tolist()):
+            id_equipement = int(conso["id_equipement"][i_conso])
+            equip = equipements.get(id_equipement, {})
+            nom_equipement = equip.get("nom_equipement", "N/A")
+            nom_batiment = equip.get("nom_batiment", "N/A")
+            energie_kwh = float(conso["energie_kwh"][i_conso])
+            en_cours = bool(coupures["en_cours"][i_coupure])
+            debut_coupure = coupures["debut_coupure"][i_coupure].item()
+            fin_coupure = "En cours" if en_cours else coupures["fin_coupure"][i_coupure].item()
+
+            alerts.append({
+                "type": "Conso. pdt Coupure",
+                "date": conso["date_heure"][i_conso].item(),
+                "source": sources.get(int(conso["id_source"][i_conso]), "N/A"),
+                "equip_bat": f"{nom_equipement} ({nom_batiment})",
+                "description": f"Consommation de {energie_kwh:.2f} kWh sur {nom_equipement} ({nom_batiment}) "
+                               f"pendant une coupure (Début: {debut_coupure}, Fin: {fin_coupure})",
+                "status": "Actif" if en_cours else "Résolu",
+                "energie_kwh": energie_kwh,
+                "id_conso": int(conso["id_conso"][i_conso]),
+                "id_equipement": id_equipement,
+                "id_batiment": int(coupures["id_batiment"][i_coupure]),
+                "id_coupure": int(coupures["id_coupure"][i_coupure]),
+            })
         return alerts
-
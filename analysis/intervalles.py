@@ -0,0 +1,110 @@
+"""
+Jointure d'intervalles par clé (ex. coupures × consommations d'un même bâtiment).
+
+Les intervalles sont semi-ouverts, [début, fin[ : une consommation qui se termine
+à l'instant où la coupure commence (ou qui commence à sa fin) n'est pas comptée.
+Un intervalle de durée nulle est un instant p, retenu si début <= p < fin ; deux
+instants se chevauchent s'ils sont égaux.
+
+Les intervalles B sont triés une fois par (clé, début). Pour chaque intervalle A,
+les candidats sont bornés par deux recherches dichotomiques :
+    début_B < fin_A                       (borne haute ; <= début_A si A est un instant)
+    début_B >= début_A - durée_max_B      (borne basse)
+puis filtrés sur fin_B > début_A (début_B >= début_A si B est un instant). Le coût
+est O((N + C) log N + candidats) au lieu de O(C·N) pour la double boucle.
+"""
+import numpy as np
+
+
+def joindre_intervalles(cle_a, debut_a, fin_a, cle_b, debut_b, fin_b):
+    """
+    Paires (i, j) telles que cle_a[i] == cle_b[j] et que les intervalles semi-ouverts
+    [debut_a[i], fin_a[i][ et [debut_b[j], fin_b[j][ se chevauchent (voir le
+    docstring du module pour les intervalles de durée nulle).
+
+    Args:
+        cle_a, debut_a, fin_a: Tableaux des intervalles A (ex. coupures).
+        cle_b, debut_b, fin_b: Tableaux des intervalles B (ex. consommations).
+            Les bornes sont des entiers (secondes epoch) ou des datetime64 de même unité.
+
+    Returns:
+        tuple: (indices_a, indices_b), tableaux int64 de même longueur,
+               triés par indice A puis par début B.
+    """
+    cle_a, debut_a, fin_a = (np.asarray(x) for x in (cle_a, debut_a, fin_a))
+    cle_b, debut_b, fin_b = (np.asarray(x) for x in (cle_b, debut_b, fin_b))
+    vide = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+    if len(cle_a) == 0 or len(cle_b) == 0:
+        return vide
+
+    # Tri des intervalles B par (clé, début)
+    ordre_b = _ordre_cle_debut(cle_b, debut_b)
+    cles_b = cle_b[ordre_b]
+    debuts_b = debut_b[ordre_b]
+    fins_b = fin_b[ordre_b]
+
+    resultats_a, resultats_b = [], []
+    for cle in np.unique(cle_a):
+        bas_cle = np.searchsorted(cles_b, cle, side="left")
+        haut_cle = np.searchsorted(cles_b, cle, side="right")
+        if bas_cle == haut_cle:
+            continue
+
+        debuts = debuts_b[bas_cle:haut_cle]
+        fins = fins_b[bas_cle:haut_cle]
+        duree_max = (fins - debuts).max()
+
+        indices_a = np.flatnonzero(cle_a == cle)
+        bas = np.searchsorted(debuts, debut_a[indices_a] - duree_max, side="left")
+        # début_B < fin_A, ou début_B <= début_A quand A est un instant
+        fins_a = fin_a[indices_a]
+        haut = np.where(
+            fins_a > debut_a[indices_a],
+            np.searchsorted(debuts, fins_a, side="left"),
+            np.searchsorted(debuts, fins_a, side="right"),
+        )
+
+        # Expansion vectorisée des plages [bas, haut) en candidats
+        longueurs = np.maximum(haut - bas, 0)
+        total = int(longueurs.sum())
+        if total == 0:
+            continue
+        candidats_a = np.repeat(indices_a, longueurs)
+        decalages = np.arange(total) - np.repeat(np.cumsum(longueurs) - longueurs, longueurs)
+        candidats_b = np.repeat(bas, longueurs) + decalages
+
+        # fin_B > début_A, ou début_B >= début_A quand B est un instant
+        debuts_candidats = debuts[candidats_b]
+        fins_candidats = fins[candidats_b]
+        debut_candidats_a = debut_a[candidats_a]
+        garder = (fins_candidats > debut_candidats_a) | (
+            (fins_candidats == debuts_candidats) & (debuts_candidats >= debut_candidats_a)
+        )
+        resultats_a.append(candidats_a[garder])
+        resultats_b.append(ordre_b[bas_cle + candidats_b[garder]])
+
+    if not resultats_a:
+        return vide
+    indices_a = np.concatenate(resultats_a).astype(np.int64)
+    indices_b = np.concatenate(resultats_b).astype(np.int64)
+    ordre = np.argsort(indices_a, kind="stable")
+    return indices_a[ordre], indices_b[ordre]
+
+
+def _ordre_cle_debut(cle, debut):
+    """
+    Permutation triant par (clé, début). Les deux colonnes sont packées dans un
+    seul int64 quand leurs plages le permettent (un argsort est environ 5x plus
+    rapide qu'un lexsort sur 10M lignes), sinon on se rabat sur np.lexsort.
+    """
+    if np.issubdtype(cle.dtype, np.integer) and len(cle):
+        debut_entier = debut.view(np.int64) if np.issubdtype(debut.dtype, np.datetime64) else debut
+        if np.issubdtype(debut_entier.dtype, np.integer):
+            cle_min, cle_max = int(cle.min()), int(cle.max())
+            debut_min, debut_max = int(debut_entier.min()), int(debut_entier.max())
+            bits_debut = max(debut_max - debut_min, 1).bit_length()
+            bits_cle = max(cle_max - cle_min, 1).bit_length()
+            if bits_debut + bits_cle <= 62:
+                composite = ((cle.astype(np.int64) - cle_min) << bits_debut) | (debut_entier.astype(np.int64) - debut_min)
+                return np.argsort(composite)
+    return np.lexsort((debut, cle))
@@ -0,0 +1,139 @@
+"""
+Rééchantillonnage des consommations sur une grille de temps régulière.
+
+Une ligne de CONSOMMATION couvre [date_heure, date_heure + duree_minutes[ ; son
+énergie est répartie entre les créneaux de la grille (15 min, 1 h...) au prorata
+du recouvrement, au lieu d'être attribuée en entier au créneau de début. Une
+mesure de 3 h commencée à 23 h compte donc 1 h pour un jour et 2 h pour le suivant.
+
+Tout est vectorisé : chaque mesure est dupliquée sur les créneaux qu'elle
+touche (np.repeat), puis les parts sont cumulées dans une matrice dense
+(lignes x créneaux) par np.bincount, par lots de mesures pour borner la mémoire.
+"""
+import numpy as np
+
+from utils.date_utils import GRAINS, regrouper_periodes, formater_cles
+
+
+def repartir_sur_grille(debuts, durees_minutes, valeurs, pas_minutes=60, lignes=None,
+                        debut_grille=None, fin_grille=None, taille_lot=1_000_000):
+    """
+    Répartit des valeurs (énergie, coût...) sur une grille régulière au prorata
+    du recouvrement de chaque mesure avec chaque créneau.
+
+    Args:
+        debuts (array-like): Début de chaque mesure (datetime64 ; NaT ignoré).
+        durees_minutes (array-like): Durée de chaque mesure ; une durée nulle
+            attribue la valeur entière au créneau du début.
+        valeurs (array-like): Valeur de chaque mesure (NaN ignoré).
+        pas_minutes (int): Pas de la grille ; doit diviser une journée (1440).
+        lignes (array-like, optional): Étiquette de ligne de chaque mesure (ex.
+            id_equipement) ; sans étiquette, une seule ligne de totaux.
+        debut_grille, fin_grille (optional): Bornes de la grille (datetime64 ou
+            chaîne ISO) ; par défaut, l'étendue des mesures. Les parts hors grille
+            sont ignorées.
+
+    Returns:
+        dict: {
+            "grille": datetime64[s] des débuts de créneau,
+            "etiquettes": étiquettes triées des lignes (None sans `lignes`),
+            "matrice": float64 de forme (nb_lignes, nb_creneaux)
+        }
+    """
+    if pas_minutes <= 0 or 1440 % pas_minutes:
+        raise ValueError("Le pas doit être un diviseur de 1440 minutes (ex. 15 ou 60).")
+    pas = int(pas_minutes) * 60
+    debuts = np.asarray(debuts).astype("datetime64[s]")
+    valeurs = np.asarray(valeurs, dtype=np.float64)
+    durees = np.round(np.maximum(np.nan_to_num(np.asarray(durees_minutes, dtype=np.float64)), 0) * 60).astype(np.int64)
+    valides = ~np.isnat(debuts) & ~np.isnan(valeurs)
+
+    if lignes is None:
+        etiquettes, codes_lignes = None, np.zeros(int(valides.sum()), dtype=np.int64)
+    else:
+        etiquettes, codes_lignes = np.unique(np.asarray(lignes)[valides], return_inverse=True)
+        codes_lignes = codes_lignes.ravel()
+    nb_lignes = 1 if etiquettes is None else len(etiquettes)
+
+    s = debuts.view(np.int64)[valides]
+    e = s + durees[valides]
+    if debut_grille is not None:
+        origine = np.datetime64(debut_grille, "s").astype(np.int64)
+    elif len(s):
+        origine = s.min()
+    else:
+        origine = 0
+    origine = origine // pas * pas
+    if fin_grille is not None:
+        fin = np.datetime64(fin_grille, "s").astype(np.int64)
+    elif len(s):
+        fin = max(e.max(), s.max() + 1)
+    else:
+        fin = origine
+    nb_creneaux = max(int(-(-(fin - origine) // pas)), 0)
+    grille = (origine + pas * np.arange(nb_creneaux, dtype=np.int64)).view("datetime64[s]")
+
+    matrice = np.zeros(nb_lignes * nb_creneaux)
+    if nb_creneaux == 0 or len(s) == 0:
+        return {"grille": grille, "etiquettes": etiquettes, "matrice": matrice.reshape(nb_lignes, nb_creneaux)}
+
+    v = valeurs[valides]
+    d = e - s
+    for i in range(0, len(s), taille_lot):
+        lot = slice(i, i + taille_lot)
+        _cumuler_lot(matrice, s[lot], e[lot], d[lot], v[lot], codes_lignes[lot], origine, pas, nb_creneaux)
+    return {"grille": grille, "etiquettes": etiquettes, "matrice": matrice.reshape(nb_lignes, nb_creneaux)}
+
+
+def _cumuler_lot(matrice, s, e, d, v, codes_lignes, origine, pas, nb_creneaux):
+    # Premier et dernier créneau touchés (fin exclusive), bornés à la grille
+    premier = (s - origine) // pas
+    dernier = np.where(d > 0, (e - 1 - origine) // pas, premier)
+    premier = np.maximum(premier, 0)
+    dernier = np.minimum(dernier, nb_creneaux - 1)
+    garde = dernier >= premier
+    if not garde.all():
+        s, e, d, v, codes_lignes = s[garde], e[garde], d[garde], v[garde], codes_lignes[garde]
+        premier, dernier = premier[garde], dernier[garde]
+
+    # Une entrée par couple (mesure, créneau touché)
+    nb = dernier - premier + 1
+    mesure = np.repeat(np.arange(len(s)), nb)
+    creneau = premier[mesure] + (np.arange(len(mesure)) - np.repeat(np.cumsum(nb) - nb, nb))
+    debut_creneau = origine + creneau * pas
+    recouvrement = np.minimum(e[mesure], debut_creneau + pas) - np.maximum(s[mesure], debut_creneau)
+    duree = d[mesure]
+    fraction = np.divide(recouvrement, duree, out=np.ones(len(mesure)), where=duree > 0)
+    matrice += np.bincount(codes_lignes[mesure] * nb_creneaux + creneau, weights=v[mesure] * fraction,
+                           minlength=len(matrice))
+
+
+def totaux_par_periode(reechantillonnage, periode="jour", garder_vides=False):
+    """
+    Regroupe les créneaux d'une grille (voir repartir_sur_grille) par période.
+
+    Args:
+        reechantillonnage (dict): Résultat de repartir_sur_grille.
+        periode (str): 'heure', 'jour', 'semaine', 'mois' ou 'annee' ; doit être
+            plus large que le pas de la grille.
+        garder_vides (bool): Garder les périodes dont toutes les valeurs sont nulles.
+
+    Returns:
+        dict: {"periodes": datetime64, "cles": clés texte (format des agrégats SQL),
+               "totaux": float64 de forme (nb_lignes, nb_periodes), "etiquettes"}
+    """
+    if periode not in GRAINS:
+        raise ValueError(f"La période doit être parmi {', '.join(GRAINS)}.")
+    debuts, codes = regrouper_periodes(reechantillonnage["grille"], periode)
+    matrice = reechantillonnage["matrice"]
+    if len(debuts) == 0:
+        totaux = np.zeros((matrice.shape[0], 0))
+    else:
+        # Grille triée : chaque période est une plage contiguë de créneaux
+        bornes = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+        totaux = np.add.reduceat(matrice, bornes, axis=1)
+    if not garder_vides and totaux.size:
+        non_vides = np.any(totaux != 0, axis=0)
+        debuts, totaux = debuts[non_vides], totaux[:, non_vides]
+    return {"periodes": debuts, "cles": formater_cles(debuts, periode), "totaux": totaux,
+            "etiquettes": reechantillonnage["etiquettes"]}
@@ -0,0 +1,115 @@
+"""
+Simulation Monte Carlo du coût des coupures JIRAMA (bascule sur groupe électrogène).
+
+Le coût d'une coupure dépend de l'heure à laquelle elle commence et de sa durée :
+une coupure de 3 h à 19 h coûte plus qu'à 3 h du matin. On part donc :
+
+- d'un profil de charge horaire (kWh consommés à chaque heure d'une journée type
+  du bâtiment, voir profil_horaire) ;
+- de l'historique COUPURE, dont on tire au hasard (bootstrap) des heures de
+  début et des durées ;
+- du prix horaire du groupe électrogène (plages horaires comprises).
+
+Le coût d'un scénario est l'intégrale du profil de coût (charge x prix) sur
+[début, début + durée[ ; avec le cumul du profil sur une journée, prolongé de
+jour en jour, chaque intégrale est une différence de deux interpolations. Tous
+les scénarios sont calculés en un lot NumPy, sans boucle.
+"""
+import numpy as np
+
+from analysis.reechantillonnage import repartir_sur_grille
+from utils.date_utils import heure_du_jour, regrouper_periodes
+
+QUANTILES = {"p50": 50, "p95": 95}
+
+
+def profil_horaire(debuts, durees_minutes, energies):
+    """
+    Charge moyenne (kWh) de chaque heure d'une journée type.
+
+    L'énergie de chaque mesure est répartie sur les heures qu'elle couvre (voir
+    analysis.reechantillonnage), cumulée par heure de la journée, puis divisée par
+    le nombre de jours ayant des mesures.
+
+    Returns:
+        np.ndarray: 24 valeurs float64 (zéros sans mesure).
+    """
+    grille = repartir_sur_grille(debuts, durees_minutes, energies, pas_minutes=60)
+    energies_horaires = grille["matrice"][0]
+    actives = energies_horaires != 0
+    if not actives.any():
+        return np.zeros(24)
+    profil = np.bincount(heure_du_jour(grille["grille"]), weights=energies_horaires, minlength=24)
+    nb_jours = len(regrouper_periodes(grille["grille"][actives], "jour")[0])
+    return profil / nb_jours
+
+
+def cout_sur_intervalles(profil_cout, heures_debut, durees_heures):
+    """
+    Intégrale d'un profil horaire périodique (24 valeurs par heure, constantes sur
+    chaque heure) sur [heure_debut, heure_debut + duree[, pour chaque intervalle.
+
+    Args:
+        profil_cout (array-like): 24 valeurs (ex. kWh x prix de chaque heure).
+        heures_debut (array-like): Heure de début dans la journée, décimale (0 <= h < 24).
+        durees_heures (array-like): Durées en heures (>= 0, plusieurs jours possibles).
+
+    Returns:
+        np.ndarray: float64, une intégrale par intervalle.
+    """
+    profil_cout = np.asarray(profil_cout, dtype=np.float64)
+    cumul = np.concatenate(([0.0], np.cumsum(profil_cout)))
+    total_jour = cumul[-1]
+
+    def primitive(t):
+        jours, reste = np.divmod(t, 24.0)
+        return jours * total_jour + np.interp(reste, np.arange(25), cumul)
+
+    heures_debut = np.asarray(heures_debut, dtype=np.float64)
+    return primitive(heures_debut + np.asarray(durees_heures, dtype=np.float64)) - primitive(heures_debut)
+
+
+def simuler_monte_carlo(heures_debut_historique, durees_historique, profil_kwh, prix_horaires,
+                        nb_scenarios=100_000, graine=None):
+    """
+    Tire nb_scenarios coupures (heure de début et durée tirées indépendamment dans
+    l'historique) et calcule le coût de l'énergie fournie par le groupe électrogène.
+
+    Args:
+        heures_debut_historique (array-like): Heure décimale de début des coupures passées.
+        durees_historique (array-like): Durée (heures) des coupures passées.
+        profil_kwh (array-like): Charge horaire de la journée type (voir profil_horaire).
+        prix_horaires (array-like): Prix du kWh du groupe à chaque heure (24 valeurs ou scalaire).
+        graine (int, optional): Graine du générateur aléatoire (résultats reproductibles).
+
+    Returns:
+        dict: {"nb_scenarios", "moyenne", "p50", "p95", "pire", "energie_moyenne_kwh",
+               "duree_moyenne_h", "couts" (coût de chaque scénario)}.
+    """
+    heures_debut_historique = np.asarray(heures_debut_historique, dtype=np.float64)
+    durees_historique = np.asarray(durees_historique, dtype=np.float64)
+    if len(heures_debut_historique) == 0 or len(durees_historique) == 0:
+        raise ValueError("L'historique de coupures est vide.")
+    if nb_scenarios <= 0:
+        raise ValueError("Le nombre de scénarios doit être positif.")
+
+    rng = np.random.default_rng(graine)
+    heures_debut = rng.choice(heures_debut_historique, nb_scenarios)
+    durees = rng.choice(durees_historique, nb_scenarios)
+
+    profil_kwh = np.asarray(profil_kwh, dtype=np.float64)
+    prix_horaires = np.broadcast_to(np.asarray(prix_horaires, dtype=np.float64), (24,))
+    couts = cout_sur_intervalles(profil_kwh * prix_horaires, heures_debut, durees)
+    energies = cout_sur_intervalles(profil_kwh, heures_debut, durees)
+
+    resultat = {
+        "nb_scenarios": int(nb_scenarios),
+        "moyenne": float(couts.mean()),
+        "pire": float(couts.max()),
+        "energie_moyenne_kwh": float(energies.mean()),
+        "duree_moyenne_h": float(durees.mean()),
+        "couts": couts,
+    }
+    for nom, q in QUANTILES.items():
+        resultat[nom] = float(np.percentile(couts, q))
+    return resultat
@@ -1,41 +1,167 @@
 import numpy as np
-from datetime import datetime, timedelta # Added timedelta
+from itertools import islice
+from model.agregat_model import AgregatModel
 from model.consommation_model import ConsommationModel
+from model.stats_model import StatsModel
+from analysis.stats_en_ligne import EtatStats
+from analysis.baselines import scores_z, scores_robustes_glissants
+from utils.date_utils import GRAINS, parser_iso, regrouper_periodes, formater_cles, heure_du_jour
 
 class Statistique :
+    TAILLE_LOT = 4096
+
     def __init__(self):
         self.model = ConsommationModel()
-    
-    def stat_globale(self):
-        data = self.model.get_all_consommation()
-        valeur = np.array([row["energie_kwh"]for row in data])
-        if len(valeur) == 0:
+        self.agregat_model = AgregatModel()
+        self.stats_model = StatsModel()
+
+    def _energies_par_lots(self, consommations):
+        """Découpe un flux de lignes en tableaux NumPy d'energie_kwh de taille bornée."""
+        iterateur = iter(consommations)
+        while True:
+            lot = list(islice(iterateur, self.TAILLE_LOT))
+            if not lot:
+                break
+            yield np.fromiter((row["energie_kwh"] for row in lot), dtype=np.float64, count=len(lot))
+
+    def _stats_en_flux(self, consommations):
+        """
+        Calcule count, moyenne, M2, min et max en une seule passe sur un flux,
+        en fusionnant l'état de chaque lot (voir analysis.stats_en_ligne).
+        """
+        etat = EtatStats()
+        for valeurs in self._energies_par_lots(consommations):
+            etat = etat.fusionner(EtatStats.depuis_valeurs(valeurs))
+        return etat
+
+    def stat_globale(self, consommations=None, id_batiment=None, id_source=None, id_equipement=None,
+                     date_debut=None, date_fin=None):
+        """
+        Statistiques globales de consommation.
+
+        Args:
+            consommations (iterable, optional): Flux de lignes contenant "energie_kwh",
+                traité en une passe par lots.
+            id_batiment, id_source, id_equipement, date_debut, date_fin (optional):
+                Filtres appliqués en SQL par une seule requête d'agrégat
+                (ConsommationModel.get_stats_energie), sans charger les lignes.
+
+        Sans flux ni filtre, l'état persisté dans STATS_CONSOMMATION (model.stats_model)
+        est lu sans relire les mesures.
+        """
+        if consommations is not None:
+            return self._stats_en_flux(consommations).vers_dict()
+        filtres = {"id_batiment": id_batiment, "id_source": id_source, "id_equipement": id_equipement,
+                   "date_debut": date_debut, "date_fin": date_fin}
+        if any(valeur is not None for valeur in filtres.values()):
+            stats = self.model.get_stats_energie(**filtres)
+            if stats is not None:
+                del stats["nb_mesures"]
+            return stats
+        return self.stats_model.get_etat().vers_dict()
+
+    def stat_equipement(self, id_equipement):
+        """Mêmes statistiques que stat_globale pour un seul équipement (None sans mesure)."""
+        return self.stats_model.get_etat(id_equipement).vers_dict()
+
+    def seuil_anomalie(self, facteur=2):
+        """Seuil moyenne + facteur * écart-type de l'état global, None s'il n'y a pas de dispersion."""
+        etat = self.stats_model.get_etat()
+        if etat.n == 0 or etat.ecart_type == 0:
             return None
+        return etat.moyenne + facteur * etat.ecart_type
+
+    def anomalies(self, facteur=2):
+        seuil = self.seuil_anomalie(facteur)
+        if seuil is None:
+            return []
+        # Seules les lignes anormales sont lues, par l'index sur energie_kwh
+        return self.model.get_consommation_au_dessus(seuil)
+
+    def nombre_anomalies(self, facteur=2):
+        """Nombre d'anomalies (comme len(anomalies()), sans charger le détail)."""
+        seuil = self.seuil_anomalie(facteur)
+        return 0 if seuil is None else self.model.compter_au_dessus(seuil)
+
+    def scores_anomalies(self, colonnes=None, min_mesures=3):
+        """
+        Z-score de chaque mesure par rapport à la référence de son équipement à la
+        même heure de la journée (voir analysis.baselines), en un passage vectorisé.
+
+        Args:
+            colonnes (dict, optional): Colonnes de ConsommationModel.get_consommation_colonnes()
+                (chargées si absentes).
+            min_mesures (int): Effectif minimal d'un groupe équipement × heure.
+
+        Returns:
+            dict: Les colonnes, complétées de "z_score", "moyenne_reference",
+                  "ecart_type_reference" et "niveau_reference".
+        """
+        if colonnes is None:
+            colonnes = self.model.get_consommation_colonnes()
+        scores = scores_z(colonnes["energie_kwh"], colonnes["id_equipement"],
+                          heure_du_jour(colonnes["date_heure"]), min_mesures)
         return {
-            "total_kwh": np.sum(valeur),
-            "moyenne_kwh": np.mean(valeur),
-            "max_kwh": np.max(valeur),
-            "min_kwh": np.min(valeur),
-            "ecart_type": np.std(valeur)
+            **colonnes,
+            "z_score": scores["z_score"],
+            "moyenne_reference": scores["moyenne"],
+            "ecart_type_reference": scores["ecart_type"],
+            "niveau_reference": scores["niveau"],
         }
-    def anomalies(self, facteur=2):
-        data = self.model.get_all_consommation()
-        if not data:
+
+    def anomalies_contextuelles(self, seuil_z=2.0, colonnes=None, min_mesures=3):
+        """
+        Consommations dont le z-score équipement × heure dépasse seuil_z.
+
+        Returns:
+            list: Détail des lignes (comme get_consommation_by_ids), avec en plus
+                  "z_score" et "moyenne_reference", triées par date.
+        """
+        scores = self.scores_anomalies(colonnes, min_mesures)
+        selection = np.flatnonzero(scores["z_score"] > seuil_z)
+        if len(selection) == 0:
             return []
-            
-        valeur = np.array([row["energie_kwh"] for row in data])
-        
-        moyenne = np.mean(valeur)
-        ecart_type = np.std(valeur)
+        par_id = {
+            int(id_conso): (float(z), float(moyenne))
+            for id_conso, z, moyenne in zip(scores["id_conso"][selection], scores["z_score"][selection],
+                                            scores["moyenne_reference"][selection])
+        }
+        lignes = self.model.get_consommation_by_ids(list(par_id))
+        for ligne in lignes:
+            ligne["z_score"], ligne["moyenne_reference"] = par_id[ligne["id_conso"]]
+        return lignes
+
+    def nombre_anomalies_contextuelles(self, seuil_z=2.0, colonnes=None, min_mesures=3):
+        """Nombre de lignes retournées par anomalies_contextuelles, sans charger leur détail."""
+        return int(np.count_nonzero(self.scores_anomalies(colonnes, min_mesures)["z_score"] > seuil_z))
+
+    def anomalies_robustes(self, seuil=3.5, fenetre=24, colonnes=None, min_mesures=None):
+        """
+        Consommations dont le score robuste (médiane et MAD des `fenetre` mesures
+        précédentes du même équipement, voir analysis.baselines) dépasse `seuil`.
+        Un pic isolé ne gonfle pas la référence des mesures suivantes.
 
-        if ecart_type == 0:
+        Returns:
+            list: Détail des lignes (comme get_consommation_by_ids), avec en plus
+                  "score_robuste" et "mediane_reference", triées par date.
+        """
+        if colonnes is None:
+            colonnes = self.model.get_consommation_colonnes()
+        scores = scores_robustes_glissants(colonnes["energie_kwh"], colonnes["id_equipement"],
+                                           fenetre, min_mesures)
+        selection = np.flatnonzero(scores["score"] > seuil)
+        if len(selection) == 0:
             return []
+        par_id = {
+            int(id_conso): (float(score), float(mediane))
+            for id_conso, score, mediane in zip(colonnes["id_conso"][selection], scores["score"][selection],
+                                                scores["mediane"][selection])
+        }
+        lignes = self.model.get_consommation_by_ids(list(par_id))
+        for ligne in lignes:
+            ligne["score_robuste"], ligne["mediane_reference"] = par_id[ligne["id_conso"]]
+        return lignes
 
-        seuil = moyenne + facteur * ecart_type
-        
-        anomalies = [row for row in data if row["energie_kwh"] > seuil]
-        return anomalies
-    
     def consommation_par_source(self, nom_source):
         data = self.model.get_consommation_by_source(nom_source)
         if not data:
@@ -43,39 +169,71 @@ class Statistique :
         valeur = np.array([r["energie_kwh"] for r in data])
         return np.sum(valeur)
         
-    def agreger_par_periode(self, consommations, periode='jour'):
+    def agreger_par_periode(self, consommations=None, periode='jour'):
         """
-        Agrège les données de consommation par période (jour, mois).
+        Agrège les données de consommation par période (heure, jour, semaine, mois, année).
 
         Args:
-            consommations (list of tuples): Liste de tuples (datetime_obj, energie_kwh).
-            periode (str): 'jour' ou 'mois'.
+            consommations (list of tuples, optional): Liste de tuples (date, energie_kwh), la date
+                étant un datetime ou une chaîne ISO.
+                Si None, toute la table est agrégée à partir des tables d'agrégats
+                (model.agregat_model), sans relire les lignes brutes.
+            periode (str): 'heure', 'jour', 'semaine', 'mois' ou 'annee'.
 
         Returns:
             dict: Un dictionnaire avec les dates (tronquées) comme clés et la somme
                   des énergies comme valeurs.
         """
+        if periode not in GRAINS:
+            raise ValueError(f"La période doit être parmi {', '.join(GRAINS)}.")
+        if consommations is None:
+            return self.agregat_model.totaux_par_periode(periode)
         if not consommations:
             return {}
-            
-        agregees = {}
-        for datetime_obj, energie in consommations:
-            cle = None
-            if periode == 'jour':
-                cle = datetime_obj.date()
-            elif periode == 'semaine': # Week aggregation (Monday as start of week)
-                start_of_week = datetime_obj.date() - timedelta(days=datetime_obj.weekday())
-                cle = start_of_week
-            elif periode == 'mois':
-                cle = datetime_obj.strftime('%Y-%m')
-            else:
-                raise ValueError("La période doit être 'jour', 'semaine' ou 'mois'.")
-                
-            cle_str = str(cle)
-            if cle_str not in agregees:
-                agregees[cle_str] = 0
-            agregees[cle_str] += energie
-            
-        return agregees
-
-    
\ No newline at end of file
+
+        dates = parser_iso([date for date, _ in consommations])
+        energies = np.fromiter((energie for _, energie in consommations), dtype=np.float64, count=len(consommations))
+        agregat = self.agreger_tableaux(dates, energies, periode)
+        return dict(zip(agregat["cles"].tolist(), agregat["totaux"].tolist()))
+
+    def agreger_tableaux(self, dates, energies, periode='jour', series=None):
+        """
+        Variante vectorisée de agreger_par_periode sur des tableaux : une troncature,
+        un regroupement (utils.date_utils.regrouper_periodes) et un np.bincount, sans
+        clé texte par ligne.
+
+        Args:
+            dates (array-like): datetime64 (NaT ignoré), par ex. la colonne "date_heure"
+                de ConsommationModel.get_consommation_colonnes().
+            energies (array-like): float64, même longueur.
+            periode (str): 'heure', 'jour', 'semaine', 'mois' ou 'annee'.
+            series (array-like, optional): Étiquette de série de chaque mesure (id_source,
+                id_batiment, nom...) pour obtenir un total par série et par période.
+
+        Returns:
+            dict: {
+                "periodes": datetime64 des débuts de période (axe x de matplotlib),
+                "cles": clés texte des périodes (mêmes clés que agreger_par_periode),
+                "totaux": float64 de forme (nb_periodes,) ou (nb_series, nb_periodes),
+                "series": étiquettes triées des séries (None sans series)
+            }
+        """
+        if periode not in GRAINS:
+            raise ValueError(f"La période doit être parmi {', '.join(GRAINS)}.")
+        energies = np.asarray(energies, dtype=np.float64)
+        debuts, codes = regrouper_periodes(dates, periode)
+        valides = codes >= 0
+        nb_periodes = len(debuts)
+        resultat = {"periodes": debuts, "cles": formater_cles(debuts, periode), "series": None}
+
+        if series is None:
+            resultat["totaux"] = np.bincount(codes[valides], weights=energies[valides], minlength=nb_periodes)
+            return resultat
+
+        etiquettes, codes_series = np.unique(np.asarray(series)[valides], return_inverse=True)
+        # Un seul bincount sur le code combiné (série, période), remis en matrice
+        combines = codes_series.ravel() * nb_periodes + codes[valides]
+        totaux = np.bincount(combines, weights=energies[valides], minlength=len(etiquettes) * nb_periodes)
+        resultat["totaux"] = totaux.reshape(len(etiquettes), nb_periodes)
+        resultat["series"] = etiquettes
+        return resultat
@@ -0,0 +1,107 @@
+"""
+Statistiques en ligne fusionnables (count, moyenne, M2, min, max).
+
+Un EtatStats se met à jour valeur par valeur (Welford) ou par lots NumPy, et deux
+états calculés sur des morceaux disjoints se fusionnent exactement (Chan et al.) :
+on peut donc traiter des lots en parallèle, puis combiner les résultats.
+
+    etat = EtatStats.depuis_valeurs(lot_1).fusionner(EtatStats.depuis_valeurs(lot_2))
+    etat.moyenne, etat.ecart_type  # identiques à np.mean / np.std sur la concaténation
+"""
+import math
+
+import numpy as np
+
+class EtatStats:
+    __slots__ = ("n", "moyenne", "m2", "mini", "maxi")
+
+    def __init__(self, n=0, moyenne=0.0, m2=0.0, mini=None, maxi=None):
+        self.n = int(n)
+        self.moyenne = float(moyenne)
+        self.m2 = float(m2)
+        self.mini = mini
+        self.maxi = maxi
+
+    @classmethod
+    def depuis_valeurs(cls, valeurs):
+        """État d'un tableau de valeurs (NaN ignorés), calculé en une passe NumPy."""
+        valeurs = np.asarray(valeurs, dtype=np.float64)
+        valeurs = valeurs[~np.isnan(valeurs)]
+        if len(valeurs) == 0:
+            return cls()
+        moyenne = valeurs.mean()
+        return cls(len(valeurs), moyenne, np.square(valeurs - moyenne).sum(),
+                   float(valeurs.min()), float(valeurs.max()))
+
+    @classmethod
+    def depuis_ligne(cls, row):
+        """État depuis une ligne (dict ou sqlite3.Row) de STATS_CONSOMMATION."""
+        return cls(row["nb_mesures"], row["moyenne"], row["m2"], row["mini"], row["maxi"])
+
+    def ajouter(self, valeur):
+        """Ajoute une valeur (algorithme de Welford). Retourne self."""
+        if valeur is None:
+            return self
+        valeur = float(valeur)
+        self.n += 1
+        delta = valeur - self.moyenne
+        self.moyenne += delta / self.n
+        self.m2 += delta * (valeur - self.moyenne)
+        self.mini = valeur if self.mini is None else min(self.mini, valeur)
+        self.maxi = valeur if self.maxi is None else max(self.maxi, valeur)
+        return self
+
+    def fusionner(self, autre):
+        """Nouvel état équivalent à l'union des deux échantillons (formule de Chan et al.)."""
+        if autre.n == 0:
+            return self.copie()
+        if self.n == 0:
+            return autre.copie()
+        n = self.n + autre.n
+        delta = autre.moyenne - self.moyenne
+        return EtatStats(
+            n,
+            self.moyenne + delta * autre.n / n,
+            self.m2 + autre.m2 + delta * delta * self.n * autre.n / n,
+            min(self.mini, autre.mini),
+            max(self.maxi, autre.maxi),
+        )
+
+    @classmethod
+    def fusionner_tous(cls, etats):
+        etat = cls()
+        for autre in etats:
+            etat = etat.fusionner(autre)
+        return etat
+
+    def copie(self):
+        return EtatStats(self.n, self.moyenne, self.m2, self.mini, self.maxi)
+
+    @property
+    def total(self):
+        return self.n * self.moyenne
+
+    @property
+    def variance(self):
+        """Variance de population (comme np.var), 0 si l'état est vide."""
+        return max(self.m2, 0.0) / self.n if self.n else 0.0
+
+    @property
+    def ecart_type(self):
+        return math.sqrt(self.variance)
+
+    def vers_dict(self):
+        """Format de Statistique.stat_globale (None si l'état est vide)."""
+        if self.n == 0:
+            return None
+        return {
+            "total_kwh": self.total,
+            "moyenne_kwh": self.moyenne,
+            "max_kwh": self.maxi,
+            "min_kwh": self.mini,
+            "ecart_type": self.ecart_type,
+        }
+
+    def __repr__(self):
+        return (f"EtatStats(n={self.n}, moyenne={self.moyenne!r}, m2={self.m2!r}, "
+                f"mini={self.mini!r}, maxi={self.maxi!r})")
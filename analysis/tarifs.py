@@ -0,0 +1,92 @@
+"""
+Grille tarifaire datée : prix du kWh de chaque mesure selon sa source, sa date
+et son heure, à partir de l'historique TARIF_SOURCE (voir model.tarif_model).
+
+Une version de tarif est l'ensemble des lignes d'une source ayant la même date
+d'effet ; chaque ligne couvre la plage horaire [heure_debut, heure_fin[. Les
+heures qu'une version ne couvre pas gardent le prix de la version précédente de
+la source (on peut ajouter une plage de pointe sans répéter le prix creux).
+
+Chaque version est ramenée à un tableau de 24 prix horaires ; les versions sont
+triées sur une clé entière (source, epoch d'effet), et un seul np.searchsorted
+trouve la version en vigueur de millions de mesures :
+
+    grille = GrilleTarifaire(tarif_model.get_tarifs(), defauts={1: 500.0})
+    couts = grille.couts(id_source, dates, energies_kwh)
+"""
+import numpy as np
+
+from utils.date_utils import parser_iso, heure_du_jour
+
+# Clé de version : id_source * DECALAGE_SOURCE + epoch + DECALAGE_EPOCH (epoch >= -2**39)
+DECALAGE_SOURCE = np.int64(1 << 40)
+DECALAGE_EPOCH = np.int64(1 << 39)
+
+
+class GrilleTarifaire:
+    def __init__(self, tarifs, defauts=None):
+        """
+        Args:
+            tarifs (iterable): Lignes (dict ou sqlite3.Row) id_source, date_effet,
+                heure_debut, heure_fin, cout_kwh, triées par (id_source, date_effet,
+                id_tarif) : à plage égale, la ligne la plus récente l'emporte.
+            defauts (dict, optional): {id_source: cout_kwh} pour les heures et
+                dates sans tarif (avant la première version).
+        """
+        self.defauts = dict(defauts or {})
+        cles, sources, prix = [], [], []
+        for tarif in tarifs:
+            id_source = int(tarif["id_source"])
+            cle = self._cle(id_source, parser_iso([tarif["date_effet"]])[0])
+            if not cles or cles[-1] != cle:
+                # Nouvelle version : part des prix de la version précédente de la source
+                precedents = prix[-1].copy() if sources and sources[-1] == id_source else np.full(24, np.nan)
+                cles.append(cle)
+                sources.append(id_source)
+                prix.append(precedents)
+            prix[-1][int(tarif["heure_debut"]):int(tarif["heure_fin"])] = tarif["cout_kwh"]
+
+        self.cles = np.array(cles, dtype=np.int64)
+        self.sources = np.array(sources, dtype=np.int64)
+        self.prix_horaires = np.array(prix, dtype=np.float64).reshape(len(prix), 24)
+        # Heures jamais tarifées : prix par défaut de la source
+        manquants = np.isnan(self.prix_horaires)
+        if manquants.any():
+            self.prix_horaires[manquants] = self._prix_defaut(np.broadcast_to(self.sources[:, None], (len(sources), 24))[manquants])
+
+    @staticmethod
+    def _cle(id_source, dates):
+        epochs = np.asarray(dates).astype("datetime64[s]").view(np.int64)
+        return np.asarray(id_source, dtype=np.int64) * DECALAGE_SOURCE + epochs + DECALAGE_EPOCH
+
+    def _prix_defaut(self, id_source):
+        prix = np.zeros(len(id_source))
+        for source, cout in self.defauts.items():
+            prix[id_source == source] = cout
+        return prix
+
+    def prix(self, id_source, dates):
+        """
+        Prix du kWh en vigueur pour chaque mesure.
+
+        Args:
+            id_source (array-like): Source de chaque mesure.
+            dates (array-like): datetime64 de chaque mesure (NaT -> prix par défaut).
+
+        Returns:
+            np.ndarray: float64, un prix par mesure.
+        """
+        id_source = np.asarray(id_source, dtype=np.int64)
+        dates = np.asarray(dates).astype("datetime64[s]")
+        heures = heure_du_jour(dates)
+        version = np.searchsorted(self.cles, self._cle(id_source, dates), side="right") - 1
+        trouve = (version >= 0) & (heures >= 0)
+        trouve[trouve] = self.sources[version[trouve]] == id_source[trouve]
+
+        prix = self._prix_defaut(id_source)
+        prix[trouve] = self.prix_horaires[version[trouve], heures[trouve]]
+        return prix
+
+    def couts(self, id_source, dates, energies):
+        """Coût de chaque mesure : énergie (kWh) x prix en vigueur (NaN compté 0)."""
+        return np.nan_to_num(np.asarray(energies, dtype=np.float64)) * self.prix(id_source, dates)
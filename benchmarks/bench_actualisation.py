@@ -0,0 +1,36 @@
+"""
+Coût de l'actualisation automatique du tableau de bord sur la base de
+l'application : tour de minuterie sans écriture (lecture des compteurs de
+JOURNAL_MODIFICATIONS), instantané partiel après une écriture dans COUPURE,
+et instantané complet (ancien comportement de « Tout Rafraîchir »).
+
+Comme l'application, le benchmark ouvre data/energie.db (et lui applique les
+migrations en attente) ; il n'y écrit rien.
+
+Usage : python -m benchmarks.bench_actualisation [nb_tours]
+"""
+import sys
+
+from analysis.dashboard_snapshot import DashboardService, champs_a_recalculer
+from benchmarks.utils_bench import chronometrer
+from model.modification_model import ModificationModel
+
+
+def main(nb=200):
+    modifications = ModificationModel()
+    modifications.tables_modifiees()
+    service = DashboardService()
+    precedent = service.snapshot()
+    champs = champs_a_recalculer({"COUPURE"})
+
+    _, duree_tour = chronometrer(lambda: [modifications.tables_modifiees() for _ in range(nb)])
+    _, duree_partiel = chronometrer(lambda: [service.snapshot(champs=champs, precedent=precedent) for _ in range(nb)])
+    _, duree_complet = chronometrer(lambda: [service.snapshot() for _ in range(nb)])
+    print(f"Tours                          : {nb}")
+    print(f"Tour sans modification         : {duree_tour / nb * 1e6:8.1f} µs")
+    print(f"Instantané partiel (COUPURE)   : {duree_partiel / nb * 1000:8.2f} ms ({', '.join(sorted(champs))})")
+    print(f"Instantané complet             : {duree_complet / nb * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,53 @@
+"""
+Détection d'anomalies sur de longues séries synthétiques : seuil global
+moyenne + 2 écarts-types (Statistique.anomalies) contre médiane/MAD glissantes
+par équipement (analysis.baselines.scores_robustes_glissants).
+
+Les séries ont un profil journalier propre à chaque équipement et des pics
+injectés connus : on mesure le temps et la part de pics retrouvés.
+
+Usage : python -m benchmarks.bench_anomalies_robustes [nb_mesures] [fenetre]
+"""
+import sys
+
+import numpy as np
+
+from analysis.baselines import scores_robustes_glissants
+from benchmarks.utils_bench import chronometrer
+
+
+def generer_series(n, nb_equipements=200, taux_pics=0.001, seed=0):
+    rng = np.random.default_rng(seed)
+    equipements = rng.integers(0, nb_equipements, n)
+    heures = (np.arange(n) // nb_equipements) % 24 # Mesures horaires, chronologiques
+    charge = 1.0 + 9.0 * (equipements % 10) # Du petit éclairage à la grosse climatisation
+    profil = 1.0 + 0.5 * np.sin(2 * np.pi * heures / 24)
+    valeurs = charge * profil * rng.normal(1.0, 0.05, n)
+    pics = rng.random(n) < taux_pics
+    valeurs[pics] *= 3.0
+    return valeurs, equipements, pics
+
+
+def seuil_global(valeurs, facteur=2):
+    return valeurs > valeurs.mean() + facteur * valeurs.std()
+
+
+def detection(nom, detectees, pics, duree):
+    vrais = np.count_nonzero(detectees & pics)
+    precision = vrais / max(np.count_nonzero(detectees), 1)
+    print(f"{nom:<28}: {duree:7.3f} s, pics retrouvés {vrais / pics.sum():6.1%}, précision {precision:6.1%}")
+
+
+def main(n=2_000_000, fenetre=24):
+    valeurs, equipements, pics = generer_series(n)
+    print(f"Mesures : {n}, pics injectés : {pics.sum()}")
+    detectees, duree = chronometrer(lambda: seuil_global(valeurs))
+    detection("moyenne + 2 écarts-types", detectees, pics, duree)
+    for taille in (fenetre, 2 * fenetre):
+        scores, duree = chronometrer(lambda: scores_robustes_glissants(valeurs, equipements, taille))
+        detection(f"médiane/MAD, fenêtre {taille}", scores["score"] > 3.5, pics, duree)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 24)
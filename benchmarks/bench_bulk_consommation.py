@@ -0,0 +1,46 @@
+"""
+Débit d'insertion des consommations : add_consommation ligne par ligne
+contre add_consommations_bulk (executemany par lots), avec ou sans les
+triggers d'agrégats.
+
+Usage : python -m benchmarks.bench_bulk_consommation [nb_lignes]
+"""
+import os
+import sys
+
+from benchmarks.utils_bench import creer_base_temporaire, generer_consommations, chronometrer
+from model.agregat_model import AgregatModel
+from model.consommation_model import ConsommationModel
+from model.database import get_database
+
+
+def bench_unitaire(model, n):
+    for ligne in generer_consommations(n):
+        model.add_consommation(*ligne)
+
+
+def main(n=20000):
+    db_path = creer_base_temporaire()
+    try:
+        model = ConsommationModel(db_path)
+
+        n_unitaire = min(n, 5000)
+        _, duree = chronometrer(bench_unitaire, model, n_unitaire)
+        print(f"add_consommation       : {n_unitaire:>8} lignes en {duree:7.3f} s -> {n_unitaire / duree:12,.0f} lignes/s")
+
+        (nb, erreurs), duree = chronometrer(model.add_consommations_bulk, generer_consommations(n))
+        print(f"add_consommations_bulk : {nb:>8} lignes en {duree:7.3f} s -> {nb / duree:12,.0f} lignes/s ({len(erreurs)} erreurs)")
+
+        # Triggers d'agrégats suspendus, puis reconstruction en une passe
+        def bulk_en_masse():
+            with AgregatModel(db_path).chargement_en_masse():
+                return model.add_consommations_bulk(generer_consommations(n))
+        (nb, erreurs), duree = chronometrer(bulk_en_masse)
+        print(f"bulk + chargement_en_masse : {nb:>4} lignes en {duree:7.3f} s -> {nb / duree:12,.0f} lignes/s (reconstruction comprise)")
+    finally:
+        get_database(db_path).close_all()
+        os.remove(db_path)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
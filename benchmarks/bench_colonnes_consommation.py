@@ -0,0 +1,46 @@
+"""
+Mémoire et temps de chargement de CONSOMMATION : liste de dicts
+(get_all_consommation) contre colonnes NumPy (get_consommation_colonnes).
+
+Usage : python -m benchmarks.bench_colonnes_consommation [nb_lignes]
+"""
+import os
+import sys
+import tracemalloc
+
+from benchmarks.utils_bench import creer_base_temporaire, generer_consommations, chronometrer
+from model.consommation_model import ConsommationModel
+from model.database import get_database
+
+
+def pic_memoire(fonction):
+    tracemalloc.start()
+    resultat, duree = chronometrer(fonction)
+    _, pic = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resultat, duree, pic
+
+
+def main(n=200000):
+    db_path = creer_base_temporaire()
+    try:
+        model = ConsommationModel(db_path)
+        model.add_consommations_bulk(generer_consommations(n))
+
+        lignes, duree_dicts, pic_dicts = pic_memoire(model.get_all_consommation)
+        nb = len(lignes)
+        del lignes
+        _, duree_colonnes, pic_colonnes = pic_memoire(model.get_consommation_colonnes)
+
+        par_million = 1_000_000 / nb
+        print(f"Lignes chargées         : {nb}")
+        print(f"get_all_consommation    : {duree_dicts:7.3f} s, pic {pic_dicts / 2**20:9.1f} Mo")
+        print(f"get_consommation_colonnes: {duree_colonnes:7.3f} s, pic {pic_colonnes / 2**20:9.1f} Mo")
+        print(f"Mémoire économisée      : {(pic_dicts - pic_colonnes) * par_million / 2**20:9.1f} Mo par million de lignes")
+    finally:
+        get_database(db_path).close_all()
+        os.remove(db_path)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
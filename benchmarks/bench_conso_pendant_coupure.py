@@ -0,0 +1,59 @@
+"""
+Jointure coupures × consommations par bâtiment : double boucle (ancienne
+méthode, sur un échantillon) contre analysis.intervalles.joindre_intervalles.
+
+Usage : python -m benchmarks.bench_conso_pendant_coupure [nb_consommations] [nb_coupures]
+"""
+import sys
+
+import numpy as np
+
+from analysis.intervalles import joindre_intervalles
+from benchmarks.utils_bench import chronometrer
+
+
+def generer_donnees(nb_conso, nb_coupures, nb_batiments=50, graine=42):
+    """Consommations toutes les 15 min par bâtiment et coupures de 5 min à 6 h (secondes epoch)."""
+    rng = np.random.default_rng(graine)
+    debut = np.datetime64("2025-01-01T00:00:00", "s").astype(np.int64)
+    etendue = nb_conso // nb_batiments * 900
+
+    cle_b = rng.integers(1, nb_batiments + 1, nb_conso).astype(np.int32)
+    debut_b = debut + rng.integers(0, etendue, nb_conso)
+    fin_b = debut_b + rng.choice([15, 30, 60], nb_conso) * 60
+
+    cle_a = rng.integers(1, nb_batiments + 1, nb_coupures).astype(np.int32)
+    debut_a = debut + rng.integers(0, etendue, nb_coupures)
+    fin_a = debut_a + rng.integers(5, 360, nb_coupures) * 60
+    return (cle_a, debut_a, fin_a), (cle_b, debut_b, fin_b)
+
+
+def double_boucle(coupures, consommations):
+    cle_a, debut_a, fin_a = (x.tolist() for x in coupures)
+    cle_b, debut_b, fin_b = (x.tolist() for x in consommations)
+    paires = 0
+    for i in range(len(cle_a)):
+        for j in range(len(cle_b)):
+            if cle_a[i] == cle_b[j] and debut_b[j] < fin_a[i] and fin_b[j] > debut_a[i]:
+                paires += 1
+    return paires
+
+
+def main(nb_conso=10_000_000, nb_coupures=100_000):
+    coupures, consommations = generer_donnees(nb_conso, nb_coupures)
+
+    (indices_a, _), duree = chronometrer(joindre_intervalles, *coupures, *consommations)
+    print(f"Consommations × coupures : {nb_conso} × {nb_coupures}")
+    print(f"joindre_intervalles      : {duree:8.3f} s, {len(indices_a)} paires")
+
+    # La double boucle est mesurée sur un échantillon puis extrapolée
+    echantillon_conso, echantillon_coupures = 20_000, 50
+    petit_a, petit_b = generer_donnees(echantillon_conso, echantillon_coupures)
+    _, duree_boucle = chronometrer(double_boucle, petit_a, petit_b)
+    extrapolation = duree_boucle * (nb_conso / echantillon_conso) * (nb_coupures / echantillon_coupures)
+    print(f"double boucle (extrapolé): {extrapolation:8.0f} s")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
@@ -0,0 +1,62 @@
+"""
+Rafraîchissement du tableau de bord sur la base de l'application : appels
+d'avant (chaque composant crée ses analyseurs et relit ses données) contre un
+DashboardSnapshot calculé en une passe (analysis.dashboard_snapshot).
+
+Comme l'application, le benchmark ouvre data/energie.db (et lui applique les
+migrations en attente).
+
+Usage : python -m benchmarks.bench_dashboard [nb_rafraichissements]
+"""
+import sys
+
+from analysis.couts import Couts
+from analysis.dashboard_snapshot import DashboardService
+from analysis.efficacite import Efficacite
+from analysis.statistiques import Statistique
+from benchmarks.utils_bench import chronometrer
+from config.settings import DB_PATH
+from model.agregat_model import AgregatModel
+from model.coupure_model import CoupureModel
+from model.database import get_database
+
+
+def rafraichir_avant():
+    """Requêtes et calculs des quatre composants tels qu'ils étaient faits séparément."""
+    # CardsFrame
+    coupure_model, couts, statistique = CoupureModel(), Couts(), Statistique()
+    coupure_model.get_current_coupures()
+    couts.calculer_cout_par_periode("mois", repartir=True)
+    statistique.nombre_anomalies_contextuelles()
+    # MainChart
+    AgregatModel().totaux_par_periode("heure")
+    # SidebarStats
+    Couts().comparer_couts_sources()
+    Efficacite().get_equipements_plus_energivores(top_n=5)
+    # AlertsTable
+    CoupureModel().get_all_coupures()
+    Statistique().anomalies_contextuelles()
+
+
+def mesurer(fonction, nb):
+    db = get_database(DB_PATH)
+    db.reset_stats()
+    _, duree = chronometrer(lambda: [fonction() for _ in range(nb)])
+    return duree / nb, db.get_stats()["requetes"] / nb
+
+
+def main(nb=20):
+    rafraichir_avant() # Migrations, caches de dimensions et imports hors mesure
+    service = DashboardService()
+    duree_avant, requetes_avant = mesurer(rafraichir_avant, nb)
+    duree_apres, requetes_apres = mesurer(service.snapshot, nb)
+    snapshot = service.snapshot()
+    print(f"Rafraîchissements       : {nb}")
+    print(f"Avant (par composant)   : {duree_avant * 1000:8.1f} ms, {requetes_avant:5.0f} requêtes")
+    print(f"DashboardSnapshot       : {duree_apres * 1000:8.1f} ms, {requetes_apres:5.0f} requêtes")
+    for etape, duree in snapshot.durees.items():
+        print(f"  {etape:<22}: {duree * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,57 @@
+"""
+Découpage de dates par période : chemin ligne à ligne (fromisoformat, strftime,
+timedelta) contre utils.date_utils (parser_iso + codes_periode + bincount).
+
+Usage : python -m benchmarks.bench_date_utils [nb_dates]
+"""
+import sys
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from benchmarks.utils_bench import chronometrer
+from utils.date_utils import parser_iso, codes_periode
+
+
+def generer_chaines(n):
+    rng = np.random.default_rng(0)
+    secondes = rng.integers(0, 3 * 365 * 86400, n)
+    dates = np.datetime64("2023-01-01T00:00:00") + secondes.astype("timedelta64[s]")
+    return np.char.replace(np.datetime_as_string(dates, unit="s"), "T", " ").tolist(), rng.random(n)
+
+
+def par_ligne(chaines, energies, grain):
+    totaux = {}
+    for chaine, energie in zip(chaines, energies):
+        d = datetime.fromisoformat(chaine)
+        if grain == "jour":
+            cle = str(d.date())
+        elif grain == "semaine":
+            cle = str(d.date() - timedelta(days=d.weekday()))
+        else:
+            cle = d.strftime("%Y-%m")
+        totaux[cle] = totaux.get(cle, 0.0) + energie
+    return totaux
+
+
+def vectorise(chaines, energies, grain):
+    cles, codes = codes_periode(parser_iso(chaines), grain)
+    return dict(zip(cles.tolist(), np.bincount(codes, weights=energies, minlength=len(cles)).tolist()))
+
+
+def main(n=1_000_000):
+    chaines, energies = generer_chaines(n)
+    print(f"Dates : {n}")
+    _, duree_parse = chronometrer(lambda: parser_iso(chaines))
+    print(f"parser_iso seul          : {duree_parse:7.3f} s")
+    for grain in ("jour", "semaine", "mois"):
+        attendu, duree_ligne = chronometrer(lambda: par_ligne(chaines, energies, grain))
+        obtenu, duree_vect = chronometrer(lambda: vectorise(chaines, energies, grain))
+        assert attendu.keys() == obtenu.keys()
+        assert all(abs(attendu[k] - obtenu[k]) < 1e-6 for k in attendu)
+        print(f"{grain:>8} : par ligne {duree_ligne:7.3f} s, vectorisé {duree_vect:7.3f} s "
+              f"(x{duree_ligne / duree_vect:.1f})")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,93 @@
+"""
+Démarrage de main.py : temps d'import et temps jusqu'au premier affichage de
+la fenêtre principale, avec le registre de vues (modules des fenêtres importés
+à la première ouverture, matplotlib au premier tracé) et en important d'avance
+les onze modules de vues et matplotlib, comme avant le registre.
+
+Chaque mesure tourne dans un processus neuf (imports à froid), avec la
+plateforme Qt « offscreen ». Mesures :
+- import : import de controller.main_controller (et des vues, « avant ») ;
+- premier affichage : du lancement de l'interpréteur au premier événement
+  Paint de la fenêtre principale ;
+- données : jusqu'à l'affichage du premier instantané du tableau de bord.
+
+Comme l'application, le benchmark ouvre data/energie.db.
+
+Usage : python -m benchmarks.bench_demarrage [nb_lancements]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from config.settings import BASE_DIR
+
+
+def mesurer_lancement(importer_vues):
+    """Exécuté dans le processus fils : démarre l'application comme main.py et mesure."""
+    import time
+    debut = time.perf_counter()
+
+    from PySide6.QtCore import QEvent, QObject
+    from PySide6.QtWidgets import QApplication
+    from controller.main_controller import MainController
+    if importer_vues:
+        import importlib
+        from controller.registre_vues import VUES
+        importlib.import_module("matplotlib.backends.backend_qt5agg")
+        for module, _, _ in VUES.values():
+            importlib.import_module(module)
+    duree_import = time.perf_counter() - debut
+
+    app = QApplication(sys.argv[:1])
+    qss_path = BASE_DIR / "config" / "style.qss"
+    if qss_path.exists():
+        app.setStyleSheet(qss_path.read_text())
+
+    mesures = {"import": duree_import}
+
+    class PremierAffichage(QObject):
+        def eventFilter(self, objet, evenement):
+            if evenement.type() == QEvent.Paint and "premier_affichage" not in mesures:
+                mesures["premier_affichage"] = time.perf_counter() - debut
+            return False
+
+    controller = MainController(app)
+    main_view = controller.main_view
+    filtre = PremierAffichage()
+    main_view.installEventFilter(filtre)
+    main_view.chargeur.resultat_pret.connect(
+        lambda _: mesures.setdefault("donnees", time.perf_counter() - debut))
+    main_view.show()
+    while len(mesures) < 3 and time.perf_counter() - debut < 60:
+        app.processEvents()
+        main_view.chargeur.pool.waitForDone(1)
+    main_view.chargeur.arreter()
+    print(json.dumps(mesures))
+
+
+def lancer(importer_vues):
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    sortie = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_demarrage", "--fils", "avant" if importer_vues else "apres"],
+        cwd=BASE_DIR, env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(sortie.strip().splitlines()[-1])
+
+
+def main(nb=5):
+    print(f"Lancements              : {nb} (médianes)")
+    print(f"{'':24}{'import':>10}{'1er affichage':>16}{'données':>12}")
+    for libelle, importer_vues in (("Vues importées d'avance", True), ("Registre de vues", False)):
+        mesures = [lancer(importer_vues) for _ in range(nb)]
+        medianes = {cle: statistics.median(m[cle] for m in mesures) * 1000 for cle in mesures[0]}
+        print(f"{libelle:<24}{medianes['import']:8.0f} ms{medianes['premier_affichage']:13.0f} ms"
+              f"{medianes.get('donnees', float('nan')):9.0f} ms")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--fils"]:
+        mesurer_lancement(sys.argv[2] == "avant")
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
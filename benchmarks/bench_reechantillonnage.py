@@ -0,0 +1,34 @@
+"""
+Répartition au prorata de la durée (analysis.reechantillonnage) de millions de
+mesures synthétiques sur une grille de 15 min, ventilée par équipement.
+
+Usage : python -m benchmarks.bench_reechantillonnage [nb_mesures]
+"""
+import sys
+
+import numpy as np
+
+from analysis.reechantillonnage import repartir_sur_grille, totaux_par_periode
+from benchmarks.utils_bench import chronometrer
+
+
+def main(n=5_000_000):
+    rng = np.random.default_rng(0)
+    dates = np.datetime64("2025-01-01T00:00:00") + rng.integers(0, 90 * 1440, n).astype("timedelta64[m]")
+    durees = rng.choice([15, 30, 60, 180], n)
+    equipements = rng.integers(1, 200, n)
+    valeurs = rng.gamma(2.0, 1.0, n)
+
+    grille, duree_grille = chronometrer(
+        lambda: repartir_sur_grille(dates, durees, valeurs, pas_minutes=15, lignes=equipements)
+    )
+    jours, duree_jours = chronometrer(lambda: totaux_par_periode(grille, "jour"))
+    print(f"Mesures                 : {n}")
+    print(f"Matrice                 : {grille['matrice'].shape[0]} x {grille['matrice'].shape[1]}")
+    print(f"repartir_sur_grille     : {duree_grille:7.3f} s")
+    print(f"totaux_par_periode      : {duree_jours:7.3f} s")
+    print(f"Écart de conservation   : {abs(grille['matrice'].sum() - valeurs.sum()):.3e}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000)
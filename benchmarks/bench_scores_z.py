@@ -0,0 +1,31 @@
+"""
+Z-scores équipement × heure (analysis.baselines.scores_z) sur des millions de
+mesures synthétiques, heure de la journée comprise.
+
+Usage : python -m benchmarks.bench_scores_z [nb_mesures]
+"""
+import sys
+
+import numpy as np
+
+from analysis.baselines import scores_z
+from benchmarks.utils_bench import chronometrer
+from utils.date_utils import heure_du_jour
+
+
+def main(n=10_000_000):
+    rng = np.random.default_rng(0)
+    dates = np.datetime64("2024-01-01T00:00:00") + rng.integers(0, 2 * 365 * 86400, n).astype("timedelta64[s]")
+    equipements = rng.integers(1, 500, n)
+    valeurs = rng.gamma(2.0, 1.0, n) * (1 + equipements % 7)
+
+    heures, duree_heures = chronometrer(lambda: heure_du_jour(dates))
+    scores, duree_scores = chronometrer(lambda: scores_z(valeurs, equipements, heures))
+    print(f"Mesures                 : {n}")
+    print(f"heure_du_jour           : {duree_heures:7.3f} s")
+    print(f"scores_z                : {duree_scores:7.3f} s")
+    print(f"Anomalies (z > 3)       : {np.count_nonzero(scores['z_score'] > 3)}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000)
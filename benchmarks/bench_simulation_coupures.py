@@ -0,0 +1,36 @@
+"""
+Simulation Monte Carlo du coût des coupures (analysis.simulation_coupures) :
+profil horaire d'un million de mesures puis scénarios tirés en un lot.
+
+Usage : python -m benchmarks.bench_simulation_coupures [nb_scenarios]
+"""
+import sys
+
+import numpy as np
+
+from analysis.simulation_coupures import profil_horaire, simuler_monte_carlo
+from benchmarks.utils_bench import chronometrer
+
+
+def main(n=100_000, nb_mesures=1_000_000):
+    rng = np.random.default_rng(0)
+    dates = np.datetime64("2025-01-01T00:00:00") + rng.integers(0, 365 * 1440, nb_mesures).astype("timedelta64[m]")
+    durees_mesures = rng.choice([15, 60, 180], nb_mesures)
+    energies = rng.gamma(2.0, 1.0, nb_mesures)
+    heures_coupures = rng.uniform(0, 24, 500)
+    durees_coupures = rng.exponential(2.0, 500)
+    prix = np.where((np.arange(24) >= 18) & (np.arange(24) < 22), 1200.0, 900.0)
+
+    profil, duree_profil = chronometrer(lambda: profil_horaire(dates, durees_mesures, energies))
+    resultat, duree_mc = chronometrer(
+        lambda: simuler_monte_carlo(heures_coupures, durees_coupures, profil, prix, nb_scenarios=n, graine=0)
+    )
+    print(f"Mesures (profil)        : {nb_mesures}")
+    print(f"Scénarios               : {n}")
+    print(f"profil_horaire          : {duree_profil:7.3f} s")
+    print(f"simuler_monte_carlo     : {duree_mc:7.3f} s")
+    print(f"Moyenne / P95 / pire    : {resultat['moyenne']:,.0f} / {resultat['p95']:,.0f} / {resultat['pire']:,.0f} Ariary")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
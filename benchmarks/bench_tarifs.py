@@ -0,0 +1,39 @@
+"""
+Prix du kWh en vigueur (analysis.tarifs.GrilleTarifaire) pour des millions de
+mesures synthétiques, avec un historique de tarifs datés et des plages horaires.
+
+Usage : python -m benchmarks.bench_tarifs [nb_mesures]
+"""
+import sys
+
+import numpy as np
+
+from analysis.tarifs import GrilleTarifaire
+from benchmarks.utils_bench import chronometrer
+
+
+def main(n=10_000_000):
+    rng = np.random.default_rng(0)
+    tarifs = []
+    for id_source in (1, 2, 3):
+        for mois in range(1, 25):
+            date_effet = f"{2024 + (mois - 1) // 12}-{(mois - 1) % 12 + 1:02d}-01 00:00:00"
+            tarifs.append({"id_source": id_source, "date_effet": date_effet, "heure_debut": 0, "heure_fin": 24,
+                           "cout_kwh": 400.0 + 10 * mois + 100 * id_source})
+            tarifs.append({"id_source": id_source, "date_effet": date_effet, "heure_debut": 18, "heure_fin": 22,
+                           "cout_kwh": 900.0 + 10 * mois})
+    grille = GrilleTarifaire(tarifs)
+
+    dates = np.datetime64("2024-01-01T00:00:00") + rng.integers(0, 2 * 365 * 86400, n).astype("timedelta64[s]")
+    sources = rng.integers(1, 4, n)
+    energies = rng.gamma(2.0, 1.0, n)
+
+    couts, duree = chronometrer(lambda: grille.couts(sources, dates, energies))
+    print(f"Mesures                 : {n}")
+    print(f"Versions de tarif       : {len(grille.cles)}")
+    print(f"GrilleTarifaire.couts   : {duree:7.3f} s")
+    print(f"Coût total              : {couts.sum():,.0f} Ariary")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000)
@@ -0,0 +1,44 @@
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from config.settings import BASE_DIR
+
+SCHEMA_PATH = BASE_DIR / "model" / "db.txt"
+SEED_PATH = BASE_DIR / "data" / "seed.sql"
+
+
+def creer_base_temporaire():
+    """Crée une base SQLite temporaire avec le schéma et les données de seed.sql."""
+    fd, db_path = tempfile.mkstemp(suffix=".db", prefix="bench_")
+    os.close(fd)
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA_PATH.read_text(encoding="utf-8"))
+    conn.executescript(SEED_PATH.read_text(encoding="utf-8"))
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+def generer_consommations(n, nb_equipements=5, nb_sources=2, debut=datetime(2025, 1, 1), graine=42):
+    """Génère n lignes (id_equipement, id_source, duree_minutes, energie_kwh, date_heure)."""
+    rng = random.Random(graine)
+    for i in range(n):
+        date_heure = debut + timedelta(minutes=15 * i)
+        yield (
+            rng.randint(1, nb_equipements),
+            rng.randint(1, nb_sources),
+            rng.choice((15, 30, 60)),
+            round(rng.uniform(0.1, 5.0), 3),
+            date_heure.strftime("%Y-%m-%d %H:%M:%S"),
+        )
+
+
+def chronometrer(fonction, *args, **kwargs):
+    """Retourne (résultat, durée en secondes)."""
+    debut = time.perf_counter()
+    resultat = fonction(*args, **kwargs)
+    return resultat, time.perf_counter() - debut
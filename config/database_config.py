@@ -0,0 +1,536 @@
+"""
+Migrations versionnées du schéma SQLite.
+
+Chaque migration est un tuple (version, description, instructions) où
+`instructions` est une liste de requêtes SQL exécutées dans une même
+transaction. La version courante est enregistrée dans la table SCHEMA_VERSION ;
+appliquer_migrations() n'exécute que les migrations plus récentes, dans l'ordre.
+"""
+import re
+import sqlite3
+
+# Tables d'agrégats maintenues par triggers : grain -> (table, clé de période SQL)
+AGREGATS = {
+    "heure": ("CONSO_AGREGAT_HEURE", "strftime('%Y-%m-%d %H:00:00', {date})"),
+    "jour": ("CONSO_AGREGAT_JOUR", "date({date})"),
+    "mois": ("CONSO_AGREGAT_MOIS", "strftime('%Y-%m', {date})"),
+}
+TRIGGERS_AGREGATS = (
+    "trg_consommation_agregats_insert",
+    "trg_consommation_agregats_delete",
+    "trg_consommation_agregats_update",
+    "trg_equipement_agregats_batiment",
+)
+
+# Statistiques en ligne d'energie_kwh par équipement (voir analysis.stats_en_ligne) ;
+# les mesures sans équipement sont rangées sous id_equipement = 0
+TABLE_STATS = "STATS_CONSOMMATION"
+TRIGGERS_STATS = (
+    "trg_consommation_stats_insert",
+    "trg_consommation_stats_delete",
+    "trg_consommation_stats_update",
+)
+
+# Historique des tarifs (voir analysis.tarifs) : une version par (source, date d'effet),
+# éventuellement découpée en plages horaires [heure_debut, heure_fin[
+TABLE_TARIFS = "TARIF_SOURCE"
+TRIGGERS_TARIFS = (
+    "trg_source_tarif_insert",
+    "trg_source_tarif_update",
+)
+DATE_TARIF_INITIAL = "1970-01-01 00:00:00"
+
+# Compteur de modifications par table (voir model.modification_model) : chaque écriture,
+# quelle que soit la connexion, incrémente la version de sa table
+TABLE_MODIFICATIONS = "JOURNAL_MODIFICATIONS"
+TABLES_JOURNALISEES = (
+    "BATIMENT", "SOURCE_ENERGIE", "TYPE_EQUIPEMENT", "EQUIPEMENT", "COUPURE", "CONSOMMATION", TABLE_TARIFS,
+)
+
+
+def _sql_ajout_agregat(table, cle, ligne):
+    """Ajoute la ligne NEW/OLD `ligne` de CONSOMMATION à une table d'agrégats."""
+    periode = cle.format(date=f"{ligne}.date_heure")
+    return f"""
+        INSERT INTO {table} (periode, id_equipement, id_source, id_batiment, energie_kwh, duree_minutes, nb_mesures)
+        SELECT {periode}, {ligne}.id_equipement, {ligne}.id_source,
+               (SELECT id_batiment FROM EQUIPEMENT WHERE id_equipement = {ligne}.id_equipement),
+               COALESCE({ligne}.energie_kwh, 0), COALESCE({ligne}.duree_minutes, 0), 1
+        WHERE {periode} IS NOT NULL AND {ligne}.id_equipement IS NOT NULL AND {ligne}.id_source IS NOT NULL
+        ON CONFLICT (periode, id_equipement, id_source) DO UPDATE SET
+            energie_kwh = energie_kwh + excluded.energie_kwh,
+            duree_minutes = duree_minutes + excluded.duree_minutes,
+            nb_mesures = nb_mesures + 1;
+    """
+
+
+def _sql_retrait_agregat(table, cle, ligne):
+    """Retire la ligne `ligne` d'une table d'agrégats (et supprime les groupes vidés)."""
+    condition = f"""periode = {cle.format(date=f"{ligne}.date_heure")}
+        AND id_equipement = {ligne}.id_equipement AND id_source = {ligne}.id_source"""
+    return f"""
+        UPDATE {table} SET
+            energie_kwh = energie_kwh - COALESCE({ligne}.energie_kwh, 0),
+            duree_minutes = duree_minutes - COALESCE({ligne}.duree_minutes, 0),
+            nb_mesures = nb_mesures - 1
+        WHERE {condition};
+        DELETE FROM {table} WHERE {condition} AND nb_mesures <= 0;
+    """
+
+
+def creer_tables_agregats(db):
+    """Crée les tables d'agrégats (heure, jour, mois) si elles n'existent pas."""
+    for table, _ in AGREGATS.values():
+        db.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                periode TEXT NOT NULL,
+                id_equipement INTEGER NOT NULL,
+                id_source INTEGER NOT NULL,
+                id_batiment INTEGER,
+                energie_kwh REAL NOT NULL DEFAULT 0,
+                duree_minutes INTEGER NOT NULL DEFAULT 0,
+                nb_mesures INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (periode, id_equipement, id_source)
+            ) WITHOUT ROWID
+        """)
+        db.execute(f"CREATE INDEX IF NOT EXISTS idx_{table.lower()}_batiment ON {table}(id_batiment, periode)")
+
+
+def creer_triggers_agregats(db):
+    """(Re)crée les triggers qui tiennent les agrégats à jour sur CONSOMMATION et EQUIPEMENT."""
+    supprimer_triggers_agregats(db)
+    ajouts_new = "".join(_sql_ajout_agregat(table, cle, "NEW") for table, cle in AGREGATS.values())
+    retraits_old = "".join(_sql_retrait_agregat(table, cle, "OLD") for table, cle in AGREGATS.values())
+    maj_batiment = "".join(
+        f"UPDATE {table} SET id_batiment = NEW.id_batiment WHERE id_equipement = NEW.id_equipement;"
+        for table, _ in AGREGATS.values()
+    )
+    db.execute(f"CREATE TRIGGER trg_consommation_agregats_insert AFTER INSERT ON CONSOMMATION BEGIN {ajouts_new} END")
+    db.execute(f"CREATE TRIGGER trg_consommation_agregats_delete AFTER DELETE ON CONSOMMATION BEGIN {retraits_old} END")
+    db.execute(f"""
+        CREATE TRIGGER trg_consommation_agregats_update
+        AFTER UPDATE OF id_equipement, id_source, date_heure, duree_minutes, energie_kwh ON CONSOMMATION
+        BEGIN {retraits_old} {ajouts_new} END
+    """)
+    db.execute(f"""
+        CREATE TRIGGER trg_equipement_agregats_batiment
+        AFTER UPDATE OF id_batiment ON EQUIPEMENT
+        BEGIN {maj_batiment} END
+    """)
+
+
+def supprimer_triggers_agregats(db):
+    for trigger in TRIGGERS_AGREGATS:
+        db.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+
+
+def reconstruire_agregats(db):
+    """
+    Recalcule toutes les tables d'agrégats depuis CONSOMMATION (après un chargement
+    en masse sans triggers, ou pour réparer une dérive). Le grain heure est calculé
+    depuis les lignes brutes, le jour depuis l'heure et le mois depuis le jour.
+
+    Returns:
+        dict: {grain: nombre de groupes}
+    """
+    table_heure, cle_heure = AGREGATS["heure"]
+    table_jour, _ = AGREGATS["jour"]
+    table_mois, _ = AGREGATS["mois"]
+    colonnes = "periode, id_equipement, id_source, id_batiment, energie_kwh, duree_minutes, nb_mesures"
+    with db.transaction():
+        for table, _ in AGREGATS.values():
+            db.execute(f"DELETE FROM {table}")
+        db.execute(f"""
+            INSERT INTO {table_heure} ({colonnes})
+            SELECT {cle_heure.format(date="c.date_heure")} AS p, c.id_equipement, c.id_source, e.id_batiment,
+                   SUM(COALESCE(c.energie_kwh, 0)), SUM(COALESCE(c.duree_minutes, 0)), COUNT(*)
+            FROM CONSOMMATION c
+            LEFT JOIN EQUIPEMENT e ON c.id_equipement = e.id_equipement
+            WHERE p IS NOT NULL AND c.id_equipement IS NOT NULL AND c.id_source IS NOT NULL
+            GROUP BY p, c.id_equipement, c.id_source
+        """)
+        for cible, source, cle in ((table_jour, table_heure, "substr(periode, 1, 10)"),
+                                   (table_mois, table_jour, "substr(periode, 1, 7)")):
+            db.execute(f"""
+                INSERT INTO {cible} ({colonnes})
+                SELECT {cle} AS p, id_equipement, id_source, id_batiment,
+                       SUM(energie_kwh), SUM(duree_minutes), SUM(nb_mesures)
+                FROM {source}
+                GROUP BY p, id_equipement, id_source
+            """)
+    return {
+        grain: db.fetch_one(f"SELECT COUNT(*) AS n FROM {table}")["n"]
+        for grain, (table, _) in AGREGATS.items()
+    }
+
+
+def _sql_ajout_stats(ligne):
+    """Ajoute energie_kwh de la ligne `ligne` à l'état de son équipement (Welford)."""
+    # Dans un UPDATE, les expressions lisent les anciennes valeurs : delta = x - moyenne
+    delta = f"({ligne}.energie_kwh - moyenne)"
+    return f"""
+        INSERT INTO {TABLE_STATS} (id_equipement, nb_mesures, moyenne, m2, mini, maxi)
+        SELECT COALESCE({ligne}.id_equipement, 0), 1, {ligne}.energie_kwh, 0, {ligne}.energie_kwh, {ligne}.energie_kwh
+        WHERE {ligne}.energie_kwh IS NOT NULL
+        ON CONFLICT (id_equipement) DO UPDATE SET
+            nb_mesures = nb_mesures + 1,
+            moyenne = moyenne + {delta} / (nb_mesures + 1),
+            m2 = m2 + {delta} * {delta} * nb_mesures / (nb_mesures + 1.0),
+            mini = MIN(mini, excluded.mini),
+            maxi = MAX(maxi, excluded.maxi);
+    """
+
+
+def _sql_retrait_stats(ligne):
+    """
+    Retire energie_kwh de la ligne `ligne` de l'état de son équipement (Welford inversé).
+    Min et max ne s'inversent pas : ils sont relus par l'index équipement seulement
+    si la valeur retirée était une borne.
+    """
+    delta = f"({ligne}.energie_kwh - moyenne)"
+    equipement = f"COALESCE({ligne}.id_equipement, 0)"
+    condition = f"id_equipement = {equipement} AND {ligne}.energie_kwh IS NOT NULL"
+    return f"""
+        UPDATE {TABLE_STATS} SET
+            nb_mesures = nb_mesures - 1,
+            moyenne = CASE WHEN nb_mesures > 1 THEN moyenne - {delta} / (nb_mesures - 1) ELSE 0 END,
+            m2 = CASE WHEN nb_mesures > 1
+                      THEN MAX(0, m2 - {delta} * {delta} * nb_mesures / (nb_mesures - 1.0)) ELSE 0 END
+        WHERE {condition};
+        DELETE FROM {TABLE_STATS} WHERE {condition} AND nb_mesures <= 0;
+        UPDATE {TABLE_STATS} SET
+            mini = (SELECT MIN(energie_kwh) FROM CONSOMMATION WHERE id_equipement IS {ligne}.id_equipement),
+            maxi = (SELECT MAX(energie_kwh) FROM CONSOMMATION WHERE id_equipement IS {ligne}.id_equipement)
+        WHERE {condition} AND ({ligne}.energie_kwh <= mini OR {ligne}.energie_kwh >= maxi);
+    """
+
+
+def creer_table_stats(db):
+    db.execute(f"""
+        CREATE TABLE IF NOT EXISTS {TABLE_STATS} (
+            id_equipement INTEGER PRIMARY KEY,
+            nb_mesures INTEGER NOT NULL DEFAULT 0,
+            moyenne REAL NOT NULL DEFAULT 0,
+            m2 REAL NOT NULL DEFAULT 0,
+            mini REAL,
+            maxi REAL
+        )
+    """)
+
+
+def creer_triggers_stats(db):
+    """(Re)crée les triggers qui tiennent STATS_CONSOMMATION à jour."""
+    supprimer_triggers_stats(db)
+    db.execute(f"CREATE TRIGGER trg_consommation_stats_insert AFTER INSERT ON CONSOMMATION BEGIN {_sql_ajout_stats('NEW')} END")
+    db.execute(f"CREATE TRIGGER trg_consommation_stats_delete AFTER DELETE ON CONSOMMATION BEGIN {_sql_retrait_stats('OLD')} END")
+    db.execute(f"""
+        CREATE TRIGGER trg_consommation_stats_update
+        AFTER UPDATE OF id_equipement, energie_kwh ON CONSOMMATION
+        BEGIN {_sql_retrait_stats('OLD')} {_sql_ajout_stats('NEW')} END
+    """)
+
+
+def supprimer_triggers_stats(db):
+    for trigger in TRIGGERS_STATS:
+        db.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+
+
+def reconstruire_stats(db):
+    """
+    Recalcule STATS_CONSOMMATION depuis CONSOMMATION (deux passes SQL : moyenne,
+    puis somme des carrés des écarts). Retourne le nombre d'équipements.
+    """
+    with db.transaction():
+        db.execute(f"DELETE FROM {TABLE_STATS}")
+        db.execute(f"""
+            INSERT INTO {TABLE_STATS} (id_equipement, nb_mesures, moyenne, m2, mini, maxi)
+            SELECT m.id_equipement, COUNT(*), m.moyenne,
+                   SUM((c.energie_kwh - m.moyenne) * (c.energie_kwh - m.moyenne)),
+                   MIN(c.energie_kwh), MAX(c.energie_kwh)
+            FROM CONSOMMATION c
+            JOIN (SELECT COALESCE(id_equipement, 0) AS id_equipement, AVG(energie_kwh) AS moyenne
+                  FROM CONSOMMATION WHERE energie_kwh IS NOT NULL
+                  GROUP BY 1) m ON COALESCE(c.id_equipement, 0) = m.id_equipement
+            WHERE c.energie_kwh IS NOT NULL
+            GROUP BY m.id_equipement
+        """)
+    return db.fetch_one(f"SELECT COUNT(*) AS n FROM {TABLE_STATS}")["n"]
+
+
+def _nom_trigger_modification(table, operation):
+    return f"trg_{table.lower()}_modification_{operation.lower()}"
+
+
+def creer_table_modifications(db):
+    db.execute(f"""
+        CREATE TABLE IF NOT EXISTS {TABLE_MODIFICATIONS} (
+            nom_table TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+    """)
+    db.executemany(
+        f"INSERT OR IGNORE INTO {TABLE_MODIFICATIONS} (nom_table) VALUES (?)",
+        [(table,) for table in TABLES_JOURNALISEES],
+    )
+
+
+def creer_triggers_modifications(db, tables=TABLES_JOURNALISEES):
+    for table in tables:
+        for operation in ("INSERT", "UPDATE", "DELETE"):
+            db.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {_nom_trigger_modification(table, operation)}
+                AFTER {operation} ON {table}
+                BEGIN
+                    UPDATE {TABLE_MODIFICATIONS} SET version = version + 1 WHERE nom_table = '{table}';
+                END
+            """)
+
+
+def supprimer_triggers_modifications(db, tables=TABLES_JOURNALISEES):
+    for table in tables:
+        for operation in ("INSERT", "UPDATE", "DELETE"):
+            db.execute(f"DROP TRIGGER IF EXISTS {_nom_trigger_modification(table, operation)}")
+
+
+def marquer_modification(db, table):
+    """Incrémente à la main la version d'une table (écritures faites triggers suspendus)."""
+    db.execute(f"UPDATE {TABLE_MODIFICATIONS} SET version = version + 1 WHERE nom_table = ?", (table,))
+
+
+def _migration_agregats(db):
+    creer_tables_agregats(db)
+    creer_triggers_agregats(db)
+    reconstruire_agregats(db)
+
+
+def _migration_stats(db):
+    creer_table_stats(db)
+    creer_triggers_stats(db)
+    reconstruire_stats(db)
+
+
+def _migration_tarifs(db):
+    db.execute(f"""
+        CREATE TABLE IF NOT EXISTS {TABLE_TARIFS} (
+            id_tarif INTEGER PRIMARY KEY AUTOINCREMENT,
+            id_source INTEGER NOT NULL REFERENCES SOURCE_ENERGIE(id_source) ON DELETE CASCADE,
+            date_effet TEXT NOT NULL CHECK(date_effet = datetime(date_effet)),
+            heure_debut INTEGER NOT NULL DEFAULT 0 CHECK(heure_debut BETWEEN 0 AND 23),
+            heure_fin INTEGER NOT NULL DEFAULT 24 CHECK(heure_fin > heure_debut AND heure_fin <= 24),
+            cout_kwh REAL NOT NULL CHECK(cout_kwh >= 0)
+        )
+    """)
+    db.execute(f"CREATE INDEX IF NOT EXISTS idx_tarif_source_effet ON {TABLE_TARIFS}(id_source, date_effet)")
+    # Le prix actuel vaut pour tout l'historique existant
+    db.execute(f"""
+        INSERT INTO {TABLE_TARIFS} (id_source, date_effet, cout_kwh)
+        SELECT id_source, '{DATE_TARIF_INITIAL}', cout_kwh FROM SOURCE_ENERGIE
+    """)
+    db.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_source_tarif_insert AFTER INSERT ON SOURCE_ENERGIE
+        BEGIN
+            INSERT INTO {TABLE_TARIFS} (id_source, date_effet, cout_kwh)
+            VALUES (NEW.id_source, '{DATE_TARIF_INITIAL}', NEW.cout_kwh);
+        END
+    """)
+    # Modifier le prix ne réécrit pas le passé : nouvelle version à l'heure pleine suivante
+    db.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_source_tarif_update AFTER UPDATE OF cout_kwh ON SOURCE_ENERGIE
+        WHEN NEW.cout_kwh IS NOT OLD.cout_kwh
+        BEGIN
+            INSERT INTO {TABLE_TARIFS} (id_source, date_effet, cout_kwh)
+            VALUES (NEW.id_source, strftime('%Y-%m-%d %H:00:00', 'now', 'localtime', '+1 hour'), NEW.cout_kwh);
+        END
+    """)
+
+
+def _migration_modifications(db):
+    creer_table_modifications(db)
+    creer_triggers_modifications(db)
+
+
+MIGRATIONS = [
+    (1, "Index de performance sur CONSOMMATION et COUPURE", [
+        # Couvrant pour get_consommation_entre_dates (date_heure, energie_kwh)
+        """CREATE INDEX IF NOT EXISTS idx_consommation_date
+           ON CONSOMMATION(date_heure, energie_kwh)""",
+        # Couvrant pour get_consommation_by_equipement et les agrégats par équipement
+        """CREATE INDEX IF NOT EXISTS idx_consommation_equipement_date
+           ON CONSOMMATION(id_equipement, date_heure, energie_kwh, duree_minutes)""",
+        # Couvrant pour get_consommation_by_source
+        """CREATE INDEX IF NOT EXISTS idx_consommation_source
+           ON CONSOMMATION(id_source, date_heure, energie_kwh)""",
+        """CREATE INDEX IF NOT EXISTS idx_coupure_batiment_debut
+           ON COUPURE(id_batiment, debut_coupure)""",
+    ]),
+    (2, "Index de pagination par clé (date_heure, id_conso)", [
+        """CREATE INDEX IF NOT EXISTS idx_consommation_date_id
+           ON CONSOMMATION(date_heure, id_conso)""",
+    ]),
+    (3, "Tables d'agrégats heure/jour/mois maintenues par triggers", [
+        _migration_agregats,
+    ]),
+    (4, "Colonnes epoch entières indexées (date_epoch, debut_epoch, fin_epoch)", [
+        # Colonnes générées : toujours synchrones avec le texte ISO, sans trigger
+        """ALTER TABLE CONSOMMATION ADD COLUMN date_epoch INTEGER
+           GENERATED ALWAYS AS (CAST(strftime('%s', date_heure) AS INTEGER)) VIRTUAL""",
+        """ALTER TABLE COUPURE ADD COLUMN debut_epoch INTEGER
+           GENERATED ALWAYS AS (CAST(strftime('%s', debut_coupure) AS INTEGER)) VIRTUAL""",
+        """ALTER TABLE COUPURE ADD COLUMN fin_epoch INTEGER
+           GENERATED ALWAYS AS (CAST(strftime('%s', fin_coupure) AS INTEGER)) VIRTUAL""",
+        # Recherches par plage et pagination par clé (date_epoch, id_conso)
+        """CREATE INDEX IF NOT EXISTS idx_consommation_epoch
+           ON CONSOMMATION(date_epoch, id_conso)""",
+        """CREATE INDEX IF NOT EXISTS idx_coupure_epoch
+           ON COUPURE(debut_epoch, fin_epoch)""",
+        """CREATE INDEX IF NOT EXISTS idx_coupure_batiment_epoch
+           ON COUPURE(id_batiment, debut_epoch, fin_epoch)""",
+    ]),
+    (5, "Statistiques en ligne par équipement (STATS_CONSOMMATION) et index energie_kwh", [
+        _migration_stats,
+        # Lignes au-dessus d'un seuil d'anomalie sans relire toute la colonne
+        """CREATE INDEX IF NOT EXISTS idx_consommation_energie
+           ON CONSOMMATION(energie_kwh)""",
+    ]),
+    (6, "Historique des tarifs par date d'effet et plage horaire (TARIF_SOURCE)", [
+        _migration_tarifs,
+    ]),
+    (7, "Compteur de modifications par table pour l'actualisation automatique", [
+        _migration_modifications,
+    ]),
+    (8, "Suppression de l'index (date_heure, id_conso) remplacé par idx_consommation_epoch", [
+        # Plus aucune requête ne trie par (date_heure, id_conso) depuis la migration 4 ;
+        # idx_consommation_date couvre toujours le tri par date_heure
+        "DROP INDEX IF EXISTS idx_consommation_date_id",
+    ]),
+]
+
+# Requêtes critiques qui ne doivent jamais parcourir toute une table
+REQUETES_CRITIQUES = {
+    "consommation_par_equipement": (
+        "SELECT date_heure, energie_kwh FROM CONSOMMATION WHERE id_equipement = ? ORDER BY date_heure",
+        (1,),
+    ),
+    "consommation_entre_dates": (
+        "SELECT date_heure, energie_kwh FROM CONSOMMATION WHERE date_heure BETWEEN ? AND ? ORDER BY date_heure",
+        ("2025-01-01 00:00:00", "2025-01-31 23:59:59"),
+    ),
+    "consommation_par_source": (
+        """SELECT date_heure, energie_kwh FROM CONSOMMATION c
+           JOIN SOURCE_ENERGIE s ON c.id_source = s.id_source
+           WHERE s.nom_source = ? ORDER BY date_heure""",
+        ("JIRAMA",),
+    ),
+    "consommation_entre_epochs": (
+        "SELECT date_heure, energie_kwh FROM CONSOMMATION WHERE date_epoch BETWEEN ? AND ? ORDER BY date_epoch",
+        (1735689600, 1738367999),
+    ),
+    "consommation_page_suivante": (
+        """SELECT id_conso, date_epoch FROM CONSOMMATION c
+           WHERE (c.date_epoch, c.id_conso) > (?, ?) ORDER BY c.date_epoch, c.id_conso LIMIT 200""",
+        (1735689600, 0),
+    ),
+    "coupures_entre_epochs": (
+        "SELECT id_coupure FROM COUPURE WHERE debut_epoch BETWEEN ? AND ? ORDER BY debut_epoch DESC",
+        (1735689600, 1738367999),
+    ),
+    "consommation_au_dessus_seuil": (
+        "SELECT id_conso FROM CONSOMMATION WHERE energie_kwh > ?",
+        (5.0,),
+    ),
+    "coupures_par_batiment": (
+        "SELECT * FROM COUPURE WHERE id_batiment = ? ORDER BY debut_coupure DESC",
+        (1,),
+    ),
+}
+
+TABLES_SURVEILLEES = ("CONSOMMATION", "COUPURE")
+
+
+def version_schema(db):
+    """Retourne la version du schéma (0 si aucune migration n'a été appliquée)."""
+    db.execute("""
+        CREATE TABLE IF NOT EXISTS SCHEMA_VERSION (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applique_le DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    row = db.fetch_one("SELECT MAX(version) AS version FROM SCHEMA_VERSION")
+    return row["version"] or 0
+
+
+def appliquer_migrations(db, migrations=MIGRATIONS):
+    """
+    Applique dans l'ordre les migrations plus récentes que la version courante.
+
+    Args:
+        db (Database): Gestionnaire de connexions (model.database).
+
+    Returns:
+        list: Les versions appliquées lors de cet appel.
+    """
+    version_courante = version_schema(db)
+    appliquees = []
+    for version, description, instructions in sorted(migrations, key=lambda m: m[0]):
+        if version <= version_courante:
+            continue
+        with db.transaction():
+            for instruction in instructions:
+                if callable(instruction):
+                    instruction(db)
+                else:
+                    db.execute(instruction)
+            db.execute(
+                "INSERT INTO SCHEMA_VERSION (version, description) VALUES (?, ?)",
+                (version, description),
+            )
+        appliquees.append(version)
+    return appliquees
+
+
+def plans_en_scan(db, requetes=REQUETES_CRITIQUES, tables=TABLES_SURVEILLEES):
+    """
+    Exécute EXPLAIN QUERY PLAN sur les requêtes critiques.
+
+    Returns:
+        dict: {nom_requete: [lignes du plan en SCAN complet]} pour chaque requête
+              qui parcourt entièrement une des tables surveillées ou qui n'est pas
+              encore exécutable sur ce schéma (vide si tout va bien).
+    """
+    motifs = [re.compile(rf"^SCAN {table}\b", re.IGNORECASE) for table in tables]
+    echecs = {}
+    for nom, (query, params) in requetes.items():
+        alias = _alias_tables(query, tables)
+        scans = []
+        try:
+            plan = db.fetch_all(f"EXPLAIN QUERY PLAN {query}", params)
+        except sqlite3.OperationalError as e:
+            # Colonne ou table pas encore créée par les migrations
+            echecs[nom] = [f"ERREUR {e}"]
+            continue
+        for row in plan:
+            detail = row["detail"]
+            if any(m.match(detail) for m in motifs) or any(re.match(rf"^SCAN {a}\b", detail) for a in alias):
+                scans.append(detail)
+        if scans:
+            echecs[nom] = scans
+    return echecs
+
+
+def verifier_plans_requetes(db, requetes=REQUETES_CRITIQUES):
+    """Lève une RuntimeError si une requête critique retombe sur un parcours complet."""
+    echecs = plans_en_scan(db, requetes)
+    if echecs:
+        details = "; ".join(f"{nom}: {', '.join(lignes)}" for nom, lignes in echecs.items())
+        raise RuntimeError(f"Requêtes critiques sans index : {details}")
+
+
+def _alias_tables(query, tables):
+    """Alias SQL utilisés pour les tables surveillées (ex. 'CONSOMMATION c' -> 'c')."""
+    alias = []
+    for table in tables:
+        for match in re.finditer(rf"\b{table}\s+(?:AS\s+)?(\w+)", query, re.IGNORECASE):
+            if match.group(1).upper() not in ("WHERE", "JOIN", "ON", "ORDER", "GROUP", "LEFT", "INNER"):
+                alias.append(match.group(1))
+    return alias
@@ -1,21 +1,13 @@
 from PySide6.QtWidgets import QApplication
 from view.main_view import MainView
-from view.equipement_view import EquipementView # Import EquipementView
-from view.source_view import SourceView # Import SourceView
-from view.coupure_view import CoupureView # Import CoupureView
-from view.consommation_add_view import ConsommationAddView # Import ConsommationAddView
-from view.consommation_view import ConsommationView # Import ConsommationView
-from view.couts_view import CoutsView # Import CoutsView
-from view.efficacite_view import EfficaciteView # Import EfficaciteView
-from view.anomalies_view import AnomaliesView # Import AnomaliesView
-from view.alertes_view import AlertesView # Import AlertesView
-from view.coupures_history_view import CoupuresHistoryView # Import CoupuresHistoryView
-from view.simulation_view import SimulationView # Import SimulationView
+from controller.registre_vues import RegistreVues # Fenêtres importées et construites à la première ouverture
+from model.database import get_database
 
 class MainController:
     def __init__(self, app_instance):
         self.app = app_instance # Use the passed app instance
         self.main_view = MainView()
+        self.vues = RegistreVues(self.main_view)
         self.main_view.manage_equipements_triggered.connect(self.show_equipement_view) # Connect signal to slot
         self.main_view.manage_sources_triggered.connect(self.show_source_view) # Connect new signal
         self.main_view.manage_coupures_triggered.connect(self.show_coupure_view) # Connect new signal
@@ -35,49 +27,39 @@ class MainController:
         # etc.
 
     def show_equipement_view(self):
-        self.equipement_view = EquipementView(self.main_view) # Pass main_view as parent
-        self.equipement_view.exec() # Use exec_() for modal dialog
+        self.vues.afficher("equipement")
 
     def show_source_view(self):
-        self.source_view = SourceView(self.main_view) # Pass main_view as parent
-        self.source_view.exec() # Use exec_() for modal dialog
+        self.vues.afficher("source")
 
     def show_coupure_view(self):
-        self.coupure_view = CoupureView(self.main_view) # Pass main_view as parent
-        self.coupure_view.exec() # Use exec_() for modal dialog
-    
+        self.vues.afficher("coupure")
+
     def show_add_consommation_view(self):
-        self.consommation_add_view = ConsommationAddView(self.main_view) # Pass main_view as parent
-        self.consommation_add_view.exec() # Use exec_() for modal dialog
+        self.vues.afficher("consommation_add")
 
     def show_consommation_view(self):
-        self.consommation_view = ConsommationView(self.main_view) # Pass main_view as parent
-        self.consommation_view.exec() # Use exec_() for modal dialog
+        self.vues.afficher("consommation")
 
     def show_couts_view(self):
-        self.couts_view = CoutsView(self.main_view) # Pass main_view as parent
-        self.couts_view.exec() # Use exec_() for modal dialog
+        self.vues.afficher("couts")
 
     def show_efficacite_view(self):
-        self.efficacite_view = EfficaciteView(self.main_view) # Pass main_view as parent
-        self.efficacite_view.exec() # Use exec_() for modal dialog
+        self.vues.afficher("efficacite")
 
     def show_anomalies_view(self):
-        self.anomalies_view = AnomaliesView(self.main_view) # Pass main_view as parent
-        self.anomalies_view.exec() # Use exec_() for modal dialog
+        self.vues.afficher("anomalies")
 
     def show_alertes_view(self):
-        self.alertes_view = AlertesView(self.main_view) # Pass main_view as parent
-        self.alertes_view.exec() # Use exec_() for modal dialog
+        self.vues.afficher("alertes")
 
     def show_coupures_history_view(self):
-        self.coupures_history_view = CoupuresHistoryView(self.main_view) # Pass main_view as parent
-        self.coupures_history_view.exec() # Use exec_() for modal dialog
+        self.vues.afficher("coupures_history")
 
     def show_simulation_view(self):
-        self.simulation_view = SimulationView(self.main_view) # Pass main_view as parent
-        self.simulation_view.exec() # Use exec_() for modal dialog
+        self.vues.afficher("simulation")
 
     def run(self):
         self.main_view.show()
         self.app.exec()
+        get_database().close_all() # Ferme les connexions persistantes à la sortie
@@ -0,0 +1,80 @@
+"""
+Registre des fenêtres secondaires de l'application.
+
+Le module d'une vue n'est importé qu'à la première ouverture de sa fenêtre :
+matplotlib, les modèles et les analyseurs qu'il tire ne retardent plus
+l'affichage de la fenêtre principale. Chaque fenêtre est construite une seule
+fois puis réutilisée ; à la réouverture, elle n'est rechargée (méthode
+actualiser de la vue) que si une des tables qu'elle lit a été modifiée depuis
+sa dernière ouverture (compteurs de model.modification_model) :
+
+    vues = RegistreVues(main_view)
+    vues.afficher("consommation")
+"""
+import importlib
+
+from config.settings import DB_PATH
+from model.modification_model import ModificationModel
+
+# Nom -> (module, classe, tables lues par la fenêtre)
+VUES = {
+    "equipement": ("view.equipement_view", "EquipementView", ("EQUIPEMENT", "TYPE_EQUIPEMENT", "BATIMENT")),
+    "source": ("view.source_view", "SourceView", ("SOURCE_ENERGIE",)),
+    "coupure": ("view.coupure_view", "CoupureView", ("COUPURE", "BATIMENT")),
+    "consommation_add": ("view.consommation_add_view", "ConsommationAddView",
+                         ("EQUIPEMENT", "BATIMENT", "SOURCE_ENERGIE")),
+    "consommation": ("view.consommation_view", "ConsommationView",
+                     ("CONSOMMATION", "EQUIPEMENT", "BATIMENT", "SOURCE_ENERGIE")),
+    "couts": ("view.couts_view", "CoutsView",
+              ("CONSOMMATION", "EQUIPEMENT", "BATIMENT", "SOURCE_ENERGIE", "TARIF_SOURCE", "COUPURE")),
+    "efficacite": ("view.efficacite_view", "EfficaciteView",
+                   ("CONSOMMATION", "EQUIPEMENT", "TYPE_EQUIPEMENT", "BATIMENT")),
+    "anomalies": ("view.anomalies_view", "AnomaliesView",
+                  ("CONSOMMATION", "EQUIPEMENT", "BATIMENT", "SOURCE_ENERGIE")),
+    "alertes": ("view.alertes_view", "AlertesView",
+                ("CONSOMMATION", "COUPURE", "EQUIPEMENT", "TYPE_EQUIPEMENT", "BATIMENT", "SOURCE_ENERGIE")),
+    "coupures_history": ("view.coupures_history_view", "CoupuresHistoryView", ("COUPURE", "BATIMENT")),
+    "simulation": ("view.simulation_view", "SimulationView", ("BATIMENT",)),
+}
+
+
+class RegistreVues:
+    def __init__(self, parent=None, vues=VUES, db_path=DB_PATH):
+        self.parent = parent
+        self.vues = vues
+        self.modification_model = ModificationModel(db_path)
+        self._instances = {}
+        self._versions = {} # Nom -> versions des tables à la dernière ouverture
+
+    def classe(self, nom):
+        """Classe de la vue, importée à la première demande."""
+        module, classe, _ = self.vues[nom]
+        return getattr(importlib.import_module(module), classe)
+
+    def est_construite(self, nom):
+        return nom in self._instances
+
+    def obtenir(self, nom):
+        """
+        Fenêtre du registre : construite au premier appel, puis réutilisée et
+        actualisée si les tables qu'elle lit ont changé.
+        """
+        # Versions lues avant le chargement : une écriture pendant celui-ci sera vue à la prochaine ouverture
+        versions = self.modification_model.get_versions()
+        vue = self._instances.get(nom)
+        if vue is None:
+            vue = self._instances[nom] = self.classe(nom)(self.parent)
+        elif self._tables_modifiees(nom, versions):
+            vue.actualiser()
+        self._versions[nom] = versions
+        return vue
+
+    def _tables_modifiees(self, nom, versions):
+        precedentes = self._versions.get(nom, {})
+        return {table for table in self.vues[nom][2] if versions.get(table) != precedentes.get(table)}
+
+    def afficher(self, nom):
+        """Ouvre la fenêtre en mode modal et la retourne une fois fermée."""
+        vue = self.obtenir(nom)
+        vue.exec()
+        return vue
@@ -1,5 +1,5 @@
 import matplotlib.pyplot as plt
-from datetime import datetime
+import numpy as np
 import sys
 import os
 
@@ -7,15 +7,15 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 
-from model.consommation_model import ConsommationModel
 from analysis.statistiques import Statistique
+from utils.date_utils import epochs_vers_datetime64
 
 def plot_anomalies(all_consommations, anomalies, output_path="graphs/anomalies.png"):
     """
     Génère un graphique de série temporelle de la consommation avec les anomalies mises en évidence.
     
     Args:
-        all_consommations (list of dict): Liste de toutes les consommations.
+        all_consommations (list of dict): Liste de toutes les consommations (avec "date_epoch").
         anomalies (list of dict): Liste des consommations identifiées comme des anomalies.
         output_path (str): Chemin pour sauvegarder l'image du graphique.
     """
@@ -23,13 +23,13 @@ def plot_anomalies(all_consommations, anomalies, output_path="graphs/anomalies.p
         print("Aucune donnée de consommation à afficher pour le graphique d'anomalies.")
         return
 
-    # Tri des données par date pour un tracé correct
-    all_consommations.sort(key=lambda x: datetime.fromisoformat(x['date_heure']))
+    # Tri des données par date (epoch entier) pour un tracé correct, sans analyse de chaînes
+    dates = epochs_vers_datetime64([item['date_epoch'] for item in all_consommations])
+    energies = np.array([item['energie_kwh'] for item in all_consommations])
+    ordre = np.argsort(dates, kind="stable")
+    dates, energies = dates[ordre], energies[ordre]
     
-    dates = [datetime.fromisoformat(item['date_heure']) for item in all_consommations]
-    energies = [item['energie_kwh'] for item in all_consommations]
-    
-    dates_anomalies = [datetime.fromisoformat(item['date_heure']) for item in anomalies]
+    dates_anomalies = epochs_vers_datetime64([item['date_epoch'] for item in anomalies])
     energies_anomalies = [item['energie_kwh'] for item in anomalies]
 
     plt.figure(figsize=(15, 8))
@@ -49,13 +49,48 @@ def plot_anomalies(all_consommations, anomalies, output_path="graphs/anomalies.p
     print(f"Graphique des anomalies sauvegardé dans : {output_path}")
     plt.close()
 
+def plot_scores_anomalies(scores, seuil_z=2.0, output_path="graphs/anomalies.png"):
+    """
+    Trace la consommation avec les anomalies équipement × heure, et les z-scores en dessous.
+
+    Args:
+        scores (dict): Colonnes retournées par Statistique.scores_anomalies()
+            ("date_heure" en datetime64, "energie_kwh", "z_score").
+        seuil_z (float): Z-score au-delà duquel une mesure est une anomalie.
+        output_path (str): Chemin pour sauvegarder l'image du graphique.
+    """
+    if len(scores["date_heure"]) == 0:
+        print("Aucune donnée de consommation à afficher pour le graphique d'anomalies.")
+        return
+
+    dates, energies, z = scores["date_heure"], scores["energie_kwh"], scores["z_score"]
+    anormales = z > seuil_z
+
+    fig, (ax_conso, ax_z) = plt.subplots(2, 1, figsize=(15, 10), sharex=True,
+                                         gridspec_kw={"height_ratios": [2, 1]})
+    ax_conso.plot(dates, energies, label='Consommation', color='blue', alpha=0.7, zorder=1)
+    ax_conso.scatter(dates[anormales], energies[anormales], color='red', s=100,
+                     label='Anomalies Détectées', zorder=2, edgecolors='black')
+    ax_conso.set_ylabel("Consommation (kWh)")
+    ax_conso.set_title("Détection d'Anomalies (référence équipement × heure)")
+    ax_conso.legend()
+    ax_conso.grid(True, which='both', linestyle='--', linewidth=0.5)
+
+    ax_z.scatter(dates, z, c=np.where(anormales, 'red', 'grey'), s=12)
+    ax_z.axhline(seuil_z, color='red', linestyle='--', linewidth=1, label=f"Seuil z = {seuil_z:g}")
+    ax_z.set_xlabel("Date et Heure")
+    ax_z.set_ylabel("Z-score")
+    ax_z.legend()
+    ax_z.grid(True, linestyle='--', linewidth=0.5)
+    fig.autofmt_xdate()
+    fig.tight_layout()
+
+    fig.savefig(output_path)
+    print(f"Graphique des anomalies sauvegardé dans : {output_path}")
+    plt.close(fig)
+
 if __name__ == '__main__':
     print("Génération du graphique des anomalies (démonstration)...")
     
-    consommation_model = ConsommationModel()
     statistique_analyzer = Statistique()
-    
-    all_data = consommation_model.get_all_consommation()
-    anomalies_data = statistique_analyzer.anomalies(facteur=2)
-    
-    plot_anomalies(all_data, anomalies_data)
+    plot_scores_anomalies(statistique_analyzer.scores_anomalies(), seuil_z=2.0)
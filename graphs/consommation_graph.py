@@ -9,6 +9,8 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 # Pour l'exemple, nous allons importer les classes nécessaires
 from analysis.couts import Couts
 from analysis.efficacite import Efficacite
+from analysis.statistiques import Statistique
+from model.source_model import SourceModel
 
 def plot_consommation_par_jour(data_couts_par_jour, output_path="graphs/consommation_par_jour.png"):
     """
@@ -76,6 +78,41 @@ def plot_consommation_par_equipement(data_energivores, output_path="graphs/conso
     print(f"Graphique de répartition par équipement sauvegardé dans : {output_path}")
     plt.close()
 
+def plot_consommation_par_source(agregat, noms_series=None, periode="jour",
+                                 output_path="graphs/consommation_par_source.png"):
+    """
+    Génère un graphique en barres empilées de la consommation par période et par série.
+
+    Args:
+        agregat (dict): Résultat de Statistique.agreger_tableaux(..., series=...)
+            ("periodes" en datetime64, "totaux" de forme (nb_series, nb_periodes), "series").
+        noms_series (dict, optional): Libellé de chaque étiquette de série (ex. {id_source: nom}).
+        periode (str): Grain d'agrégation, pour les libellés.
+        output_path (str): Chemin pour sauvegarder l'image du graphique.
+    """
+    if len(agregat["periodes"]) == 0:
+        print("Aucune donnée de consommation par source à afficher.")
+        return
+
+    noms_series = noms_series or {}
+    positions = np.arange(len(agregat["periodes"]))
+    bas = np.zeros(len(positions))
+    plt.figure(figsize=(12, 7))
+    for serie, totaux in zip(agregat["series"].tolist(), agregat["totaux"]):
+        plt.bar(positions, totaux, bottom=bas, label=noms_series.get(serie, str(serie)))
+        bas += totaux
+    plt.xticks(positions, agregat["cles"], rotation=45, ha='right')
+    plt.xlabel(periode.capitalize())
+    plt.ylabel("Consommation (kWh)")
+    plt.title(f"Consommation par Source et par {periode.capitalize()}")
+    plt.legend()
+    plt.grid(axis='y', linestyle='--', alpha=0.7)
+    plt.tight_layout()
+
+    plt.savefig(output_path)
+    print(f"Graphique de consommation par source sauvegardé dans : {output_path}")
+    plt.close()
+
 if __name__ == '__main__':
     print("Génération des graphiques de consommation (démonstration)...")
     
@@ -88,3 +125,11 @@ if __name__ == '__main__':
     efficacite_analyzer = Efficacite()
     energivores_data = efficacite_analyzer.get_equipements_plus_energivores(top_n=5)
     plot_consommation_par_equipement(energivores_data)
+
+    # 3. Consommation par source et par semaine, agrégée sur les colonnes NumPy
+    statistique_analyzer = Statistique()
+    colonnes = statistique_analyzer.model.get_consommation_colonnes()
+    agregat = statistique_analyzer.agreger_tableaux(colonnes["date_heure"], colonnes["energie_kwh"],
+                                                    periode="semaine", series=colonnes["id_source"])
+    noms_sources = {source["id_source"]: source["nom_source"] for source in SourceModel().get_all_sources()}
+    plot_consommation_par_source(agregat, noms_sources, periode="semaine")
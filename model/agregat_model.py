@@ -0,0 +1,121 @@
+"""
+Lecture des tables d'agrégats CONSO_AGREGAT_HEURE / _JOUR / _MOIS.
+
+Les agrégats sont tenus à jour par les triggers créés dans config.database_config.
+Après un chargement en masse fait hors de l'application, les reconstruire avec :
+
+    python -m model.agregat_model reconstruire
+"""
+import sys
+from contextlib import contextmanager
+
+import numpy as np
+
+from config.settings import DB_PATH
+from config.database_config import (
+    AGREGATS, creer_triggers_agregats, supprimer_triggers_agregats, reconstruire_agregats,
+    creer_triggers_stats, supprimer_triggers_stats, reconstruire_stats,
+    creer_triggers_modifications, supprimer_triggers_modifications, marquer_modification,
+)
+from model.database import get_database
+from utils.date_utils import parser_iso
+
+class AgregatModel:
+    # Grain demandé -> (grain de table lu, clé de période SQL calculée sur la colonne periode)
+    PERIODES = {
+        "heure": ("heure", "a.periode"),
+        "jour": ("jour", "a.periode"),
+        "semaine": ("jour", "date(a.periode, 'weekday 0', '-6 days')"), # Lundi de la semaine
+        "mois": ("mois", "a.periode"),
+        "annee": ("mois", "substr(a.periode, 1, 4)"),
+    }
+
+    def __init__(self, db_path=DB_PATH):
+        self.db_path = db_path
+        self.db = get_database(self.db_path)
+
+    def _periode(self, periode):
+        if periode not in self.PERIODES:
+            raise ValueError(f"La période doit être parmi {', '.join(self.PERIODES)}.")
+        grain, cle = self.PERIODES[periode]
+        return AGREGATS[grain][0], cle
+
+    def totaux_par_periode(self, periode="jour", id_equipement=None, id_source=None, id_batiment=None):
+        """
+        Énergie totale par période lue dans les agrégats.
+
+        Returns:
+            dict: {cle_periode: total_kwh} trié par période. Les clés sont celles de
+                  Statistique.agreger_par_periode ('YYYY-MM-DD', lundi de la semaine, 'YYYY-MM').
+        """
+        table, cle = self._periode(periode)
+        conditions, params = [], []
+        for colonne, valeur in (("id_equipement", id_equipement), ("id_source", id_source), ("id_batiment", id_batiment)):
+            if valeur is not None:
+                conditions.append(f"a.{colonne} = ?")
+                params.append(valeur)
+        query = f"SELECT {cle} AS cle, SUM(a.energie_kwh) AS total FROM {table} a"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " GROUP BY cle ORDER BY cle"
+        return {row["cle"]: row["total"] for row in self.db.fetch_all(query, params)}
+
+    def get_energie_horaire(self, id_batiment=None, id_source=None):
+        """
+        Énergie par (heure, source, bâtiment) lue dans CONSO_AGREGAT_HEURE, sous
+        forme de colonnes NumPy (pour appliquer les tarifs horaires, voir analysis.tarifs).
+
+        Returns:
+            dict: {"heure": datetime64[s], "id_source": int64, "id_batiment": int64
+                   (0 si inconnu), "energie_kwh": float64}, triés par heure.
+        """
+        table = AGREGATS["heure"][0]
+        conditions, params = [], []
+        for colonne, valeur in (("id_batiment", id_batiment), ("id_source", id_source)):
+            if valeur is not None:
+                conditions.append(f"a.{colonne} = ?")
+                params.append(valeur)
+        query = f"SELECT a.periode, a.id_source, COALESCE(a.id_batiment, 0), SUM(a.energie_kwh) FROM {table} a"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " GROUP BY a.periode, a.id_source, a.id_batiment ORDER BY a.periode"
+        lignes = [tuple(row) for row in self.db.fetch_all(query, params)]
+        periodes, sources, batiments, energies = zip(*lignes) if lignes else ((), (), (), ())
+        return {
+            "heure": parser_iso(periodes),
+            "id_source": np.array(sources, dtype=np.int64),
+            "id_batiment": np.array(batiments, dtype=np.int64),
+            "energie_kwh": np.array(energies, dtype=np.float64),
+        }
+
+    def reconstruire(self):
+        """Recalcule tous les agrégats depuis CONSOMMATION. Retourne {grain: nb_groupes}."""
+        creer_triggers_agregats(self.db)
+        return reconstruire_agregats(self.db)
+
+    @contextmanager
+    def chargement_en_masse(self):
+        """
+        Suspend les triggers d'agrégats, de statistiques (STATS_CONSOMMATION) et
+        du compteur de modifications de CONSOMMATION pendant un gros chargement,
+        puis les reconstruit en une passe à la sortie (même en cas d'erreur).
+        """
+        supprimer_triggers_agregats(self.db)
+        supprimer_triggers_stats(self.db)
+        supprimer_triggers_modifications(self.db, tables=("CONSOMMATION",))
+        try:
+            yield
+        finally:
+            self.reconstruire()
+            creer_triggers_stats(self.db)
+            reconstruire_stats(self.db)
+            creer_triggers_modifications(self.db, tables=("CONSOMMATION",))
+            marquer_modification(self.db, "CONSOMMATION")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ["reconstruire"]:
+        print("Usage : python -m model.agregat_model reconstruire")
+        sys.exit(1)
+    for grain, nb in AgregatModel().reconstruire().items():
+        print(f"{grain:>6} : {nb} groupes")
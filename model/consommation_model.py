@@ -1,61 +1,380 @@
 import sqlite3
+from itertools import islice
+import numpy as np
 from config.settings import DB_PATH
+from config.database_config import TABLE_STATS
+from model.database import get_database
+from utils.date_utils import vers_epoch
 
 class ConsommationModel:
-    def __init__(self):
-        self.db_path = DB_PATH
-        
+    CHAMPS_CONSOMMATION = ("id_equipement", "id_source", "duree_minutes", "energie_kwh", "date_heure")
+    REQUETE_CONSOMMATION_DETAILLEE = """
+        SELECT
+            c.id_conso,
+            c.id_equipement,
+            c.id_source,
+            c.date_heure,
+            c.date_epoch,
+            c.duree_minutes,
+            c.energie_kwh,
+            s.nom_source,
+            e.nom_equipement,
+            b.nom AS batiment
+        FROM CONSOMMATION c
+        JOIN SOURCE_ENERGIE s ON c.id_source = s.id_source
+        JOIN EQUIPEMENT e ON c.id_equipement = e.id_equipement
+        JOIN BATIMENT b ON e.id_batiment = b.id_batiment
+    """
+
+    # Colonnes renvoyées par get_consommation_colonnes(), dans l'ordre du SELECT
+    DTYPE_COLONNES = np.dtype([
+        ("id_conso", np.int64),
+        ("date_heure", np.int64), # secondes epoch, converti en datetime64[s]
+        ("duree_minutes", np.int32),
+        ("energie_kwh", np.float64),
+        ("id_equipement", np.int32),
+        ("id_source", np.int32),
+        ("id_batiment", np.int32),
+    ])
+    NAT_EPOCH = np.iinfo(np.int64).min # Représentation entière de NaT
+
+    def __init__(self, db_path=DB_PATH):
+        self.db_path = db_path
+        self.db = get_database(self.db_path)
+
     def connect(self):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        return self.db.connect()
+
     def add_consommation (self, id_equipement, id_source, duree_minutes, energie_kwh, date_heure=None):
-        conn = self.connect()
-        cursor = conn.cursor()
         query = """
             INSERT INTO CONSOMMATION
             (id_equipement, id_source, date_heure, duree_minutes, energie_kwh)
             VALUES (?, ?, ?, ?, ?)
         """
         try:
-            cursor.execute(query, (id_equipement, id_source, date_heure, duree_minutes, energie_kwh))
-            conn.commit()
+            self.db.execute(query, (id_equipement, id_source, date_heure, duree_minutes, energie_kwh))
             return True, None
         except sqlite3.IntegrityError as e:
             return False, f"Erreur d'intégrité lors de l'ajout de consommation: {e}"
         except sqlite3.Error as e:
             return False, f"Erreur de base de données lors de l'ajout de consommation: {e}"
-        finally:
-            conn.close()
-        
+
+    def add_consommations_bulk(self, consommations, taille_lot=1000):
+        """
+        Insère des consommations en masse depuis n'importe quel itérable.
+
+        Chaque ligne est un tuple (id_equipement, id_source, duree_minutes,
+        energie_kwh[, date_heure]) dans l'ordre de add_consommation, ou un dict
+        avec ces clés. Les lignes sont insérées par lots de `taille_lot` avec
+        executemany, un lot = une transaction. Une ligne invalide est rejetée
+        sans interrompre le lot.
+
+        Returns:
+            tuple: (nb_inserees, erreurs) où erreurs est une liste de
+                   (index_ligne, message).
+        """
+        ids_equipements = {row["id_equipement"] for row in self.db.fetch_all("SELECT id_equipement FROM EQUIPEMENT")}
+        ids_sources = {row["id_source"] for row in self.db.fetch_all("SELECT id_source FROM SOURCE_ENERGIE")}
+        query = """
+            INSERT INTO CONSOMMATION
+            (id_equipement, id_source, date_heure, duree_minutes, energie_kwh)
+            VALUES (?, ?, ?, ?, ?)
+        """
+
+        nb_inserees = 0
+        erreurs = []
+        iterateur = enumerate(consommations)
+        while True:
+            lot = list(islice(iterateur, taille_lot))
+            if not lot:
+                break
+
+            valides = []
+            for index, conso in lot:
+                params, erreur = self._preparer_ligne_bulk(conso, ids_equipements, ids_sources)
+                if erreur:
+                    erreurs.append((index, erreur))
+                else:
+                    valides.append((index, params))
+            if not valides:
+                continue
+
+            try:
+                with self.db.transaction():
+                    self.db.executemany(query, [params for _, params in valides])
+                nb_inserees += len(valides)
+            except sqlite3.Error:
+                # Le lot a été annulé : on le rejoue ligne par ligne pour isoler les fautives
+                with self.db.transaction():
+                    for index, params in valides:
+                        try:
+                            self.db.execute(query, params)
+                            nb_inserees += 1
+                        except sqlite3.Error as e:
+                            erreurs.append((index, f"Erreur de base de données lors de l'ajout de consommation: {e}"))
+
+        return nb_inserees, erreurs
+
+    def _preparer_ligne_bulk(self, conso, ids_equipements, ids_sources):
+        if isinstance(conso, dict):
+            valeurs = [conso.get(champ) for champ in self.CHAMPS_CONSOMMATION]
+        else:
+            valeurs = list(conso) + [None] * (len(self.CHAMPS_CONSOMMATION) - len(conso))
+            if len(valeurs) != len(self.CHAMPS_CONSOMMATION):
+                return None, f"Nombre de champs invalide ({len(conso)})."
+        id_equipement, id_source, duree_minutes, energie_kwh, date_heure = valeurs
+
+        if id_equipement not in ids_equipements:
+            return None, f"Équipement inconnu: {id_equipement}"
+        if id_source not in ids_sources:
+            return None, f"Source inconnue: {id_source}"
+        if not isinstance(duree_minutes, (int, float)) or duree_minutes <= 0:
+            return None, f"Durée invalide: {duree_minutes}"
+        if not isinstance(energie_kwh, (int, float)) or energie_kwh < 0:
+            return None, f"Énergie invalide: {energie_kwh}"
+        return (id_equipement, id_source, date_heure, duree_minutes, energie_kwh), None
+
     def get_all_consommation(self):
-        conn = self.connect()
-        cursor = conn.cursor()
+        return list(self.iter_all_consommation())
+
+    def iter_all_consommation(self, taille_lot=500):
+        """Variante générateur de get_all_consommation (lecture par fetchmany)."""
+        query = self.REQUETE_CONSOMMATION_DETAILLEE + " ORDER BY c.date_epoch, c.id_conso"
+        for row in self.db.iter_fetch(query, taille_lot=taille_lot):
+            yield dict(row)
+
+    PERIODES_SQL = {
+        "jour": "date(c.date_heure)",
+        "semaine": "date(c.date_heure, 'weekday 0', '-6 days')", # lundi de la semaine
+        "mois": "strftime('%Y-%m', c.date_heure)",
+    }
+
+    def _filtres_consommation(self, id_equipement=None, id_source=None, date_debut=None, date_fin=None,
+                              id_batiment=None):
+        """Construit la clause WHERE (liste de conditions, paramètres) des filtres de consommation."""
+        conditions, params = [], []
+        if id_batiment is not None:
+            # Sous-requête plutôt que jointure : utilisable quelle que soit la requête appelante
+            conditions.append("c.id_equipement IN (SELECT id_equipement FROM EQUIPEMENT WHERE id_batiment = ?)")
+            params.append(id_batiment)
+        if id_equipement is not None:
+            conditions.append("c.id_equipement = ?")
+            params.append(id_equipement)
+        if id_source is not None:
+            conditions.append("c.id_source = ?")
+            params.append(id_source)
+        # Bornes converties une fois en epoch : recherche entière sur idx_consommation_epoch
+        if date_debut:
+            conditions.append("c.date_epoch >= ?")
+            params.append(vers_epoch(date_debut))
+        if date_fin:
+            conditions.append("c.date_epoch <= ?")
+            params.append(vers_epoch(date_fin))
+        return conditions, params
+
+    def rechercher_consommations(self, id_equipement=None, id_source=None, date_debut=None, date_fin=None,
+                                 apres=None, taille_page=200):
+        """
+        Retourne une page de consommations filtrées en SQL, triées par (date_epoch, id_conso).
+
+        Pagination par clé : `apres` est le curseur (date_epoch, id_conso) de la dernière
+        ligne de la page précédente, ce qui évite les OFFSET coûteux. Les mesures dont
+        la date est illisible (date_epoch NULL) viennent en tête, triées par id_conso.
+
+        Returns:
+            tuple: (lignes, curseur_suivant) ; curseur_suivant vaut None à la dernière page.
+        """
+        conditions, params = self._filtres_consommation(id_equipement, id_source, date_debut, date_fin)
+        if apres is not None:
+            date_epoch, id_conso = apres
+            if date_epoch is None:
+                # (NULL, id) > (?, ?) vaudrait NULL : on finit les mesures sans date, puis toutes les autres
+                conditions.append("((c.date_epoch IS NULL AND c.id_conso > ?) OR c.date_epoch IS NOT NULL)")
+                params.append(id_conso)
+            else:
+                conditions.append("(c.date_epoch, c.id_conso) > (?, ?)")
+                params.extend(apres)
+        query = self.REQUETE_CONSOMMATION_DETAILLEE
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY c.date_epoch, c.id_conso LIMIT ?"
+        params.append(taille_page)
+
+        lignes = [dict(row) for row in self.db.fetch_all(query, params)]
+        curseur_suivant = None
+        if len(lignes) == taille_page:
+            curseur_suivant = (lignes[-1]["date_epoch"], lignes[-1]["id_conso"])
+        return lignes, curseur_suivant
+
+    def agreger_consommations(self, periode="jour", id_equipement=None, id_source=None, date_debut=None, date_fin=None):
+        """
+        Somme d'energie_kwh par période ('jour', 'semaine' ou 'mois'), calculée en SQL
+        avec les mêmes filtres que rechercher_consommations.
+
+        Returns:
+            dict: {cle_periode: total_kwh}, mêmes clés que Statistique.agreger_par_periode.
+        """
+        if periode not in self.PERIODES_SQL:
+            raise ValueError("La période doit être 'jour', 'semaine' ou 'mois'.")
+        conditions, params = self._filtres_consommation(id_equipement, id_source, date_debut, date_fin)
+        cle = self.PERIODES_SQL[periode]
+        query = f"SELECT {cle} AS cle, SUM(c.energie_kwh) AS total FROM CONSOMMATION c"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " GROUP BY cle HAVING cle IS NOT NULL ORDER BY cle"
+        return {row["cle"]: row["total"] for row in self.db.fetch_all(query, params)}
+
+    def get_stats_energie(self, id_batiment=None, id_source=None, id_equipement=None, date_debut=None, date_fin=None):
+        """
+        Count, somme, min, max, moyenne et écart-type d'energie_kwh calculés par une
+        seule requête d'agrégat : aucune ligne n'est chargée en Python.
+
+        Les sommes portent sur x - K, K étant la moyenne globale persistée
+        (STATS_CONSOMMATION) : la variance SUM((x-K)²)/n - (SUM(x-K)/n)² ne souffre
+        alors pas de l'annulation de la formule naïve SUM(x²)/n - moyenne².
+
+        Returns:
+            dict: {"nb_mesures", "total_kwh", "moyenne_kwh", "min_kwh", "max_kwh",
+                   "ecart_type"} ou None si aucune mesure ne correspond.
+        """
+        conditions, params = self._filtres_consommation(id_equipement, id_source, date_debut, date_fin, id_batiment)
+        row = self.db.fetch_one(f"SELECT SUM(nb_mesures * moyenne) / SUM(nb_mesures) AS decalage FROM {TABLE_STATS}")
+        decalage = (row["decalage"] if row else None) or 0.0
         query = """
+            SELECT COUNT(c.energie_kwh) AS n, SUM(c.energie_kwh - ?) AS somme,
+                   SUM((c.energie_kwh - ?) * (c.energie_kwh - ?)) AS somme_carres,
+                   MIN(c.energie_kwh) AS mini, MAX(c.energie_kwh) AS maxi
+            FROM CONSOMMATION c
+        """
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        row = self.db.fetch_one(query, [decalage] * 3 + params)
+        n = row["n"]
+        if not n:
+            return None
+        moyenne_decalee = row["somme"] / n
+        variance = max(row["somme_carres"] / n - moyenne_decalee * moyenne_decalee, 0.0)
+        return {
+            "nb_mesures": n,
+            "total_kwh": row["somme"] + n * decalage,
+            "moyenne_kwh": moyenne_decalee + decalage,
+            "min_kwh": row["mini"],
+            "max_kwh": row["maxi"],
+            "ecart_type": variance ** 0.5,
+        }
+
+    def get_totaux_par_equipement(self):
+        """
+        Énergie, durée et nombre de mesures par équipement, en une requête groupée
+        (parcours de l'index couvrant idx_consommation_equipement_date).
+
+        Returns:
+            dict: {id_equipement: {"energie_kwh", "duree_minutes", "nb_mesures"}}
+        """
+        query = """
+            SELECT id_equipement,
+                   SUM(energie_kwh) AS energie_kwh,
+                   SUM(duree_minutes) AS duree_minutes,
+                   COUNT(*) AS nb_mesures
+            FROM CONSOMMATION
+            GROUP BY id_equipement
+        """
+        return {
+            row["id_equipement"]: {
+                "energie_kwh": row["energie_kwh"] or 0.0,
+                "duree_minutes": row["duree_minutes"] or 0,
+                "nb_mesures": row["nb_mesures"],
+            }
+            for row in self.db.fetch_all(query)
+        }
+
+    def get_consommation_colonnes(self, building_id=None, date_debut=None, date_fin=None, taille_lot=8192):
+        """
+        Charge la table CONSOMMATION sous forme de colonnes NumPy, sans dict par ligne.
+
+        Les tuples du curseur sont convertis lot par lot en tableau structuré,
+        puis séparés en colonnes contiguës. Les dates viennent de la colonne
+        entière date_epoch : aucune chaîne n'est analysée.
+
+        Args:
+            building_id (int, optional): Restreindre à un bâtiment.
+            date_debut, date_fin (optional): Bornes incluses (datetime, chaîne ISO ou epoch).
+
+        Returns:
+            dict: {
+                "id_conso": int64, "date_heure": datetime64[s],
+                "duree_minutes": int32, "energie_kwh": float64,
+                "id_equipement": int32, "id_source": int32, "id_batiment": int32
+            } (tableaux de même longueur, triés par date)
+        """
+        query = f"""
             SELECT
                 c.id_conso,
-                c.id_equipement,
-                c.id_source,
-                c.date_heure,
-                c.duree_minutes,
-                c.energie_kwh,
-                s.nom_source,
-                e.nom_equipement,
-                b.nom AS batiment
+                COALESCE(c.date_epoch, {self.NAT_EPOCH}),
+                COALESCE(c.duree_minutes, 0),
+                COALESCE(c.energie_kwh, 0.0),
+                COALESCE(c.id_equipement, 0),
+                COALESCE(c.id_source, 0),
+                COALESCE(e.id_batiment, 0)
             FROM CONSOMMATION c
             JOIN SOURCE_ENERGIE s ON c.id_source = s.id_source
             JOIN EQUIPEMENT e ON c.id_equipement = e.id_equipement
             JOIN BATIMENT b ON e.id_batiment = b.id_batiment
-            ORDER BY c.date_heure
         """
-        cursor.execute(query)
-        rows = cursor.fetchall()
-        conn.close()
-        return [dict(row) for row in rows]
-    
+        conditions, params = [], []
+        if building_id is not None:
+            conditions.append("e.id_batiment = ?")
+            params.append(building_id)
+        if date_debut is not None:
+            conditions.append("c.date_epoch >= ?")
+            params.append(vers_epoch(date_debut))
+        if date_fin is not None:
+            conditions.append("c.date_epoch <= ?")
+            params.append(vers_epoch(date_fin))
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY c.date_epoch, c.id_conso"
+
+        cursor = self.db.execute(query, params)
+        cursor.row_factory = None # tuples bruts, pas de sqlite3.Row
+        lots = []
+        try:
+            while True:
+                rows = cursor.fetchmany(taille_lot)
+                if not rows:
+                    break
+                lots.append(np.array(rows, dtype=self.DTYPE_COLONNES))
+        finally:
+            cursor.close()
+
+        table = np.concatenate(lots) if lots else np.empty(0, dtype=self.DTYPE_COLONNES)
+        colonnes = {nom: np.ascontiguousarray(table[nom]) for nom in self.DTYPE_COLONNES.names}
+        colonnes["date_heure"] = colonnes["date_heure"].view("datetime64[s]")
+        return colonnes
+
+    def get_consommation_by_ids(self, ids_conso, taille_lot=500):
+        """Détail (comme get_all_consommation) des consommations dont l'id est dans ids_conso."""
+        ids_conso = [int(i) for i in ids_conso]
+        resultats = []
+        for i in range(0, len(ids_conso), taille_lot):
+            lot = ids_conso[i:i + taille_lot]
+            placeholders = ", ".join("?" * len(lot))
+            query = self.REQUETE_CONSOMMATION_DETAILLEE + f" WHERE c.id_conso IN ({placeholders})"
+            resultats.extend(dict(row) for row in self.db.fetch_all(query, lot))
+        resultats.sort(key=lambda conso: (conso["date_epoch"] is None, conso["date_epoch"] or 0, conso["id_conso"]))
+        return resultats
+
+    def get_consommation_au_dessus(self, seuil):
+        """Détail des consommations dont energie_kwh > seuil (via idx_consommation_energie)."""
+        rows = self.db.fetch_all("SELECT id_conso FROM CONSOMMATION WHERE energie_kwh > ?", (float(seuil),))
+        return self.get_consommation_by_ids([row["id_conso"] for row in rows])
+
+    def compter_au_dessus(self, seuil):
+        """Nombre de consommations dont energie_kwh > seuil, sans charger les lignes."""
+        row = self.db.fetch_one("SELECT COUNT(*) AS n FROM CONSOMMATION WHERE energie_kwh > ?", (float(seuil),))
+        return row["n"]
+
     def get_consommation_by_source(self, nom_source):
-        conn = self.connect()
-        cursor = conn.cursor()
         query = """
             SELECT date_heure, energie_kwh
             FROM CONSOMMATION c
@@ -63,64 +382,37 @@ class ConsommationModel:
             WHERE s.nom_source = ?
             ORDER BY date_heure
         """
-
-        cursor.execute(query, (nom_source,))
-        rows = cursor.fetchall()
-        conn.close()
+        rows = self.db.fetch_all(query, (nom_source,))
         return [dict(row) for row in rows]
-    
+
     def get_consommation_entre_dates(self, date_debut, date_fin):
-        conn = self.connect()
-        cursor = conn.cursor()
         query = """
             SELECT date_heure, energie_kwh
             FROM CONSOMMATION
-            WHERE date_heure BETWEEN ? AND ?
-            ORDER BY date_heure
+            WHERE date_epoch BETWEEN ? AND ?
+            ORDER BY date_epoch
         """
-
-        cursor.execute(query, (date_debut, date_fin))
-        rows = cursor.fetchall()
-        conn.close()
+        rows = self.db.fetch_all(query, (vers_epoch(date_debut), vers_epoch(date_fin)))
         return [(row["date_heure"], row["energie_kwh"]) for row in rows]
 
     def get_consommation_by_building(self, building_id):
-        conn = self.connect()
-        cursor = conn.cursor()
-        query = """
-            SELECT
-                c.id_conso,
-                c.id_equipement,
-                c.id_source,
-                c.date_heure,
-                c.duree_minutes,
-                c.energie_kwh,
-                s.nom_source,
-                e.nom_equipement,
-                b.nom AS batiment
-            FROM CONSOMMATION c
-            JOIN SOURCE_ENERGIE s ON c.id_source = s.id_source
-            JOIN EQUIPEMENT e ON c.id_equipement = e.id_equipement
-            JOIN BATIMENT b ON e.id_batiment = b.id_batiment
+        return list(self.iter_consommation_by_building(building_id))
+
+    def iter_consommation_by_building(self, building_id, taille_lot=500):
+        """Variante générateur de get_consommation_by_building."""
+        query = self.REQUETE_CONSOMMATION_DETAILLEE + """
             WHERE b.id_batiment = ?
-            ORDER BY c.date_heure
+            ORDER BY c.date_epoch, c.id_conso
         """
-        cursor.execute(query, (building_id,))
-        rows = cursor.fetchall()
-        conn.close()
-        return [dict(row) for row in rows]    
+        for row in self.db.iter_fetch(query, (building_id,), taille_lot=taille_lot):
+            yield dict(row)
+
     def get_consommation_by_equipement(self, id_equipement):
-        conn = self.connect()
-        cursor = conn.cursor()
         query = """
             SELECT date_heure, energie_kwh
             FROM CONSOMMATION
             WHERE id_equipement = ?
             ORDER BY date_heure
         """
-
-        cursor.execute(query, (id_equipement,))
-        rows = cursor.fetchall()
-        conn.close()
-
-        return [(row["date_heure"], row["energie_kwh"]) for row in rows]
\ No newline at end of file
+        rows = self.db.fetch_all(query, (id_equipement,))
+        return [(row["date_heure"], row["energie_kwh"]) for row in rows]
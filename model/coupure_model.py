@@ -1,121 +1,152 @@
 import sqlite3
+import numpy as np
 from config.settings import DB_PATH
+from model.database import get_database
+from utils.date_utils import vers_epoch
 from datetime import datetime
 
 class CoupureModel:
+    # Colonnes renvoyées par get_coupures_colonnes(), dans l'ordre du SELECT
+    DTYPE_COLONNES = np.dtype([
+        ("id_coupure", np.int64),
+        ("id_batiment", np.int32),
+        ("debut_coupure", np.int64), # secondes epoch
+        ("fin_coupure", np.int64), # secondes epoch, "maintenant" si en cours
+        ("en_cours", np.bool_),
+    ])
+
     def __init__(self):
         self.db_path = DB_PATH
-        
+        self.db = get_database(self.db_path)
+
     def connect(self):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        return self.db.connect()
 
     def add_coupure(self, id_batiment, debut_coupure, fin_coupure=None, cause=None):
-        conn = self.connect()
-        cursor = conn.cursor()
         query = """
             INSERT INTO COUPURE (id_batiment, debut_coupure, fin_coupure, cause)
             VALUES (?, ?, ?, ?)
         """
         try:
-            cursor.execute(query, (id_batiment, debut_coupure, fin_coupure, cause))
-            conn.commit()
+            cursor = self.db.execute(query, (id_batiment, debut_coupure, fin_coupure, cause))
             return cursor.lastrowid
         except sqlite3.Error as e:
             return False, f"Erreur de base de données lors de l'ajout de la coupure: {e}"
-        finally:
-            conn.close()
 
     def update_coupure(self, id_coupure, id_batiment, debut_coupure, fin_coupure=None, cause=None):
-        conn = self.connect()
-        cursor = conn.cursor()
         query = """
             UPDATE COUPURE
             SET id_batiment = ?, debut_coupure = ?, fin_coupure = ?, cause = ?
             WHERE id_coupure = ?
         """
         try:
-            cursor.execute(query, (id_batiment, debut_coupure, fin_coupure, cause, id_coupure))
-            conn.commit()
+            self.db.execute(query, (id_batiment, debut_coupure, fin_coupure, cause, id_coupure))
             return True, None # Success
         except sqlite3.Error as e:
             return False, f"Erreur de base de données lors de la modification de la coupure: {e}"
-        finally:
-            conn.close()
 
     def delete_coupure(self, id_coupure):
-        conn = self.connect()
-        cursor = conn.cursor()
         query = "DELETE FROM COUPURE WHERE id_coupure = ?"
         try:
-            cursor.execute(query, (id_coupure,))
-            conn.commit()
+            self.db.execute(query, (id_coupure,))
             return True, None # Success
         except sqlite3.Error as e:
             return False, f"Erreur de base de données lors de la suppression de la coupure: {e}"
-        finally:
-            conn.close()
 
 
     def get_all_coupures(self):
-        conn = self.connect()
-        cursor = conn.cursor()
+        return list(self.iter_all_coupures())
+
+    def iter_all_coupures(self, taille_lot=500):
+        """Variante générateur de get_all_coupures (lecture par fetchmany)."""
         query = """
             SELECT
                 c.id_coupure,
                 c.id_batiment,
                 c.debut_coupure,
                 c.fin_coupure,
+                c.debut_epoch,
+                c.fin_epoch,
                 c.cause,
                 b.nom AS nom_batiment
             FROM COUPURE c
             JOIN BATIMENT b ON c.id_batiment = b.id_batiment
-            ORDER BY c.debut_coupure DESC
+            ORDER BY c.debut_epoch DESC
         """
-        cursor.execute(query)
-        rows = cursor.fetchall()
-        conn.close()
-        return [dict(row) for row in rows]
+        for row in self.db.iter_fetch(query, taille_lot=taille_lot):
+            yield dict(row)
+
+    def get_coupures_colonnes(self, maintenant=None):
+        """
+        Charge les coupures sous forme de colonnes NumPy (bornes en datetime64[s]).
+
+        Args:
+            maintenant (datetime, optional): Fin retenue pour les coupures en cours
+                (par défaut datetime.now()).
+
+        Returns:
+            dict: {"id_coupure", "id_batiment", "debut_coupure", "fin_coupure", "en_cours"}
+                  (coupures à début invalide exclues).
+        """
+        maintenant = maintenant or datetime.now()
+        query = """
+            SELECT
+                id_coupure,
+                COALESCE(id_batiment, 0),
+                debut_epoch,
+                COALESCE(fin_epoch, ?),
+                fin_coupure IS NULL
+            FROM COUPURE
+            WHERE debut_epoch IS NOT NULL
+        """
+        cursor = self.db.execute(query, (vers_epoch(maintenant),))
+        cursor.row_factory = None
+        try:
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+
+        table = np.array(rows, dtype=self.DTYPE_COLONNES)
+        colonnes = {nom: np.ascontiguousarray(table[nom]) for nom in self.DTYPE_COLONNES.names}
+        colonnes["debut_coupure"] = colonnes["debut_coupure"].view("datetime64[s]")
+        colonnes["fin_coupure"] = colonnes["fin_coupure"].view("datetime64[s]")
+        return colonnes
 
     def get_current_coupures(self):
-        conn = self.connect()
-        cursor = conn.cursor()
         query = """
             SELECT
                 c.id_coupure,
                 c.id_batiment,
                 c.debut_coupure,
                 c.fin_coupure,
+                c.debut_epoch,
+                c.fin_epoch,
                 c.cause,
                 b.nom AS nom_batiment
             FROM COUPURE c
             JOIN BATIMENT b ON c.id_batiment = b.id_batiment
             WHERE c.fin_coupure IS NULL
-            ORDER BY c.debut_coupure DESC
+            ORDER BY c.debut_epoch DESC
         """
-        cursor.execute(query)
-        rows = cursor.fetchall()
-        conn.close()
+        rows = self.db.fetch_all(query)
         return [dict(row) for row in rows]
 
     def get_coupures_by_period(self, date_debut, date_fin):
-        conn = self.connect()
-        cursor = conn.cursor()
         query = """
             SELECT
                 c.id_coupure,
                 c.id_batiment,
                 c.debut_coupure,
                 c.fin_coupure,
+                c.debut_epoch,
+                c.fin_epoch,
                 c.cause,
                 b.nom AS nom_batiment
             FROM COUPURE c
             JOIN BATIMENT b ON c.id_batiment = b.id_batiment
-            WHERE c.debut_coupure BETWEEN ? AND ? OR c.fin_coupure BETWEEN ? AND ?
-            ORDER BY c.debut_coupure DESC
+            WHERE c.debut_epoch BETWEEN ? AND ? OR c.fin_epoch BETWEEN ? AND ?
+            ORDER BY c.debut_epoch DESC
         """
-        cursor.execute(query, (date_debut, date_fin, date_debut, date_fin))
-        rows = cursor.fetchall()
-        conn.close()
+        debut, fin = vers_epoch(date_debut), vers_epoch(date_fin)
+        rows = self.db.fetch_all(query, (debut, fin, debut, fin))
         return [dict(row) for row in rows]
@@ -1,52 +1,224 @@
 import sqlite3
-import os
+import threading
+import time
+from contextlib import contextmanager
 from sqlite3 import Error
 
 from config.settings import DB_PATH
+from config.database_config import appliquer_migrations
+
+
+class PooledConnection(sqlite3.Connection):
+    """
+    Connexion SQLite persistante gérée par Database.
+
+    close() ne ferme pas réellement la connexion : elle reste ouverte pour le
+    thread courant (et garde son cache de requêtes préparées). Le code existant
+    qui fait `conn = model.connect(); ...; conn.close()` continue de fonctionner.
+    """
+
+    def close(self):
+        pass
+
+    def _fermer(self):
+        super().close()
+
 
 class Database:
-    def __init__(self, db_path=DB_PATH):
-        self.db_path = db_path
-        self.connection = None
+    """
+    Gestionnaire de connexions SQLite partagé par tous les modèles.
+
+    - une connexion persistante par thread (sqlite3 n'autorise pas le partage),
+    - cache de requêtes préparées conservé entre les appels,
+    - transactions via `with db.transaction():`,
+    - compteurs de réutilisation et de temps d'exécution (get_stats()).
+    """
+
+    def __init__(self, db_path=DB_PATH, cached_statements=256):
+        self.db_path = str(db_path)
+        self.cached_statements = cached_statements
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+        self._stats = self._stats_vides()
 
+    @staticmethod
+    def _stats_vides():
+        return {
+            "connexions_ouvertes": 0,
+            "connexions_reutilisees": 0,
+            "requetes": 0,
+            "temps_requetes_s": 0.0,
+            "transactions": 0,
+            "rollbacks": 0,
+        }
+
+    def _incrementer(self, cle, valeur=1):
+        with self._lock:
+            self._stats[cle] += valeur
+
+    # ---------------------------
+    # Connexions
+    # ---------------------------
     def connect(self):
+        conn = getattr(self._local, "connection", None)
+        if conn is not None:
+            self._incrementer("connexions_reutilisees")
+            return conn
         try:
-            self.connection = sqlite3.connect(self.db_path)
-            self.connection.execute("PRAGMA foreign_keys = ON;")
-            self.connection.row_factory = sqlite3.Row
-            return self.connection
+            # isolation_level=None : autocommit, les transactions sont explicites (transaction())
+            conn = sqlite3.connect(
+                self.db_path,
+                factory=PooledConnection,
+                isolation_level=None,
+                check_same_thread=False,
+                cached_statements=self.cached_statements,
+            )
+            conn.execute("PRAGMA foreign_keys = ON;")
+            conn.row_factory = sqlite3.Row
         except Error as e:
             print(f"Erreur de connexion : {e}")
-            return None
+            raise
+        self._local.connection = conn
+        self._local.profondeur = 0
+        with self._lock:
+            self._connections.append(conn)
+            self._stats["connexions_ouvertes"] += 1
+        return conn
 
     def close(self):
-        if self.connection:
-            self.connection.close()
-            self.connection = None
+        """Ferme la connexion du thread courant."""
+        conn = getattr(self._local, "connection", None)
+        if conn is not None:
+            with self._lock:
+                if conn in self._connections:
+                    self._connections.remove(conn)
+            conn._fermer()
+            self._local.connection = None
 
-    def execute_query(self, query, params=()):
+    def close_all(self):
+        """Ferme toutes les connexions ouvertes (à l'arrêt de l'application)."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn._fermer()
+        self._local = threading.local()
+
+    # ---------------------------
+    # Exécution
+    # ---------------------------
+    def execute(self, query, params=()):
         conn = self.connect()
-        if conn is None: return False
+        debut = time.perf_counter()
         try:
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-            conn.commit()
-            return True
-        except Error as e:
-            print(f"Erreur SQL (Execute) : {e}")
-            return False
+            return conn.execute(query, params)
+        finally:
+            self._enregistrer_requete(debut)
+
+    def executemany(self, query, seq_params):
+        conn = self.connect()
+        debut = time.perf_counter()
+        try:
+            return conn.executemany(query, seq_params)
         finally:
-            self.close()
+            self._enregistrer_requete(debut)
 
     def fetch_all(self, query, params=()):
+        return self.execute(query, params).fetchall()
+
+    def fetch_one(self, query, params=()):
+        return self.execute(query, params).fetchone()
+
+    def iter_fetch(self, query, params=(), taille_lot=500):
+        """Itère sur les lignes d'une requête par paquets de fetchmany (mémoire bornée)."""
+        cursor = self.execute(query, params)
+        try:
+            while True:
+                rows = cursor.fetchmany(taille_lot)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
+
+    def _enregistrer_requete(self, debut):
+        duree = time.perf_counter() - debut
+        with self._lock:
+            self._stats["requetes"] += 1
+            self._stats["temps_requetes_s"] += duree
+
+    @contextmanager
+    def transaction(self):
+        """
+        Ouvre une transaction (BEGIN ... COMMIT, ROLLBACK en cas d'exception).
+        Les transactions imbriquées sont fusionnées dans la plus externe.
+        """
         conn = self.connect()
-        if conn is None: return []
+        if self._local.profondeur > 0:
+            self._local.profondeur += 1
+            try:
+                yield conn
+            finally:
+                self._local.profondeur -= 1
+            return
+
+        conn.execute("BEGIN")
+        self._local.profondeur = 1
+        self._incrementer("transactions")
         try:
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-            return cursor.fetchall()
-        except Error as e:
-            print(f"Erreur SQL (Fetch All) : {e}")
-            return []
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            self._incrementer("rollbacks")
+            raise
+        else:
+            conn.execute("COMMIT")
         finally:
-            self.close()
\ No newline at end of file
+            self._local.profondeur = 0
+
+    # ---------------------------
+    # Statistiques
+    # ---------------------------
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        appels = stats["connexions_ouvertes"] + stats["connexions_reutilisees"]
+        stats["taux_reutilisation"] = stats["connexions_reutilisees"] / appels if appels else 0.0
+        stats["temps_moyen_requete_ms"] = (stats["temps_requetes_s"] / stats["requetes"] * 1000) if stats["requetes"] else 0.0
+        return stats
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats = self._stats_vides()
+
+
+_databases = {}
+_databases_lock = threading.Lock()
+
+
+def get_database(db_path=DB_PATH):
+    """
+    Retourne l'instance Database partagée pour ce fichier (une par chemin).
+    Les migrations de schéma en attente sont appliquées à la première ouverture.
+    """
+    cle = str(db_path)
+    with _databases_lock:
+        db = _databases.get(cle)
+        if db is None:
+            db = Database(cle)
+            appliquer_migrations(db)
+            _databases[cle] = db
+        return db
+
+
+def fermer_connexions_du_thread():
+    """
+    Ferme les connexions du thread courant sur toutes les bases ouvertes.
+
+    À appeler à la fin d'une tâche exécutée dans un thread de travail (voir
+    view.chargement) : sans cela, chaque tâche laisserait une connexion ouverte.
+    """
+    with _databases_lock:
+        databases = list(_databases.values())
+    for db in databases:
+        db.close()
@@ -0,0 +1,122 @@
+import threading
+
+from config.settings import DB_PATH
+from model.database import get_database
+
+
+class DimensionCache:
+    """
+    Cache mémoire des petites tables de dimension (sources, équipements, types, bâtiments).
+
+    Chaque dimension est chargée en une requête au premier accès puis indexée
+    par identifiant et par nom (recherche en O(1)). Les méthodes add_*, update_*
+    et delete_* des modèles appellent invalider() pour forcer un rechargement.
+    """
+
+    DIMENSIONS = {
+        "sources": {
+            "query": "SELECT id_source, nom_source, cout_kwh, description FROM SOURCE_ENERGIE ORDER BY id_source",
+            "cle_id": "id_source",
+            "cle_nom": "nom_source",
+        },
+        "types": {
+            "query": "SELECT id_type, nom_type, consommation_theorique FROM TYPE_EQUIPEMENT ORDER BY id_type",
+            "cle_id": "id_type",
+            "cle_nom": "nom_type",
+        },
+        "batiments": {
+            "query": "SELECT * FROM BATIMENT ORDER BY id_batiment",
+            "cle_id": "id_batiment",
+            "cle_nom": "nom",
+        },
+        "equipements": {
+            "query": """
+                SELECT
+                    e.id_equipement, e.nom_equipement, e.puissance_watt, e.id_type, e.id_batiment,
+                    te.nom_type, te.consommation_theorique as conso_theorique_type,
+                    b.nom as nom_batiment
+                FROM EQUIPEMENT e
+                JOIN TYPE_EQUIPEMENT te ON e.id_type = te.id_type
+                JOIN BATIMENT b ON e.id_batiment = b.id_batiment
+                ORDER BY e.id_equipement
+            """,
+            "cle_id": "id_equipement",
+            "cle_nom": None, # nom unique seulement par bâtiment
+        },
+    }
+
+    # Les équipements embarquent le nom du type et du bâtiment
+    DEPENDANCES = {
+        "types": ("equipements",),
+        "batiments": ("equipements",),
+    }
+
+    def __init__(self, db):
+        self.db = db
+        self._lock = threading.RLock()
+        self._tables = {}
+        self._stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def _table(self, dimension):
+        with self._lock:
+            table = self._tables.get(dimension)
+            if table is not None:
+                self._stats["hits"] += 1
+                return table
+
+            self._stats["misses"] += 1
+            config = self.DIMENSIONS[dimension]
+            lignes = [dict(row) for row in self.db.fetch_all(config["query"])]
+            table = {
+                "lignes": lignes,
+                "par_id": {ligne[config["cle_id"]]: ligne for ligne in lignes},
+                "par_nom": {ligne[config["cle_nom"]]: ligne for ligne in lignes} if config["cle_nom"] else {},
+            }
+            self._tables[dimension] = table
+            return table
+
+    def get(self, dimension, id_dimension):
+        """Ligne de la dimension pour cet identifiant (copie), ou None."""
+        ligne = self._table(dimension)["par_id"].get(id_dimension)
+        return dict(ligne) if ligne else None
+
+    def get_par_nom(self, dimension, nom):
+        """Ligne de la dimension pour ce nom (copie), ou None."""
+        ligne = self._table(dimension)["par_nom"].get(nom)
+        return dict(ligne) if ligne else None
+
+    def lister(self, dimension):
+        """Toutes les lignes de la dimension (copies), triées par identifiant."""
+        return [dict(ligne) for ligne in self._table(dimension)["lignes"]]
+
+    def invalider(self, dimension=None):
+        """Oublie une dimension (et celles qui en dépendent), ou tout le cache."""
+        with self._lock:
+            self._stats["invalidations"] += 1
+            if dimension is None:
+                self._tables.clear()
+                return
+            for nom in (dimension,) + self.DEPENDANCES.get(dimension, ()):
+                self._tables.pop(nom, None)
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        acces = stats["hits"] + stats["misses"]
+        stats["taux_hits"] = stats["hits"] / acces if acces else 0.0
+        return stats
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_dimension_cache(db_path=DB_PATH):
+    """Retourne le cache de dimensions partagé par le processus pour ce fichier."""
+    cle = str(db_path)
+    with _caches_lock:
+        cache = _caches.get(cle)
+        if cache is None:
+            cache = DimensionCache(get_database(cle))
+            _caches[cle] = cache
+        return cache
@@ -0,0 +1,43 @@
+"""
+Détection des modifications de la base pour l'actualisation automatique.
+
+Les triggers créés par config.database_config incrémentent, à chaque INSERT,
+UPDATE ou DELETE, la version de la table modifiée dans JOURNAL_MODIFICATIONS,
+que l'écriture vienne de l'application, d'une autre connexion ou d'un autre
+processus. PRAGMA data_version ne suffit pas ici : il ne change pas pour les
+écritures faites par la connexion qui l'interroge, or l'application lit et
+écrit sur la même connexion par thread ; il ne dit pas non plus quelle table
+a changé. Lire les compteurs coûte une requête sur quelques lignes :
+
+    modifications = ModificationModel()
+    tables = modifications.tables_modifiees() # Depuis l'appel précédent
+"""
+from config.settings import DB_PATH
+from config.database_config import TABLE_MODIFICATIONS
+from model.database import get_database
+
+class ModificationModel:
+    def __init__(self, db_path=DB_PATH):
+        self.db_path = db_path
+        self.db = get_database(self.db_path)
+        self._versions_vues = None
+
+    def get_versions(self):
+        """Retourne {nom_table: version} des tables journalisées."""
+        query = f"SELECT nom_table, version FROM {TABLE_MODIFICATIONS}"
+        return {row["nom_table"]: row["version"] for row in self.db.fetch_all(query)}
+
+    def tables_modifiees(self):
+        """
+        Tables écrites depuis l'appel précédent (toutes au premier appel).
+
+        Returns:
+            set: Noms des tables modifiées ; vide si la base n'a pas changé.
+        """
+        versions = self.get_versions()
+        if self._versions_vues is None:
+            modifiees = set(versions)
+        else:
+            modifiees = {table for table, version in versions.items() if self._versions_vues.get(table) != version}
+        self._versions_vues = versions
+        return modifiees
@@ -0,0 +1,48 @@
+"""
+Lecture des statistiques en ligne d'energie_kwh (table STATS_CONSOMMATION).
+
+La table contient un état (nb_mesures, moyenne, M2, min, max) par équipement,
+tenu à jour par les triggers de config.database_config. L'état global est la
+fusion des états par équipement : son coût ne dépend pas du nombre de mesures.
+En cas de dérive numérique, reconstruire avec :
+
+    python -m model.stats_model reconstruire
+"""
+import sys
+
+from config.settings import DB_PATH
+from config.database_config import TABLE_STATS, creer_triggers_stats, reconstruire_stats
+from model.database import get_database
+from analysis.stats_en_ligne import EtatStats
+
+class StatsModel:
+    def __init__(self, db_path=DB_PATH):
+        self.db_path = db_path
+        self.db = get_database(self.db_path)
+
+    def get_etats_par_equipement(self):
+        """Retourne {id_equipement: EtatStats} pour les équipements ayant des mesures."""
+        rows = self.db.fetch_all(f"SELECT * FROM {TABLE_STATS} ORDER BY id_equipement")
+        return {row["id_equipement"]: EtatStats.depuis_ligne(row) for row in rows}
+
+    def get_etat(self, id_equipement=None):
+        """
+        État d'un équipement, ou état global (fusion de tous les équipements) si
+        id_equipement est None. Un état vide (n = 0) est retourné s'il n'y a aucune mesure.
+        """
+        if id_equipement is None:
+            return EtatStats.fusionner_tous(self.get_etats_par_equipement().values())
+        row = self.db.fetch_one(f"SELECT * FROM {TABLE_STATS} WHERE id_equipement = ?", (id_equipement,))
+        return EtatStats.depuis_ligne(row) if row else EtatStats()
+
+    def reconstruire(self):
+        """Recalcule STATS_CONSOMMATION depuis CONSOMMATION. Retourne le nombre d'équipements."""
+        creer_triggers_stats(self.db)
+        return reconstruire_stats(self.db)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ["reconstruire"]:
+        print("Usage : python -m model.stats_model reconstruire")
+        sys.exit(1)
+    print(f"{StatsModel().reconstruire()} équipements")
@@ -0,0 +1,84 @@
+"""
+Historique des tarifs par source (table TARIF_SOURCE, voir config.database_config).
+
+Les triggers de SOURCE_ENERGIE tiennent l'historique à jour : une nouvelle source
+reçoit un tarif valable depuis toujours, et une modification de cout_kwh ajoute
+une version effective à l'heure pleine suivante, sans réécrire les coûts passés.
+Les tarifs heures pleines / heures creuses s'ajoutent avec ajouter_tarif.
+"""
+import sqlite3
+
+from config.settings import DB_PATH
+from config.database_config import TABLE_TARIFS
+from model.database import get_database
+from model.dimension_cache import get_dimension_cache
+from analysis.tarifs import GrilleTarifaire
+from utils.date_utils import vers_epoch, epoch_vers_datetime
+
+class TarifModel:
+    def __init__(self, db_path=DB_PATH):
+        self.db_path = db_path
+        self.db = get_database(self.db_path)
+        self.cache = get_dimension_cache(self.db_path)
+
+    def get_tarifs(self, id_source=None):
+        """Tarifs triés par source, date d'effet puis ordre de saisie (avec nom_source)."""
+        query = f"""
+            SELECT t.id_tarif, t.id_source, s.nom_source, t.date_effet, t.heure_debut, t.heure_fin, t.cout_kwh
+            FROM {TABLE_TARIFS} t
+            JOIN SOURCE_ENERGIE s ON t.id_source = s.id_source
+        """
+        params = ()
+        if id_source is not None:
+            query += " WHERE t.id_source = ?"
+            params = (id_source,)
+        query += " ORDER BY t.id_source, t.date_effet, t.id_tarif"
+        return [dict(row) for row in self.db.fetch_all(query, params)]
+
+    def ajouter_tarif(self, id_source, cout_kwh, date_effet, heure_debut=0, heure_fin=24):
+        """
+        Ajoute un tarif à partir de date_effet, sur la plage horaire [heure_debut, heure_fin[.
+
+        Args:
+            date_effet: datetime, chaîne ISO ou epoch.
+
+        Returns:
+            int ou None: id_tarif, ou None si le tarif est invalide.
+        """
+        date_effet = epoch_vers_datetime(vers_epoch(date_effet)).strftime("%Y-%m-%d %H:%M:%S")
+        query = f"""
+            INSERT INTO {TABLE_TARIFS} (id_source, date_effet, heure_debut, heure_fin, cout_kwh)
+            VALUES (?, ?, ?, ?, ?)
+        """
+        try:
+            cursor = self.db.execute(query, (id_source, date_effet, heure_debut, heure_fin, cout_kwh))
+            return cursor.lastrowid
+        except sqlite3.IntegrityError as e:
+            print(f"Error: Tarif invalide ({e}).")
+            return None
+
+    def get_tarifs_en_vigueur(self, date=None):
+        """
+        Dernière version de chaque source à la date donnée (maintenant par défaut).
+
+        Returns:
+            list: Dicts des lignes de tarif de ces versions, triées par source et heure.
+        """
+        query = f"""
+            SELECT t.id_tarif, t.id_source, s.nom_source, t.date_effet, t.heure_debut, t.heure_fin, t.cout_kwh
+            FROM {TABLE_TARIFS} t
+            JOIN SOURCE_ENERGIE s ON t.id_source = s.id_source
+            WHERE t.date_effet = (
+                SELECT MAX(date_effet) FROM {TABLE_TARIFS}
+                WHERE id_source = t.id_source AND date_effet <= COALESCE(?, datetime('now', 'localtime'))
+            )
+            ORDER BY t.id_source, t.heure_debut, t.id_tarif
+        """
+        if date is not None:
+            date = epoch_vers_datetime(vers_epoch(date)).strftime("%Y-%m-%d %H:%M:%S")
+        return [dict(row) for row in self.db.fetch_all(query, (date,))]
+
+    def get_grille(self):
+        """GrilleTarifaire de tout l'historique ; cout_kwh de SOURCE_ENERGIE sert de prix par défaut."""
+        defauts = {source["id_source"]: source["cout_kwh"] for source in self.cache.lister("sources")}
+        return GrilleTarifaire(self.get_tarifs(), defauts)
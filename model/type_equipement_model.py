@@ -1,57 +1,39 @@
 import sqlite3
 from config.settings import DB_PATH
+from model.database import get_database
+from model.dimension_cache import get_dimension_cache
 
 class TypeEquipementModel:
     def __init__(self):
         self.db_path = DB_PATH
-        
+        self.db = get_database(self.db_path)
+        self.cache = get_dimension_cache(self.db_path)
+
     def connect(self):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        return self.db.connect()
 
     def get_type_equipement_details(self, id_type):
-        conn = self.connect()
-        cursor = conn.cursor()
-        query = "SELECT id_type, nom_type, consommation_theorique FROM TYPE_EQUIPEMENT WHERE id_type = ?"
-        cursor.execute(query, (id_type,))
-        result = cursor.fetchone()
-        conn.close()
-        return dict(result) if result else None
+        return self.cache.get("types", id_type)
 
     def get_consommation_theorique_by_type_id(self, id_type):
-        conn = self.connect()
-        cursor = conn.cursor()
-        query = "SELECT consommation_theorique FROM TYPE_EQUIPEMENT WHERE id_type = ?"
-        cursor.execute(query, (id_type,))
-        result = cursor.fetchone()
-        conn.close()
+        result = self.cache.get("types", id_type)
         if result:
             return result["consommation_theorique"]
         return None
-    
+
     def get_all_types_equipement(self):
-        conn = self.connect()
-        cursor = conn.cursor()
-        query = "SELECT id_type, nom_type, consommation_theorique FROM TYPE_EQUIPEMENT"
-        cursor.execute(query)
-        rows = cursor.fetchall()
-        conn.close()
-        return [dict(row) for row in rows]
+        return self.cache.lister("types")
 
     def add_type_equipement(self, nom_type, consommation_theorique):
-        conn = self.connect()
-        cursor = conn.cursor()
         query = """
             INSERT INTO TYPE_EQUIPEMENT (nom_type, consommation_theorique)
             VALUES (?, ?)
         """
         try:
-            cursor.execute(query, (nom_type, consommation_theorique))
-            conn.commit()
+            cursor = self.db.execute(query, (nom_type, consommation_theorique))
             return cursor.lastrowid
         except sqlite3.IntegrityError as e:
             print(f"Error adding type equipement: {e}")
             return None
         finally:
-            conn.close()
+            self.cache.invalider("types")
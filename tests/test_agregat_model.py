@@ -0,0 +1,92 @@
+import unittest
+
+from config.database_config import AGREGATS
+from model.agregat_model import AgregatModel
+from model.consommation_model import ConsommationModel
+from tests.utils_tests import TestCaseBaseTemporaire
+
+class TestAgregatModel(TestCaseBaseTemporaire):
+    DONNEES = """
+        INSERT INTO SOURCE_ENERGIE (nom_source, cout_kwh) VALUES ('JIRAMA', 500), ('Groupe électrogène', 1200);
+        INSERT INTO BATIMENT (nom) VALUES ('Bloc A'), ('Bloc B');
+        INSERT INTO TYPE_EQUIPEMENT (nom_type, consommation_theorique) VALUES ('Clim', 1.5);
+        INSERT INTO EQUIPEMENT (nom_equipement, puissance_watt, id_type, id_batiment)
+            VALUES ('Clim 1', 1500, 1, 1), ('Clim 2', 1500, 1, 2);
+        INSERT INTO CONSOMMATION (id_equipement, id_source, date_heure, duree_minutes, energie_kwh)
+            VALUES (1, 1, '2025-01-10 07:00:00', 60, 1.0);
+    """
+
+    def setUp(self):
+        # Les migrations (dont les agrégats) s'appliquent à l'ouverture
+        super().setUp()
+        self.model = AgregatModel(self.db_path)
+        self.conso_model = ConsommationModel(self.db_path)
+
+    def _agregats_depuis_brut(self, grain):
+        table, cle = AGREGATS[grain]
+        rows = self.db.fetch_all(f"""
+            SELECT {cle.format(date="date_heure")} AS periode, id_equipement, id_source,
+                   SUM(energie_kwh) AS energie_kwh, SUM(duree_minutes) AS duree_minutes, COUNT(*) AS nb_mesures
+            FROM CONSOMMATION GROUP BY 1, 2, 3 ORDER BY 1, 2, 3
+        """)
+        return [tuple(row) for row in rows]
+
+    def _agregats_stockes(self, grain):
+        table, _ = AGREGATS[grain]
+        rows = self.db.fetch_all(f"""
+            SELECT periode, id_equipement, id_source, energie_kwh, duree_minutes, nb_mesures
+            FROM {table} ORDER BY 1, 2, 3
+        """)
+        return [tuple(row) for row in rows]
+
+    def assertAgregatsAJour(self):
+        for grain in AGREGATS:
+            attendu = self._agregats_depuis_brut(grain)
+            stocke = self._agregats_stockes(grain)
+            self.assertEqual([r[:3] + r[4:] for r in stocke], [r[:3] + r[4:] for r in attendu], grain)
+            for ligne_stockee, ligne_attendue in zip(stocke, attendu):
+                self.assertAlmostEqual(ligne_stockee[3], ligne_attendue[3], places=9)
+
+    def test_migration_remplit_les_agregats(self):
+        self.assertAgregatsAJour()
+        self.assertEqual(self.model.totaux_par_periode("heure"), {"2025-01-10 07:00:00": 1.0})
+
+    def test_triggers_insert_update_delete(self):
+        self.conso_model.add_consommation(1, 2, 30, 2.5, "2025-01-10T07:30:00")
+        self.conso_model.add_consommation(2, 1, 60, 4.0, "2025-01-13 10:00:00")
+        self.assertAgregatsAJour()
+
+        self.db.execute("UPDATE CONSOMMATION SET energie_kwh = 3.0, date_heure = '2025-02-01 08:00:00' WHERE id_equipement = 2")
+        self.assertAgregatsAJour()
+
+        self.db.execute("DELETE FROM CONSOMMATION WHERE id_source = 2")
+        self.assertAgregatsAJour()
+        self.assertEqual(self.model.totaux_par_periode("mois"), {"2025-01": 1.0, "2025-02": 3.0})
+
+    def test_changement_de_batiment(self):
+        self.db.execute("UPDATE EQUIPEMENT SET id_batiment = 2 WHERE id_equipement = 1")
+        self.assertEqual(self.model.totaux_par_periode("jour", id_batiment=2), {"2025-01-10": 1.0})
+        self.assertEqual(self.model.totaux_par_periode("jour", id_batiment=1), {})
+
+    def test_semaine(self):
+        self.conso_model.add_consommation(2, 2, 60, 2.0, "2025-01-12 23:00:00") # Dimanche
+        self.conso_model.add_consommation(1, 1, 60, 1.0, "2025-01-13 00:00:00") # Lundi
+        self.assertEqual(self.model.totaux_par_periode("semaine"), {"2025-01-06": 3.0, "2025-01-13": 1.0})
+        self.assertEqual(self.model.totaux_par_periode("semaine", id_batiment=2), {"2025-01-06": 2.0})
+
+    def test_chargement_en_masse_puis_reconstruction(self):
+        with self.model.chargement_en_masse():
+            self.conso_model.add_consommations_bulk([
+                (1, 1, 60, 1.0, f"2025-03-{jour:02d} 12:00:00") for jour in range(1, 29)
+            ])
+            # Triggers suspendus : les agrégats ne bougent pas pendant le chargement
+            self.assertNotIn("2025-03", self.model.totaux_par_periode("mois"))
+        self.assertAgregatsAJour()
+        self.assertAlmostEqual(self.model.totaux_par_periode("mois")["2025-03"], 28.0)
+
+        # Les triggers sont recréés à la sortie
+        self.conso_model.add_consommation(1, 1, 60, 1.0, "2025-03-29 12:00:00")
+        self.assertAgregatsAJour()
+
+if __name__ == '__main__':
+    unittest.main()
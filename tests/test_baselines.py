@@ -0,0 +1,90 @@
+import unittest
+import numpy as np
+
+from analysis.baselines import (
+    scores_z, scores_robustes_glissants, NIVEAU_EQUIPEMENT_HEURE, NIVEAU_EQUIPEMENT, NIVEAU_GLOBAL,
+)
+
+class TestBaselines(unittest.TestCase):
+    def _reference_par_boucle(self, valeurs, equipements, heures, min_mesures):
+        z = []
+        for x, eq, h in zip(valeurs, equipements, heures):
+            groupe = [v for v, e, hh in zip(valeurs, equipements, heures) if e == eq and hh == h and h >= 0]
+            if len(groupe) < min_mesures:
+                groupe = [v for v, e in zip(valeurs, equipements) if e == eq]
+            if len(groupe) < min_mesures:
+                groupe = list(valeurs)
+            ecart_type = np.std(groupe)
+            z.append((x - np.mean(groupe)) / ecart_type if ecart_type > 1e-9 else 0.0)
+        return z
+
+    def test_identique_au_calcul_par_boucle(self):
+        rng = np.random.default_rng(0)
+        n = 400
+        # Identifiants épars : passe par le chemin np.unique
+        equipements = rng.choice([3, 7, 10**9], n)
+        heures = rng.integers(-1, 24, n)
+        valeurs = rng.gamma(2.0, 1.0, n) * (1 + equipements % 4)
+        scores = scores_z(valeurs, equipements, heures, min_mesures=4)
+        np.testing.assert_allclose(scores["z_score"], self._reference_par_boucle(valeurs, equipements, heures, 4))
+
+    def test_reference_par_equipement_et_heure(self):
+        # Équipement 1 : climatisation forte à 14 h, faible la nuit ; équipement 2 : une seule mesure
+        equipements = [1] * 8 + [2]
+        heures = [14, 14, 14, 14, 2, 2, 2, 2, 14]
+        valeurs = [10.0, 10.5, 9.5, 10.0, 1.0, 1.1, 0.9, 6.0, 3.0]
+        scores = scores_z(valeurs, equipements, heures, min_mesures=3)
+
+        # La charge normale de 14 h n'est pas anormale, le pic nocturne l'est
+        self.assertLess(abs(scores["z_score"][0]), 1.0)
+        self.assertGreater(scores["z_score"][7], 1.5)
+        self.assertAlmostEqual(scores["moyenne"][0], 10.0)
+        self.assertEqual(scores["niveau"].tolist(), [NIVEAU_EQUIPEMENT_HEURE] * 8 + [NIVEAU_GLOBAL])
+
+        scores = scores_z(valeurs, equipements, [-1] * 9, min_mesures=3)
+        self.assertEqual(scores["niveau"][0], NIVEAU_EQUIPEMENT)
+
+    def test_valeurs_identiques_et_vide(self):
+        scores = scores_z([2.0] * 5, [1] * 5, [8] * 5)
+        self.assertEqual(scores["z_score"].tolist(), [0.0] * 5)
+        self.assertEqual(len(scores_z([], [], [])["z_score"]), 0)
+
+class TestScoresRobustesGlissants(unittest.TestCase):
+    def _par_boucle(self, valeurs, equipements, fenetre, min_mesures):
+        scores = []
+        for i, (x, eq) in enumerate(zip(valeurs, equipements)):
+            precedentes = [v for v, e in zip(valeurs[:i], equipements[:i]) if e == eq][-fenetre:]
+            if len(precedentes) < min_mesures:
+                scores.append(np.nan)
+                continue
+            mediane = np.median(precedentes)
+            mad = np.median(np.abs(np.array(precedentes) - mediane))
+            with np.errstate(divide="ignore", invalid="ignore"):
+                scores.append((x - mediane) / (1.4826 * mad) if mad or x != mediane else 0.0)
+        return scores
+
+    def test_identique_au_calcul_par_boucle(self):
+        rng = np.random.default_rng(1)
+        equipements = rng.integers(1, 4, 300)
+        valeurs = rng.normal(5.0, 1.0, 300)
+        for fenetre, min_mesures in ((10, 3), (7, 7), (4, 1)):
+            scores = scores_robustes_glissants(valeurs, equipements, fenetre, min_mesures, taille_lot=50)
+            np.testing.assert_allclose(scores["score"], self._par_boucle(valeurs, equipements, fenetre, min_mesures))
+
+    def test_pic_isole_ne_masque_pas_les_suivants(self):
+        valeurs = [1.0, 1.2, 0.9, 1.1, 1.0, 50.0, 1.1, 0.9, 1.0, 3.0]
+        scores = scores_robustes_glissants(valeurs, [1] * 10, fenetre=5, min_mesures=3)["score"]
+        self.assertTrue(np.isnan(scores[:3]).all())
+        self.assertGreater(scores[5], 3.5)
+        self.assertGreater(scores[9], 3.5) # 3 kWh reste anormal après le pic de 50 kWh
+        self.assertLess(abs(scores[6]), 3.5)
+
+    def test_fenetre_constante(self):
+        scores = scores_robustes_glissants([2.0, 2.0, 2.0, 2.0, 5.0], [1] * 5, fenetre=3, min_mesures=3)["score"]
+        self.assertEqual(scores[3], 0.0)
+        self.assertEqual(scores[4], np.inf)
+        with self.assertRaises(ValueError):
+            scores_robustes_glissants([1.0], [1], fenetre=0)
+
+if __name__ == '__main__':
+    unittest.main()
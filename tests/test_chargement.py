@@ -0,0 +1,127 @@
+import os
+import threading
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+
+from config.settings import DB_PATH
+from model.database import get_database
+from view.chargement import ChargeurArrierePlan
+
+
+class TestChargeurArrierePlan(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # QApplication (et non QCoreApplication) : d'autres tests créent des widgets
+        cls.app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.chargeur = ChargeurArrierePlan()
+        self.resultats, self.erreurs, self.etats, self.pourcentages = [], [], [], []
+        self.chargeur.resultat_pret.connect(self.resultats.append)
+        self.chargeur.erreur.connect(self.erreurs.append)
+        self.chargeur.en_cours.connect(self.etats.append)
+        self.chargeur.progression.connect(self.pourcentages.append)
+
+    def tearDown(self):
+        self.chargeur.arreter()
+
+    def test_resultat_dans_le_thread_de_l_interface(self):
+        threads = []
+
+        def calcul(a, b=0):
+            threads.append(threading.current_thread())
+            return a + b
+
+        self.chargeur.lancer(calcul, 2, b=3)
+        self.assertTrue(self.chargeur.occupe)
+        self.assertTrue(self.chargeur.attendre(5000))
+        self.assertEqual(self.resultats, [5])
+        self.assertIsNot(threads[0], threading.main_thread())
+        self.assertEqual(self.etats, [True, False])
+        self.assertFalse(self.chargeur.occupe)
+
+    def test_pas_de_connexion_laissee_ouverte(self):
+        db = get_database(DB_PATH)
+        avant = len(db._connections)
+
+        def requete():
+            return db.fetch_one("SELECT COUNT(*) AS n FROM BATIMENT")["n"]
+
+        for _ in range(10):
+            self.chargeur.lancer(requete)
+            self.chargeur.attendre(5000)
+        self.assertEqual(len(self.resultats), 10)
+        self.assertEqual(len(db._connections), avant)
+
+    def test_resultat_obsolete_ignore(self):
+        bloque = threading.Event()
+        demarre = threading.Event()
+
+        def lent():
+            demarre.set()
+            bloque.wait(5)
+            return "ancien filtre"
+
+        self.chargeur.lancer(lent)
+        demarre.wait(5)
+        # Nouveau filtre pendant le calcul : seule la dernière demande est affichée
+        self.chargeur.lancer(lambda: "jamais exécuté")
+        self.chargeur.lancer(lambda: "nouveau filtre")
+        bloque.set()
+        self.chargeur.attendre(5000)
+        self.assertEqual(self.resultats, ["nouveau filtre"])
+
+    def test_annuler(self):
+        self.chargeur.lancer(lambda: 1)
+        self.chargeur.annuler()
+        self.chargeur.attendre(5000)
+        self.assertEqual(self.resultats, [])
+        self.assertFalse(self.chargeur.occupe)
+
+    def test_erreur(self):
+        def echoue():
+            raise ValueError("base indisponible")
+
+        self.chargeur.lancer(echoue)
+        self.chargeur.attendre(5000)
+        self.assertEqual(self.erreurs, ["base indisponible"])
+        self.assertEqual(self.resultats, [])
+
+    def test_progression_et_annulation_cooperative(self):
+        def etapes(progression):
+            for pourcentage in (25, 50, 100):
+                progression(pourcentage)
+            return "fini"
+
+        self.chargeur.lancer(etapes, avec_progression=True)
+        self.chargeur.attendre(5000)
+        self.assertEqual(self.pourcentages, [25, 50, 100])
+        self.assertEqual(self.resultats, ["fini"])
+
+        # Une tâche devenue obsolète s'arrête à son prochain point de progression
+        etapes_faites = []
+        bloque = threading.Event()
+        demarre = threading.Event()
+
+        def longue(progression):
+            demarre.set()
+            bloque.wait(5)
+            for pourcentage in (10, 20, 30):
+                progression(pourcentage)
+                etapes_faites.append(pourcentage)
+            return "obsolète"
+
+        self.chargeur.lancer(longue, avec_progression=True)
+        demarre.wait(5)
+        self.chargeur.annuler()
+        bloque.set()
+        self.chargeur.attendre(5000)
+        self.assertEqual(etapes_faites, [])
+        self.assertEqual(self.resultats, ["fini"])
+
+
+if __name__ == "__main__":
+    unittest.main()
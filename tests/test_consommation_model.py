@@ -1,6 +1,8 @@
 import unittest
 import os
 import sqlite3
+import numpy as np
+from utils.date_utils import vers_epoch
 from datetime import datetime, timedelta
 
 from model.consommation_model import ConsommationModel
@@ -45,6 +47,23 @@ class TestConsommationModel(unittest.TestCase):
         # For simplicity, we'll check if the start of the string matches.
         self.assertTrue(result["date_heure"].startswith(date_heure[:16])) # Check up to minutes
 
+    def test_add_consommations_bulk(self):
+        date_heure = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        lignes = iter([
+            (1, 1, 30, 99.99, date_heure),
+            {"id_equipement": 2, "id_source": 1, "duree_minutes": 15, "energie_kwh": 99.99, "date_heure": date_heure},
+            (99999, 1, 30, 99.99, date_heure), # Équipement inexistant
+            (1, 99999, 30, 99.99, date_heure), # Source inexistante
+            (1, 1, 0, 99.99, date_heure), # Durée invalide
+        ])
+
+        nb_inserees, erreurs = self.model.add_consommations_bulk(lignes, taille_lot=2)
+
+        self.assertEqual(nb_inserees, 2)
+        self.assertEqual([index for index, _ in erreurs], [2, 3, 4])
+        self.cursor.execute("SELECT COUNT(*) FROM CONSOMMATION WHERE energie_kwh = 99.99")
+        self.assertEqual(self.cursor.fetchone()[0], 2)
+
     def test_get_all_consommation(self):
         all_conso = self.model.get_all_consommation()
         self.assertIsInstance(all_conso, list)
@@ -58,6 +77,133 @@ class TestConsommationModel(unittest.TestCase):
         self.assertIn("nom_equipement", first_item)
         self.assertIn("batiment", first_item)
 
+    def test_iter_all_consommation(self):
+        flux = self.model.iter_all_consommation(taille_lot=2)
+        self.assertFalse(isinstance(flux, list))
+        self.assertEqual(list(flux), self.model.get_all_consommation())
+
+    def test_iter_consommation_by_building(self):
+        flux = list(self.model.iter_consommation_by_building(1, taille_lot=3))
+        self.assertEqual(flux, self.model.get_consommation_by_building(1))
+
+    def test_get_consommation_colonnes(self):
+        colonnes = self.model.get_consommation_colonnes()
+        lignes = self.model.get_all_consommation()
+
+        self.assertEqual(colonnes["date_heure"].dtype, np.dtype("datetime64[s]"))
+        self.assertEqual(colonnes["energie_kwh"].dtype, np.float64)
+        self.assertEqual(colonnes["duree_minutes"].dtype, np.int32)
+        self.assertEqual(len(colonnes["id_conso"]), len(lignes))
+        self.assertAlmostEqual(colonnes["energie_kwh"].sum(), sum(l["energie_kwh"] for l in lignes))
+        self.assertEqual(sorted(colonnes["id_conso"].tolist()), sorted(l["id_conso"] for l in lignes))
+
+        premiere = next(l for l in lignes if l["id_conso"] == colonnes["id_conso"][0])
+        self.assertEqual(colonnes["date_heure"][0], np.datetime64(premiere["date_heure"].replace(" ", "T")))
+
+        par_batiment = self.model.get_consommation_colonnes(building_id=1)
+        self.assertTrue(np.all(par_batiment["id_batiment"] == 1))
+
+    def test_date_epoch(self):
+        self.model.add_consommation(1, 1, 30, 99.99, "2025-01-10T07:30:00") # Supprimée au tearDown
+        ligne = next(l for l in self.model.get_all_consommation() if l["energie_kwh"] == 99.99)
+        self.assertEqual(ligne["date_epoch"], vers_epoch(datetime(2025, 1, 10, 7, 30)))
+
+        # Bornes mixtes (chaîne avec espace, datetime) : recherche sur la colonne entière
+        colonnes = self.model.get_consommation_colonnes(
+            date_debut="2025-01-10 07:00:00", date_fin=datetime(2025, 1, 10, 8, 0)
+        )
+        self.assertIn(ligne["id_conso"], colonnes["id_conso"].tolist())
+        self.assertTrue(np.all(colonnes["date_heure"] >= np.datetime64("2025-01-10T07:00:00")))
+        self.assertTrue(np.all(colonnes["date_heure"] <= np.datetime64("2025-01-10T08:00:00")))
+
+    def test_rechercher_consommations_pagination(self):
+        toutes = []
+        curseur = None
+        while True:
+            page, curseur = self.model.rechercher_consommations(apres=curseur, taille_page=4)
+            toutes.extend(page)
+            self.assertLessEqual(len(page), 4)
+            if curseur is None:
+                break
+
+        attendues = sorted(self.model.get_all_consommation(), key=lambda c: (c["date_heure"], c["id_conso"]))
+        self.assertEqual([c["id_conso"] for c in toutes], [c["id_conso"] for c in attendues])
+
+    def test_rechercher_consommations_date_illisible_en_fin_de_page(self):
+        # Mesures sans date_epoch (date illisible) : elles passent en tête, et une page
+        # d'une ligne de moins qu'elles se termine sur l'une d'elles, curseur (None, id)
+        for _ in range(5):
+            self.model.add_consommation(1, 1, 30, 99.99, "pas une date") # Supprimées au tearDown
+        nb_sans_date = sum(1 for c in self.model.get_all_consommation() if c["date_epoch"] is None)
+
+        page, curseur = self.model.rechercher_consommations(taille_page=nb_sans_date - 1)
+        self.assertIsNone(curseur[0])
+
+        toutes = list(page)
+        while curseur is not None:
+            page, curseur = self.model.rechercher_consommations(apres=curseur, taille_page=nb_sans_date - 1)
+            toutes.extend(page)
+
+        ids = [c["id_conso"] for c in toutes]
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertEqual(sorted(ids), sorted(c["id_conso"] for c in self.model.get_all_consommation()))
+
+    def test_rechercher_consommations_filtres(self):
+        page, _ = self.model.rechercher_consommations(id_equipement=1, id_source=1,
+                                                       date_debut="2025-01-10 00:00:00",
+                                                       date_fin="2025-01-11 23:59:59", taille_page=1000)
+        attendues = [c for c in self.model.get_all_consommation()
+                     if c["id_equipement"] == 1 and c["id_source"] == 1
+                     and "2025-01-10 00:00:00" <= c["date_heure"] <= "2025-01-11 23:59:59"]
+        self.assertGreater(len(page), 0)
+        self.assertEqual(sorted(c["id_conso"] for c in page), sorted(c["id_conso"] for c in attendues))
+
+    def test_agreger_consommations(self):
+        par_jour = self.model.agreger_consommations(periode="jour", id_equipement=1)
+        attendu = {}
+        for date_heure, energie in self.model.get_consommation_by_equipement(1):
+            attendu[date_heure[:10]] = attendu.get(date_heure[:10], 0) + energie
+        self.assertEqual(par_jour.keys(), attendu.keys())
+        for cle, total in attendu.items():
+            self.assertAlmostEqual(par_jour[cle], total)
+
+        with self.assertRaises(ValueError):
+            self.model.agreger_consommations(periode="annee")
+
+    def test_get_stats_energie(self):
+        colonnes = self.model.get_consommation_colonnes()
+        dates = colonnes["date_heure"]
+        milieu = str(dates[len(dates) // 2])
+        filtres = [
+            {},
+            {"id_batiment": 1},
+            {"id_source": 1, "date_debut": milieu},
+            {"id_equipement": 1, "date_fin": milieu},
+        ]
+        for filtre in filtres:
+            masque = np.ones(len(dates), dtype=bool)
+            if "id_batiment" in filtre:
+                masque &= colonnes["id_batiment"] == filtre["id_batiment"]
+            if "id_source" in filtre:
+                masque &= colonnes["id_source"] == filtre["id_source"]
+            if "id_equipement" in filtre:
+                masque &= colonnes["id_equipement"] == filtre["id_equipement"]
+            if "date_debut" in filtre:
+                masque &= dates >= np.datetime64(filtre["date_debut"])
+            if "date_fin" in filtre:
+                masque &= dates <= np.datetime64(filtre["date_fin"])
+            valeurs = colonnes["energie_kwh"][masque]
+
+            stats = self.model.get_stats_energie(**filtre)
+            self.assertEqual(stats["nb_mesures"], len(valeurs), filtre)
+            self.assertAlmostEqual(stats["total_kwh"], np.sum(valeurs), places=6)
+            self.assertAlmostEqual(stats["moyenne_kwh"], np.mean(valeurs), places=6)
+            self.assertAlmostEqual(stats["ecart_type"], np.std(valeurs), places=6)
+            self.assertEqual(stats["min_kwh"], np.min(valeurs))
+            self.assertEqual(stats["max_kwh"], np.max(valeurs))
+
+        self.assertIsNone(self.model.get_stats_energie(id_equipement=-1))
+
     def test_get_consommation_by_source(self):
         # Use a source from seed data
         nom_source = "JIRAMA"
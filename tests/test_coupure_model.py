@@ -60,6 +60,12 @@ class TestCoupureModel(unittest.TestCase):
         self.assertIn("nom_batiment", first_item)
         self.assertIn("debut_coupure", first_item)
 
+    def test_iter_all_coupures(self):
+        debut = datetime(2025, 1, 3, 10, 0, 0)
+        self.model.add_coupure(self.test_batiment_id, debut.isoformat(), None, "Test Cause")
+        flux = list(self.model.iter_all_coupures(taille_lot=1))
+        self.assertEqual(flux, self.model.get_all_coupures())
+
     def test_get_current_coupures(self):
         # Add an ongoing coupure
         debut = datetime.now().replace(microsecond=0) - timedelta(minutes=30)
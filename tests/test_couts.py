@@ -77,6 +77,37 @@ class TestCouts(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.couts_analyser.calculer_cout_par_periode(periode='annee')
 
+    def test_calculer_cout_par_periode_coherent(self):
+        # Référence calculée ligne par ligne avec le coût de chaque source
+        attendu = {}
+        for conso in self.consommation_model.get_all_consommation():
+            cout_kwh = self.source_model.get_cout_kwh_by_source_name(conso["nom_source"])
+            cle = datetime.fromisoformat(conso["date_heure"]).strftime("%Y-%m")
+            attendu[cle] = attendu.get(cle, 0.0) + conso["energie_kwh"] * cout_kwh
+
+        couts_mois = self.couts_analyser.calculer_cout_par_periode(periode='mois')
+        self.assertEqual(list(couts_mois.keys()), sorted(attendu.keys()))
+        for cle, cout in attendu.items():
+            self.assertAlmostEqual(couts_mois[cle], cout, places=2)
+
+        couts_semaine = self.couts_analyser.calculer_cout_par_periode(periode='semaine')
+        self.assertAlmostEqual(sum(couts_semaine.values()), sum(attendu.values()), places=2)
+
+    def test_calculer_cout_par_periode_detaille(self):
+        detail = self.couts_analyser.calculer_cout_par_periode_detaille(periode='jour')
+        totaux = self.couts_analyser.calculer_cout_par_periode(periode='jour')
+        for ligne in detail:
+            self.assertIn("batiment", ligne)
+            self.assertIn("nom_source", ligne)
+        for jour, cout in totaux.items():
+            self.assertAlmostEqual(sum(l["cout"] for l in detail if l["periode"] == jour), cout, places=2)
+
+    def test_simuler_coupures_monte_carlo_plafond(self):
+        resultat, message = self.couts_analyser.simuler_coupures_monte_carlo(
+            nb_scenarios=Couts.NB_SCENARIOS_MAX + 1)
+        self.assertIsNone(resultat)
+        self.assertIn("limité", message)
+
     def test_calculer_surcout_coupures(self):
         # This method is a placeholder and should return 0.0 for now.
         surcout = self.couts_analyser.calculer_surcout_coupures()
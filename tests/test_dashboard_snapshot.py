@@ -0,0 +1,59 @@
+import unittest
+from dataclasses import FrozenInstanceError
+
+from analysis.couts import Couts
+from analysis.dashboard_snapshot import DashboardService
+from analysis.efficacite import Efficacite
+from analysis.statistiques import Statistique
+from model.coupure_model import CoupureModel
+
+class TestDashboardSnapshot(unittest.TestCase):
+    def setUp(self):
+        # On s'appuie sur les données de la base de l'application, comme les autres tests d'analyse
+        self.snapshot = DashboardService().snapshot()
+
+    def test_identique_aux_appels_separes(self):
+        self.assertEqual([dict(c) for c in self.snapshot.coupures], CoupureModel().get_all_coupures())
+        self.assertEqual([dict(c) for c in self.snapshot.coupures_en_cours], CoupureModel().get_current_coupures())
+        self.assertEqual(len(self.snapshot.anomalies), Statistique().nombre_anomalies_contextuelles())
+        self.assertEqual(dict(self.snapshot.comparaison_couts), Couts().comparer_couts_sources())
+        self.assertEqual([dict(e) for e in self.snapshot.top_equipements],
+                         Efficacite().get_equipements_plus_energivores(top_n=5))
+        self.assertEqual(dict(self.snapshot.couts_par_mois), Couts().calculer_cout_par_periode("mois", repartir=True))
+        self.assertEqual(self.snapshot.nombre_alertes,
+                         len(self.snapshot.coupures_en_cours) + len(self.snapshot.anomalies))
+
+    def test_immuable_et_chronometre(self):
+        with self.assertRaises(FrozenInstanceError):
+            self.snapshot.anomalies = ()
+        with self.assertRaises(TypeError):
+            self.snapshot.couts_par_mois["2025-01"] = 0.0
+        if self.snapshot.coupures:
+            with self.assertRaises(TypeError):
+                self.snapshot.coupures[0]["cause"] = "modifiée"
+        self.assertIn("anomalies", self.snapshot.durees)
+        self.assertAlmostEqual(self.snapshot.duree_totale, sum(self.snapshot.durees.values()))
+
+    def test_progression(self):
+        pourcentages = []
+        DashboardService().snapshot(progression=pourcentages.append)
+        self.assertEqual(len(pourcentages), len(self.snapshot.durees))
+        self.assertEqual(pourcentages, sorted(pourcentages))
+        self.assertEqual(pourcentages[-1], 100)
+
+    def test_recalcul_partiel(self):
+        partiel = DashboardService().snapshot(champs={"coupures"}, precedent=self.snapshot)
+        self.assertEqual(partiel.recalcules, {"coupures"})
+        self.assertEqual(list(partiel.durees), ["coupures"])
+        # Les autres champs sont ceux de l'instantané précédent
+        self.assertIs(partiel.anomalies, self.snapshot.anomalies)
+        self.assertIs(partiel.totaux_heure, self.snapshot.totaux_heure)
+        self.assertEqual(partiel.coupures, self.snapshot.coupures)
+
+        # Changer de bâtiment impose de recalculer la courbe
+        autre = DashboardService().snapshot(id_batiment=1, champs=set(), precedent=self.snapshot)
+        self.assertEqual(autre.recalcules, {"totaux_heure"})
+        self.assertEqual(autre.id_batiment, 1)
+
+if __name__ == '__main__':
+    unittest.main()
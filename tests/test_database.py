@@ -0,0 +1,65 @@
+import unittest
+import os
+import tempfile
+import threading
+
+from model.database import Database, get_database
+from config.settings import DB_PATH
+
+class TestDatabase(unittest.TestCase):
+    def setUp(self):
+        fd, self.db_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        self.db = Database(self.db_path)
+        self.db.execute("CREATE TABLE T (id INTEGER PRIMARY KEY, valeur TEXT)")
+
+    def tearDown(self):
+        self.db.close_all()
+        os.remove(self.db_path)
+
+    def test_connexion_reutilisee(self):
+        conn1 = self.db.connect()
+        conn1.close() # Ne ferme pas réellement la connexion
+        conn2 = self.db.connect()
+        self.assertIs(conn1, conn2)
+        self.assertEqual(conn2.execute("SELECT 1").fetchone()[0], 1)
+
+        stats = self.db.get_stats()
+        self.assertEqual(stats["connexions_ouvertes"], 1)
+        self.assertGreaterEqual(stats["connexions_reutilisees"], 2)
+
+    def test_une_connexion_par_thread(self):
+        connexions = []
+        thread = threading.Thread(target=lambda: connexions.append(self.db.connect()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(connexions[0], self.db.connect())
+        self.assertEqual(self.db.get_stats()["connexions_ouvertes"], 2)
+
+    def test_transaction_commit(self):
+        with self.db.transaction():
+            self.db.execute("INSERT INTO T (valeur) VALUES (?)", ("a",))
+            self.db.execute("INSERT INTO T (valeur) VALUES (?)", ("b",))
+        self.assertEqual(self.db.fetch_one("SELECT COUNT(*) AS n FROM T")["n"], 2)
+
+    def test_transaction_rollback(self):
+        with self.assertRaises(ValueError):
+            with self.db.transaction():
+                self.db.execute("INSERT INTO T (valeur) VALUES (?)", ("a",))
+                raise ValueError("échec")
+        self.assertEqual(self.db.fetch_one("SELECT COUNT(*) AS n FROM T")["n"], 0)
+        self.assertEqual(self.db.get_stats()["rollbacks"], 1)
+
+    def test_compteurs_requetes(self):
+        self.db.reset_stats()
+        self.db.fetch_all("SELECT * FROM T")
+        self.db.fetch_one("SELECT COUNT(*) FROM T")
+        stats = self.db.get_stats()
+        self.assertEqual(stats["requetes"], 2)
+        self.assertGreaterEqual(stats["temps_requetes_s"], 0.0)
+
+    def test_get_database_partagee(self):
+        self.assertIs(get_database(DB_PATH), get_database(DB_PATH))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import os
+import sqlite3
+import tempfile
+
+from config.database_config import MIGRATIONS, appliquer_migrations, version_schema, plans_en_scan, verifier_plans_requetes
+from config.settings import BASE_DIR
+from model.database import Database
+
+class TestMigrations(unittest.TestCase):
+    def setUp(self):
+        # Base temporaire avec le schéma d'origine, sans aucune migration
+        fd, self.db_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript((BASE_DIR / "model" / "db.txt").read_text(encoding="utf-8"))
+        conn.close()
+        self.db = Database(self.db_path)
+
+    def tearDown(self):
+        self.db.close_all()
+        os.remove(self.db_path)
+
+    def test_appliquer_migrations(self):
+        self.assertEqual(version_schema(self.db), 0)
+        appliquees = appliquer_migrations(self.db)
+        self.assertEqual(appliquees, [m[0] for m in MIGRATIONS])
+        self.assertEqual(version_schema(self.db), MIGRATIONS[-1][0])
+
+        # Une seconde exécution ne fait rien
+        self.assertEqual(appliquer_migrations(self.db), [])
+
+    def test_index_crees(self):
+        appliquer_migrations(self.db)
+        index = {row["name"] for row in self.db.fetch_all("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        for nom in ("idx_consommation_date", "idx_consommation_equipement_date",
+                    "idx_consommation_source", "idx_coupure_batiment_debut", "idx_consommation_epoch"):
+            self.assertIn(nom, index)
+        # Remplacé par idx_consommation_epoch (migration 8)
+        self.assertNotIn("idx_consommation_date_id", index)
+
+    def test_colonnes_epoch(self):
+        appliquer_migrations(self.db)
+        self.db.execute("INSERT INTO BATIMENT (nom) VALUES ('Bloc A')")
+        self.db.execute("INSERT INTO COUPURE (id_batiment, debut_coupure) VALUES (1, '2025-01-10T07:00:00')")
+        row = self.db.fetch_one("SELECT debut_epoch, fin_epoch FROM COUPURE")
+        self.assertEqual(row["debut_epoch"], 1736492400)
+        self.assertIsNone(row["fin_epoch"])
+
+        # Les colonnes suivent les modifications du texte ISO
+        self.db.execute("UPDATE COUPURE SET fin_coupure = '2025-01-10T08:00:00'")
+        self.assertEqual(self.db.fetch_one("SELECT fin_epoch FROM COUPURE")["fin_epoch"], 1736496000)
+
+    def test_plans_requetes_critiques(self):
+        # Sans index, les requêtes critiques parcourent toute la table
+        self.assertTrue(plans_en_scan(self.db))
+        with self.assertRaises(RuntimeError):
+            verifier_plans_requetes(self.db)
+
+        appliquer_migrations(self.db)
+        self.assertEqual(plans_en_scan(self.db), {})
+        verifier_plans_requetes(self.db)
+
+    def test_migration_en_echec_annulee(self):
+        migrations = MIGRATIONS + [(999, "Migration invalide", ["CREATE INDEX idx_x ON TABLE_INEXISTANTE(x)"])]
+        with self.assertRaises(sqlite3.Error):
+            appliquer_migrations(self.db, migrations)
+        self.assertEqual(version_schema(self.db), MIGRATIONS[-1][0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from utils.date_utils import (
+    parser_iso, tronquer, codes_periode, cles_periode, heure_du_jour, jour_semaine, vers_epoch,
+)
+
+class TestDateUtils(unittest.TestCase):
+    def setUp(self):
+        # Dates aléatoires sur trois ans, aux deux formats stockés en base
+        rng = np.random.default_rng(0)
+        debut = datetime(2024, 1, 1)
+        self.datetimes = [debut + timedelta(seconds=int(s)) for s in rng.integers(0, 3 * 365 * 86400, 500)]
+        self.chaines = [
+            d.isoformat(sep=" " if i % 2 else "T") for i, d in enumerate(self.datetimes)
+        ]
+
+    def _cle_par_ligne(self, d, grain):
+        if grain == "heure":
+            return d.strftime("%Y-%m-%d %H:00:00")
+        if grain == "jour":
+            return str(d.date())
+        if grain == "semaine":
+            return str(d.date() - timedelta(days=d.weekday()))
+        if grain == "mois":
+            return d.strftime("%Y-%m")
+        return d.strftime("%Y")
+
+    def test_parser_iso(self):
+        dates = parser_iso(self.chaines + ["2025-01-10", None, "pas une date"])
+        self.assertEqual(dates.dtype, np.dtype("datetime64[s]"))
+        self.assertEqual(dates[:-3].view(np.int64).tolist(), [vers_epoch(d) for d in self.datetimes])
+        self.assertEqual(dates[-3], np.datetime64("2025-01-10T00:00:00"))
+        self.assertTrue(np.isnat(dates[-2]) and np.isnat(dates[-1]))
+        with self.assertRaises(ValueError):
+            parser_iso(["pas une date"], invalides_en_nat=False)
+
+    def test_cles_identiques_au_calcul_par_ligne(self):
+        dates = parser_iso(self.chaines)
+        for grain in ("heure", "jour", "semaine", "mois", "annee"):
+            attendu = [self._cle_par_ligne(d, grain) for d in self.datetimes]
+            self.assertEqual(cles_periode(dates, grain).tolist(), attendu, grain)
+
+            cles, codes = codes_periode(dates, grain)
+            self.assertEqual(cles.tolist(), sorted(set(attendu)), grain)
+            self.assertEqual(cles[codes].tolist(), attendu, grain)
+
+    def test_semaine_commence_le_lundi(self):
+        dates = parser_iso(["2025-01-12 23:00:00", "2025-01-13 00:00:00", "1969-12-31 12:00:00"])
+        self.assertEqual(tronquer(dates, "semaine").astype(str).tolist(), ["2025-01-06", "2025-01-13", "1969-12-29"])
+        with self.assertRaises(ValueError):
+            tronquer(dates, "trimestre")
+
+    def test_heure_et_jour_semaine(self):
+        dates = parser_iso(self.chaines + [None])
+        self.assertEqual(heure_du_jour(dates).tolist(), [d.hour for d in self.datetimes] + [-1])
+        self.assertEqual(jour_semaine(dates).tolist(), [d.weekday() for d in self.datetimes] + [-1])
+
+    def test_nat_ignore(self):
+        cles, codes = codes_periode(parser_iso([None, "2025-02-03 10:00:00"]), "mois")
+        self.assertEqual(cles.tolist(), ["2025-02"])
+        self.assertEqual(codes.tolist(), [-1, 0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import os
+import tempfile
+
+from model.database import Database
+from model.dimension_cache import DimensionCache
+from config.settings import BASE_DIR
+
+SCHEMA_PATH = BASE_DIR / "model" / "db.txt"
+
+class TestDimensionCache(unittest.TestCase):
+    def setUp(self):
+        fd, self.db_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        self.db = Database(self.db_path)
+        self.db.connect().executescript(SCHEMA_PATH.read_text(encoding="utf-8"))
+        self.db.execute("INSERT INTO SOURCE_ENERGIE (nom_source, cout_kwh) VALUES ('JIRAMA', 0.5)")
+        self.db.execute("INSERT INTO BATIMENT (nom) VALUES ('Bloc A')")
+        self.db.execute("INSERT INTO TYPE_EQUIPEMENT (nom_type, consommation_theorique) VALUES ('Clim', 1.5)")
+        self.db.execute("INSERT INTO EQUIPEMENT (nom_equipement, puissance_watt, id_type, id_batiment) VALUES ('Clim 1', 1500, 1, 1)")
+        self.cache = DimensionCache(self.db)
+
+    def tearDown(self):
+        self.db.close_all()
+        os.remove(self.db_path)
+
+    def test_une_requete_par_dimension(self):
+        self.assertEqual(self.cache.get_par_nom("sources", "JIRAMA")["cout_kwh"], 0.5)
+        self.assertEqual(self.cache.get("sources", 1)["nom_source"], "JIRAMA")
+        self.assertIsNone(self.cache.get("sources", 99))
+
+        stats = self.cache.get_stats()
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hits"], 2)
+
+    def test_retourne_des_copies(self):
+        self.cache.get("sources", 1)["cout_kwh"] = 99
+        self.assertEqual(self.cache.get("sources", 1)["cout_kwh"], 0.5)
+
+    def test_invalidation(self):
+        self.assertEqual(len(self.cache.lister("sources")), 1)
+        self.db.execute("INSERT INTO SOURCE_ENERGIE (nom_source, cout_kwh) VALUES ('Solaire', 0.1)")
+        self.assertEqual(len(self.cache.lister("sources")), 1) # Encore en cache
+        self.cache.invalider("sources")
+        self.assertEqual(len(self.cache.lister("sources")), 2)
+
+    def test_invalidation_dependances(self):
+        self.assertEqual(self.cache.get("equipements", 1)["nom_type"], "Clim")
+        self.db.execute("UPDATE TYPE_EQUIPEMENT SET nom_type = 'Climatiseur' WHERE id_type = 1")
+        self.cache.invalider("types")
+        self.assertEqual(self.cache.get("equipements", 1)["nom_type"], "Climatiseur")
+
+if __name__ == '__main__':
+    unittest.main()
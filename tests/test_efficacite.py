@@ -127,5 +127,43 @@ class TestEfficacite(unittest.TestCase):
         gaspillage_high_seuil = self.efficacite_analyser.detecter_gaspillage(seuil_ecart_pourcentage=50)
         self.assertEqual(len(gaspillage_high_seuil), 0)
 
+    def test_une_seule_passe_par_actualisation(self):
+        appels = []
+        calculer_bilan = self.efficacite_analyser.calculer_bilan
+        self.efficacite_analyser.calculer_bilan = lambda: appels.append(1) or calculer_bilan()
+
+        # Comme EfficaciteView : un calcul explicite, puis des lectures sur le bilan en cache
+        self.efficacite_analyser.calculer_bilan()
+        self.efficacite_analyser.get_equipements_plus_energivores(top_n=5)
+        self.efficacite_analyser.detecter_gaspillage()
+        self.efficacite_analyser.get_rendements_par_type()
+        self.assertEqual(len(appels), 1)
+
+    def test_calculer_bilan_coherent(self):
+        # Le bilan groupé doit correspondre aux totaux calculés équipement par équipement
+        bilan = self.efficacite_analyser.calculer_bilan()
+        for equip in self.equipement_model.get_all_equipements():
+            id_equipement = equip["id_equipement"]
+            conso_equip = self.consommation_model.get_consommation_by_equipement(id_equipement)
+            total_kwh = sum(item[1] for item in conso_equip)
+
+            ligne = bilan["equipements"][id_equipement]
+            self.assertAlmostEqual(ligne["conso_reelle_totale"], total_kwh, places=6)
+            self.assertEqual(ligne["nb_mesures"], len(conso_equip))
+            self.assertEqual(
+                self.efficacite_analyser.calculer_efficacite_equipement(id_equipement)["conso_reelle_totale"],
+                ligne["conso_reelle_totale"]
+            )
+
+        types = self.efficacite_analyser.get_rendements_par_type()
+        self.assertEqual(len(types), len(self.type_equipement_model.get_all_types_equipement()))
+
+    def test_analyze_conso_during_coupure_meme_batiment(self):
+        alerts = self.efficacite_analyser.analyze_conso_during_coupure()
+        for alert in alerts:
+            self.assertEqual(alert["type"], "Conso. pdt Coupure")
+            equip = self.equipement_model.get_equipement_details(alert["id_equipement"])
+            self.assertEqual(equip["id_batiment"], alert["id_batiment"])
+
 if __name__ == '__main__':
     unittest.main()
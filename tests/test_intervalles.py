@@ -0,0 +1,103 @@
+import unittest
+import numpy as np
+
+from analysis.intervalles import joindre_intervalles
+
+class TestIntervalles(unittest.TestCase):
+    @staticmethod
+    def _chevauche(debut_a, fin_a, debut_b, fin_b):
+        # [début, fin[ ; un intervalle de durée nulle est un instant
+        if debut_a == fin_a and debut_b == fin_b:
+            return debut_a == debut_b
+        if debut_a == fin_a:
+            return debut_b <= debut_a < fin_b
+        if debut_b == fin_b:
+            return debut_a <= debut_b < fin_a
+        return debut_b < fin_a and fin_b > debut_a
+
+    def _force_brute(self, cle_a, debut_a, fin_a, cle_b, debut_b, fin_b):
+        return {
+            (i, j)
+            for i in range(len(cle_a))
+            for j in range(len(cle_b))
+            if cle_a[i] == cle_b[j] and self._chevauche(debut_a[i], fin_a[i], debut_b[j], fin_b[j])
+        }
+
+    def test_chevauchement_sur_toute_la_duree(self):
+        # Coupure de 10:00 à 11:00 dans le bâtiment 1 (en minutes)
+        cle_a, debut_a, fin_a = [1], [600], [660]
+        # Consommations : commencée avant et finie pendant, hors coupure, autre bâtiment, commencée pendant
+        cle_b = [1, 1, 2, 1]
+        debut_b = [540, 480, 620, 650]
+        fin_b = [610, 540, 630, 700]
+        indices_a, indices_b = joindre_intervalles(cle_a, debut_a, fin_a, cle_b, debut_b, fin_b)
+        self.assertEqual(indices_a.tolist(), [0, 0])
+        self.assertEqual(sorted(indices_b.tolist()), [0, 3])
+
+    def test_identique_a_la_double_boucle(self):
+        rng = np.random.default_rng(0)
+        nb_a, nb_b = 40, 400
+        cle_a = rng.integers(1, 4, nb_a)
+        debut_a = rng.integers(0, 10000, nb_a)
+        fin_a = debut_a + rng.integers(0, 500, nb_a)
+        cle_b = rng.integers(1, 5, nb_b)
+        debut_b = rng.integers(0, 10000, nb_b)
+        fin_b = debut_b + rng.choice([0, 15, 30, 60, 240], nb_b)
+
+        indices_a, indices_b = joindre_intervalles(cle_a, debut_a, fin_a, cle_b, debut_b, fin_b)
+        paires = set(zip(indices_a.tolist(), indices_b.tolist()))
+        self.assertEqual(len(paires), len(indices_a)) # Pas de doublon
+        self.assertEqual(paires, self._force_brute(cle_a, debut_a, fin_a, cle_b, debut_b, fin_b))
+
+    def test_intervalles_adjacents_exclus(self):
+        # Coupure [08:00, 09:00[ : relevés finissant à 08:00 et commençant à 09:00
+        indices_a, indices_b = joindre_intervalles([1], [480], [540], [1, 1], [420, 540], [480, 600])
+        self.assertEqual(len(indices_a), 0)
+        self.assertEqual(len(indices_b), 0)
+
+        # Un relevé à cheval sur le début ou la fin reste compté
+        indices_a, indices_b = joindre_intervalles([1], [480], [540], [1, 1], [479, 539], [481, 541])
+        self.assertEqual(sorted(indices_b.tolist()), [0, 1])
+
+    def test_releves_de_duree_nulle(self):
+        # Instant au début de la coupure : compté ; instant à la fin : exclu
+        indices_a, indices_b = joindre_intervalles([1], [480], [540], [1, 1, 1], [480, 510, 540], [480, 510, 540])
+        self.assertEqual(sorted(indices_b.tolist()), [0, 1])
+
+        # Coupure de durée nulle : relevés qui la contiennent, instant égal
+        indices_a, indices_b = joindre_intervalles(
+            [1], [480], [480], [1, 1, 1, 1], [420, 480, 480, 400], [480, 540, 480, 420]
+        )
+        self.assertEqual(sorted(indices_b.tolist()), [1, 2])
+
+    def test_identique_a_la_double_boucle_bornes_communes(self):
+        # Petites valeurs entières : beaucoup de bornes égales et de durées nulles
+        rng = np.random.default_rng(1)
+        nb_a, nb_b = 60, 300
+        cle_a = rng.integers(1, 3, nb_a)
+        debut_a = rng.integers(0, 30, nb_a)
+        fin_a = debut_a + rng.integers(0, 4, nb_a)
+        cle_b = rng.integers(1, 3, nb_b)
+        debut_b = rng.integers(0, 30, nb_b)
+        fin_b = debut_b + rng.integers(0, 4, nb_b)
+
+        indices_a, indices_b = joindre_intervalles(cle_a, debut_a, fin_a, cle_b, debut_b, fin_b)
+        paires = set(zip(indices_a.tolist(), indices_b.tolist()))
+        self.assertEqual(len(paires), len(indices_a))
+        self.assertEqual(paires, self._force_brute(cle_a, debut_a, fin_a, cle_b, debut_b, fin_b))
+
+    def test_datetime64(self):
+        debut_a = np.array(["2025-01-10T10:00:00"], dtype="datetime64[s]")
+        fin_a = np.array(["2025-01-10T11:00:00"], dtype="datetime64[s]")
+        debut_b = np.array(["2025-01-10T09:30:00", "2025-01-10T08:00:00"], dtype="datetime64[s]")
+        fin_b = debut_b + np.array([60, 60], dtype="timedelta64[m]")
+        indices_a, indices_b = joindre_intervalles([1], debut_a, fin_a, [1, 1], debut_b, fin_b)
+        self.assertEqual(indices_b.tolist(), [0])
+
+    def test_entrees_vides(self):
+        indices_a, indices_b = joindre_intervalles([], [], [], [1], [0], [10])
+        self.assertEqual(len(indices_a), 0)
+        self.assertEqual(len(indices_b), 0)
+
+if __name__ == '__main__':
+    unittest.main()
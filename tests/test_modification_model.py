@@ -0,0 +1,68 @@
+import unittest
+import sqlite3
+
+from analysis.dashboard_snapshot import champs_a_recalculer
+from model.agregat_model import AgregatModel
+from model.modification_model import ModificationModel
+from tests.utils_tests import TestCaseBaseTemporaire
+
+class TestModificationModel(TestCaseBaseTemporaire):
+    DONNEES = """
+        INSERT INTO BATIMENT (nom) VALUES ('Hôpital');
+        INSERT INTO SOURCE_ENERGIE (nom_source, cout_kwh) VALUES ('JIRAMA', 500);
+        INSERT INTO EQUIPEMENT (nom_equipement, id_batiment) VALUES ('Frigo', 1);
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.model = ModificationModel(self.db_path)
+        self.model.tables_modifiees() # Premier appel : toutes les tables
+
+    def _inserer_consommation(self):
+        self.db.execute("""
+            INSERT INTO CONSOMMATION (id_equipement, id_source, date_heure, duree_minutes, energie_kwh)
+            VALUES (1, 1, '2025-01-01 08:00:00', 60, 1.5)
+        """)
+
+    def test_rien_sans_ecriture(self):
+        self.assertEqual(self.model.tables_modifiees(), set())
+        self.db.fetch_all("SELECT * FROM CONSOMMATION")
+        self.assertEqual(self.model.tables_modifiees(), set())
+
+    def test_tables_ecrites(self):
+        self._inserer_consommation()
+        self.db.execute("INSERT INTO COUPURE (debut_coupure, id_batiment) VALUES ('2025-01-01 09:00:00', 1)")
+        self.assertEqual(self.model.tables_modifiees(), {"CONSOMMATION", "COUPURE"})
+        self.assertEqual(self.model.tables_modifiees(), set())
+
+        # Le changement de prix écrit aussi une version de tarif (trigger)
+        self.db.execute("UPDATE SOURCE_ENERGIE SET cout_kwh = 600")
+        self.assertEqual(self.model.tables_modifiees(), {"SOURCE_ENERGIE", "TARIF_SOURCE"})
+        self.db.execute("DELETE FROM COUPURE")
+        self.assertEqual(self.model.tables_modifiees(), {"COUPURE"})
+
+    def test_ecriture_d_une_autre_connexion(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("INSERT INTO BATIMENT (nom) VALUES ('Université')")
+        conn.commit()
+        conn.close()
+        self.assertEqual(self.model.tables_modifiees(), {"BATIMENT"})
+
+    def test_chargement_en_masse(self):
+        with AgregatModel(self.db_path).chargement_en_masse():
+            self._inserer_consommation()
+            self._inserer_consommation()
+        versions = self.model.get_versions()
+        self.assertEqual(self.model.tables_modifiees(), {"CONSOMMATION"})
+        # Les triggers sont recréés à la sortie
+        self._inserer_consommation()
+        self.assertEqual(self.model.get_versions()["CONSOMMATION"], versions["CONSOMMATION"] + 1)
+
+    def test_champs_a_recalculer(self):
+        self.assertEqual(champs_a_recalculer(set()), set())
+        self.assertEqual(champs_a_recalculer({"COUPURE"}), {"coupures"})
+        self.assertEqual(champs_a_recalculer({"TARIF_SOURCE"}), {"couts_par_mois", "comparaison_couts"})
+        self.assertNotIn("coupures", champs_a_recalculer({"CONSOMMATION"}))
+
+if __name__ == '__main__':
+    unittest.main()
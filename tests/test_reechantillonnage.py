@@ -0,0 +1,60 @@
+import unittest
+import numpy as np
+
+from analysis.reechantillonnage import repartir_sur_grille, totaux_par_periode
+
+class TestReechantillonnage(unittest.TestCase):
+    def _par_minute(self, debuts, durees, valeurs, lignes, pas_minutes, origine, nb_creneaux, nb_lignes):
+        # Référence : chaque minute de la mesure reçoit valeur / durée
+        matrice = np.zeros((nb_lignes, nb_creneaux))
+        for debut, duree, valeur, ligne in zip(debuts, durees, valeurs, lignes):
+            minute = int((debut - origine) // np.timedelta64(1, "m"))
+            if duree == 0:
+                matrice[ligne, minute // pas_minutes] += valeur
+            for m in range(minute, minute + duree):
+                matrice[ligne, m // pas_minutes] += valeur / duree
+        return matrice
+
+    def test_identique_au_calcul_par_minute(self):
+        rng = np.random.default_rng(0)
+        n = 300
+        origine = np.datetime64("2025-01-31T00:00:00")
+        debuts = origine + rng.integers(0, 3 * 1440, n).astype("timedelta64[m]")
+        durees = rng.choice([0, 5, 15, 60, 90, 180, 600], n)
+        valeurs = rng.gamma(2.0, 1.0, n)
+        equipements = rng.choice([4, 9, 12], n)
+        for pas in (15, 60):
+            resultat = repartir_sur_grille(debuts, durees, valeurs, pas_minutes=pas, lignes=equipements, taille_lot=37)
+            self.assertEqual(resultat["etiquettes"].tolist(), [4, 9, 12])
+            self.assertEqual(resultat["grille"][0], origine)
+            lignes = np.searchsorted(resultat["etiquettes"], equipements)
+            attendu = self._par_minute(debuts, durees, valeurs, lignes, pas, origine,
+                                       resultat["matrice"].shape[1], 3)
+            np.testing.assert_allclose(resultat["matrice"], attendu, atol=1e-12)
+            self.assertAlmostEqual(resultat["matrice"].sum(), valeurs.sum())
+
+    def test_mesure_a_cheval_sur_deux_mois(self):
+        # 3 h à partir de 23 h le 31 janvier : 1/3 en janvier, 2/3 en février
+        resultat = repartir_sur_grille(["2025-01-31T23:00:00", "2025-02-02T10:30:00"], [180, 60], [3.0, 2.0])
+        mois = totaux_par_periode(resultat, "mois")
+        self.assertEqual(mois["cles"].tolist(), ["2025-01", "2025-02"])
+        np.testing.assert_allclose(mois["totaux"][0], [1.0, 4.0])
+
+        jours = totaux_par_periode(resultat, "jour")
+        self.assertEqual(jours["cles"].tolist(), ["2025-01-31", "2025-02-01", "2025-02-02"])
+        heures = totaux_par_periode(resultat, "heure")
+        np.testing.assert_allclose(heures["totaux"][0][-2:], [1.0, 1.0]) # 10:30-11:30
+
+    def test_bornes_et_valeurs_ignorees(self):
+        debuts = np.array(["2025-01-01T00:00", "NaT", "2025-01-01T01:00"], dtype="datetime64[s]")
+        resultat = repartir_sur_grille(debuts, [120, 60, 60], [4.0, 1.0, np.nan],
+                                       debut_grille="2025-01-01T01:00", fin_grille="2025-01-01T02:00")
+        np.testing.assert_allclose(resultat["matrice"], [[2.0]])
+
+        vide = repartir_sur_grille(np.array([], dtype="datetime64[s]"), [], [])
+        self.assertEqual(vide["matrice"].shape, (1, 0))
+        with self.assertRaises(ValueError):
+            repartir_sur_grille(debuts, [60] * 3, [1.0] * 3, pas_minutes=7)
+
+if __name__ == '__main__':
+    unittest.main()
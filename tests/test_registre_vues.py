@@ -0,0 +1,85 @@
+import unittest
+import os
+import subprocess
+import sys
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication, QComboBox
+
+from config.settings import BASE_DIR
+from controller.registre_vues import RegistreVues
+from tests.utils_tests import TestCaseBaseTemporaire
+from view.components.combos import recharger_combo
+
+class VueFactice:
+    constructions = 0
+
+    def __init__(self, parent=None):
+        VueFactice.constructions += 1
+        self.actualisations = 0
+
+    def actualiser(self):
+        self.actualisations += 1
+
+class TestRegistreVues(TestCaseBaseTemporaire):
+    def setUp(self):
+        super().setUp()
+        VueFactice.constructions = 0
+        self.registre = RegistreVues(vues={"factice": (__name__, "VueFactice", ("COUPURE", "BATIMENT"))},
+                                     db_path=self.db_path)
+
+    def test_construite_une_fois_et_reutilisee(self):
+        self.assertFalse(self.registre.est_construite("factice"))
+        vue = self.registre.obtenir("factice")
+        self.assertIs(self.registre.obtenir("factice"), vue)
+        self.assertEqual(VueFactice.constructions, 1)
+        # Rien n'a changé : la fenêtre est rouverte telle quelle
+        self.assertEqual(vue.actualisations, 0)
+
+    def test_actualisee_si_ses_tables_changent(self):
+        vue = self.registre.obtenir("factice")
+        self.db.execute("INSERT INTO SOURCE_ENERGIE (nom_source, cout_kwh) VALUES ('JIRAMA', 500)")
+        self.registre.obtenir("factice")
+        self.assertEqual(vue.actualisations, 0) # Table non lue par la vue
+
+        self.db.execute("INSERT INTO BATIMENT (nom) VALUES ('Hôpital')")
+        self.registre.obtenir("factice")
+        self.registre.obtenir("factice")
+        self.assertEqual(vue.actualisations, 1)
+
+    def test_demarrage_sans_modules_de_vues_ni_matplotlib(self):
+        code = ("import sys, controller.main_controller as c; "
+                "print(sorted(m for m in sys.modules if m.startswith(('view.couts_view', 'view.simulation_view', 'matplotlib'))))")
+        sortie = subprocess.run([sys.executable, "-c", code], cwd=BASE_DIR, capture_output=True, text=True,
+                                env=dict(os.environ, QT_QPA_PLATFORM="offscreen"), check=True).stdout
+        self.assertEqual(sortie.strip(), "[]")
+
+class TestRechargerCombo(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def test_garde_la_selection(self):
+        combo = QComboBox()
+        combo.addItem("Tous", None)
+        elements = [("A", 1), ("B", 2)]
+
+        def remplir():
+            for nom, ident in elements:
+                combo.addItem(nom, ident)
+
+        remplir()
+        combo.setCurrentIndex(2)
+        elements = [("Nouveau", 3), ("A", 1), ("B", 2)]
+        recharger_combo(combo, remplir, garder=1)
+        self.assertEqual([combo.itemText(i) for i in range(combo.count())], ["Tous", "Nouveau", "A", "B"])
+        self.assertEqual(combo.currentData(), 2)
+
+        # Élément supprimé : retour au premier
+        elements = [("A", 1)]
+        recharger_combo(combo, remplir, garder=1)
+        self.assertEqual(combo.currentIndex(), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+import numpy as np
+
+from analysis.simulation_coupures import profil_horaire, cout_sur_intervalles, simuler_monte_carlo
+
+class TestSimulationCoupures(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.profil = rng.gamma(2.0, 1.0, 24)
+
+    def test_integrale_identique_au_calcul_par_minute(self):
+        debuts = np.array([0.0, 5.5, 23.25, 18.0, 12.0])
+        durees = np.array([1.0, 2.75, 1.5, 30.0, 0.0]) # à cheval sur minuit, plus d'une journée, nulle
+        attendus = []
+        for debut, duree in zip(debuts, durees):
+            minutes = np.arange(round(debut * 60), round((debut + duree) * 60))
+            attendus.append(self.profil[(minutes // 60) % 24].sum() / 60)
+        np.testing.assert_allclose(cout_sur_intervalles(self.profil, debuts, durees), attendus)
+
+    def test_profil_horaire(self):
+        # Deux jours de mesures : 2 kWh sur 8 h-10 h le 1er, 4 kWh sur 8 h-9 h le 2
+        debuts = np.array(["2025-01-01T08:00", "2025-01-02T08:00"], dtype="datetime64[s]")
+        profil = profil_horaire(debuts, [120, 60], [2.0, 4.0])
+        attendu = np.zeros(24)
+        attendu[8], attendu[9] = 2.5, 0.5
+        np.testing.assert_allclose(profil, attendu)
+        self.assertFalse(profil_horaire(debuts[:0], [], []).any())
+
+    def test_monte_carlo(self):
+        heures = [2.0, 8.5, 19.0, 21.0]
+        durees = [0.5, 1.0, 3.0, 6.0]
+        resultat = simuler_monte_carlo(heures, durees, self.profil, 800.0, nb_scenarios=100_000, graine=7)
+        self.assertEqual(len(resultat["couts"]), 100_000)
+        self.assertLessEqual(resultat["p50"], resultat["p95"])
+        self.assertLessEqual(resultat["p95"], resultat["pire"])
+        # Pire cas borné par la pire combinaison (début, durée) de l'historique
+        combinaisons = cout_sur_intervalles(self.profil * 800.0, *np.meshgrid(heures, durees))
+        self.assertAlmostEqual(resultat["pire"], combinaisons.max())
+        # Reproductible avec une graine
+        self.assertEqual(resultat["moyenne"], simuler_monte_carlo(heures, durees, self.profil, 800.0, 100_000, 7)["moyenne"])
+
+        # Charge et prix constants : coût = charge x prix x durée
+        constant = simuler_monte_carlo(heures, [2.0], np.full(24, 3.0), 500.0, nb_scenarios=1000, graine=0)
+        self.assertAlmostEqual(constant["pire"], 3000.0)
+        self.assertAlmostEqual(constant["energie_moyenne_kwh"], 6.0)
+        with self.assertRaises(ValueError):
+            simuler_monte_carlo([], [], self.profil, 800.0)
+
+if __name__ == '__main__':
+    unittest.main()
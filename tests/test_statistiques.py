@@ -1,5 +1,6 @@
 import unittest
 import numpy as np
+from datetime import datetime
 
 from analysis.statistiques import Statistique
 from model.consommation_model import ConsommationModel
@@ -26,6 +27,65 @@ class TestStatistique(unittest.TestCase):
         self.assertEqual(stats['min_kwh'], np.min(energies))
         self.assertAlmostEqual(stats['ecart_type'], np.std(energies))
 
+    def test_stat_globale_flux(self):
+        # Un générateur plus long qu'un lot est consommé en une passe
+        valeurs = np.linspace(0.5, 12.0, 10000)
+        stats = self.statistique.stat_globale({"energie_kwh": v} for v in valeurs)
+
+        self.assertAlmostEqual(stats['total_kwh'], np.sum(valeurs))
+        self.assertAlmostEqual(stats['moyenne_kwh'], np.mean(valeurs))
+        self.assertEqual(stats['max_kwh'], 12.0)
+        self.assertEqual(stats['min_kwh'], 0.5)
+        self.assertAlmostEqual(stats['ecart_type'], np.std(valeurs))
+        self.assertIsNone(self.statistique.stat_globale(iter([])))
+
+    def test_agreger_par_periode_liste(self):
+        consommations = [
+            (datetime(2025, 1, 12, 23, 0), 2.0), # Dimanche
+            ("2025-01-13 00:00:00", 1.0),        # Lundi, chaîne ISO
+            ("2025-02-01T08:00:00", 0.5),
+        ]
+        self.assertEqual(
+            self.statistique.agreger_par_periode(consommations, "jour"),
+            {"2025-01-12": 2.0, "2025-01-13": 1.0, "2025-02-01": 0.5}
+        )
+        self.assertEqual(
+            self.statistique.agreger_par_periode(consommations, "semaine"),
+            {"2025-01-06": 2.0, "2025-01-13": 1.0, "2025-01-27": 0.5}
+        )
+        self.assertEqual(
+            self.statistique.agreger_par_periode(consommations, "mois"),
+            {"2025-01": 3.0, "2025-02": 0.5}
+        )
+        with self.assertRaises(ValueError):
+            self.statistique.agreger_par_periode(consommations, "trimestre")
+
+    def test_agreger_tableaux(self):
+        dates = np.array(["2025-01-12T23:30", "2025-01-13T00:10", "2025-01-13T00:50", "NaT", "2026-02-01T08:00"],
+                         dtype="datetime64[s]")
+        energies = np.array([2.0, 1.0, 0.5, 9.0, 4.0])
+
+        agregat = self.statistique.agreger_tableaux(dates, energies, "heure")
+        self.assertEqual(agregat["cles"].tolist(), ["2025-01-12 23:00:00", "2025-01-13 00:00:00", "2026-02-01 08:00:00"])
+        self.assertEqual(agregat["totaux"].tolist(), [2.0, 1.5, 4.0])
+        self.assertEqual(agregat["periodes"].dtype, np.dtype("datetime64[h]"))
+
+        agregat = self.statistique.agreger_tableaux(dates, energies, "annee")
+        self.assertEqual(dict(zip(agregat["cles"].tolist(), agregat["totaux"].tolist())), {"2025": 3.5, "2026": 4.0})
+
+        # Multi-séries : matrice (séries, périodes), zéros là où une série n'a rien
+        sources = np.array(["JIRAMA", "Groupe", "JIRAMA", "JIRAMA", "Groupe"])
+        agregat = self.statistique.agreger_tableaux(dates, energies, "semaine", series=sources)
+        self.assertEqual(agregat["series"].tolist(), ["Groupe", "JIRAMA"])
+        self.assertEqual(agregat["cles"].tolist(), ["2025-01-06", "2025-01-13", "2026-01-26"])
+        self.assertEqual(agregat["totaux"].tolist(), [[0.0, 1.0, 4.0], [2.0, 0.5, 0.0]])
+
+        # Même résultat que la variante par liste de tuples
+        consommations = [(str(d), e) for d, e in zip(dates[:3], energies[:3])]
+        agregat = self.statistique.agreger_tableaux(dates[:3], energies[:3], "jour")
+        self.assertEqual(self.statistique.agreger_par_periode(consommations, "jour"),
+                         dict(zip(agregat["cles"].tolist(), agregat["totaux"].tolist())))
+
     def test_anomalies(self):
         # The seeded data has one value (7.5) that is a bit higher than others.
         # Let's see if we can catch it.
@@ -43,6 +103,17 @@ class TestStatistique(unittest.TestCase):
         anomalies_high_factor = self.statistique.anomalies(facteur=3)
         self.assertEqual(len(anomalies_high_factor), 0)
 
+    def test_anomalies_contextuelles(self):
+        scores = self.statistique.scores_anomalies()
+        self.assertEqual(len(scores["z_score"]), len(scores["energie_kwh"]))
+        z_par_id = dict(zip(scores["id_conso"].tolist(), scores["z_score"].tolist()))
+
+        anomalies = self.statistique.anomalies_contextuelles(seuil_z=2.0)
+        self.assertEqual(len(anomalies), self.statistique.nombre_anomalies_contextuelles(seuil_z=2.0))
+        for anomalie in anomalies:
+            self.assertGreater(anomalie["z_score"], 2.0)
+            self.assertAlmostEqual(anomalie["z_score"], z_par_id[anomalie["id_conso"]])
+
     def test_consommation_par_source(self):
         # Test with 'JIRAMA'
         total_jirama = self.statistique.consommation_par_source('JIRAMA')
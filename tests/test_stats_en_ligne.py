@@ -0,0 +1,118 @@
+import unittest
+
+import numpy as np
+
+from analysis.stats_en_ligne import EtatStats
+from model.agregat_model import AgregatModel
+from model.consommation_model import ConsommationModel
+from model.stats_model import StatsModel
+from tests.utils_tests import TestCaseBaseTemporaire
+
+class TestEtatStats(unittest.TestCase):
+    def setUp(self):
+        self.valeurs = np.random.default_rng(0).gamma(2.0, 1.5, 1000)
+
+    def assertEtatEgal(self, etat, valeurs):
+        self.assertEqual(etat.n, len(valeurs))
+        self.assertAlmostEqual(etat.moyenne, np.mean(valeurs), places=9)
+        self.assertAlmostEqual(etat.ecart_type, np.std(valeurs), places=9)
+        self.assertAlmostEqual(etat.total, np.sum(valeurs), places=6)
+        self.assertEqual(etat.mini, np.min(valeurs))
+        self.assertEqual(etat.maxi, np.max(valeurs))
+
+    def test_welford_valeur_par_valeur(self):
+        etat = EtatStats()
+        for valeur in self.valeurs:
+            etat.ajouter(valeur)
+        self.assertEtatEgal(etat, self.valeurs)
+
+    def test_fusion_de_morceaux(self):
+        # Morceaux de tailles inégales (dont un vide), fusionnés dans le désordre
+        morceaux = np.split(self.valeurs, [0, 7, 300, 301, 850])
+        etats = [EtatStats.depuis_valeurs(m) for m in morceaux]
+        self.assertEtatEgal(EtatStats.fusionner_tous(reversed(etats)), self.valeurs)
+        self.assertEtatEgal(etats[2].fusionner(etats[4]), np.concatenate([morceaux[2], morceaux[4]]))
+
+    def test_etat_vide(self):
+        self.assertIsNone(EtatStats().vers_dict())
+        self.assertEqual(EtatStats().ecart_type, 0.0)
+        self.assertEqual(EtatStats.depuis_valeurs([np.nan]).n, 0)
+
+class TestStatsModel(TestCaseBaseTemporaire):
+    DONNEES = """
+        INSERT INTO SOURCE_ENERGIE (nom_source, cout_kwh) VALUES ('JIRAMA', 500);
+        INSERT INTO BATIMENT (nom) VALUES ('Bloc A');
+        INSERT INTO TYPE_EQUIPEMENT (nom_type, consommation_theorique) VALUES ('Clim', 1.5);
+        INSERT INTO EQUIPEMENT (nom_equipement, puissance_watt, id_type, id_batiment)
+            VALUES ('Clim 1', 1500, 1, 1), ('Clim 2', 1500, 1, 1);
+        INSERT INTO CONSOMMATION (id_equipement, id_source, date_heure, duree_minutes, energie_kwh)
+            VALUES (1, 1, '2025-01-10 07:00:00', 60, 1.0), (1, 1, '2025-01-10 08:00:00', 60, 3.0);
+    """
+
+    def setUp(self):
+        # La migration remplit STATS_CONSOMMATION depuis les lignes existantes
+        super().setUp()
+        self.model = StatsModel(self.db_path)
+        self.conso_model = ConsommationModel(self.db_path)
+
+    def assertEtatsAJour(self):
+        rows = self.db.fetch_all("SELECT id_equipement, energie_kwh FROM CONSOMMATION")
+        attendus = {}
+        for row in rows:
+            attendus.setdefault(row["id_equipement"], []).append(row["energie_kwh"])
+        etats = self.model.get_etats_par_equipement()
+        self.assertEqual(sorted(etats), sorted(attendus))
+        for id_equipement, valeurs in attendus.items():
+            etat = etats[id_equipement]
+            self.assertEqual(etat.n, len(valeurs))
+            self.assertAlmostEqual(etat.moyenne, np.mean(valeurs), places=9)
+            self.assertAlmostEqual(etat.m2, np.var(valeurs) * len(valeurs), places=9)
+            self.assertEqual((etat.mini, etat.maxi), (min(valeurs), max(valeurs)))
+
+    def test_triggers_insert_update_delete(self):
+        self.assertEtatsAJour()
+        self.conso_model.add_consommation(2, 1, 60, 2.5, "2025-01-11 07:00:00")
+        self.conso_model.add_consommation(1, 1, 60, 7.5, "2025-01-11 08:00:00")
+        self.assertEtatsAJour()
+
+        self.db.execute("UPDATE CONSOMMATION SET energie_kwh = 0.5 WHERE energie_kwh = 7.5")
+        self.assertEtatsAJour()
+        self.db.execute("UPDATE CONSOMMATION SET id_equipement = 2 WHERE energie_kwh = 1.0")
+        self.assertEtatsAJour()
+
+        self.db.execute("DELETE FROM CONSOMMATION WHERE id_equipement = 2")
+        self.assertEtatsAJour()
+        self.assertEqual(self.model.get_etat(2).n, 0)
+
+    def test_etat_global_par_fusion(self):
+        self.conso_model.add_consommations_bulk([
+            (1 + i % 2, 1, 60, float(i % 13), f"2025-02-{1 + i % 28:02d} 12:00:00") for i in range(200)
+        ])
+        valeurs = [row["energie_kwh"] for row in self.db.fetch_all("SELECT energie_kwh FROM CONSOMMATION")]
+        etat = self.model.get_etat()
+        self.assertEqual(etat.n, len(valeurs))
+        self.assertAlmostEqual(etat.moyenne, np.mean(valeurs), places=9)
+        self.assertAlmostEqual(etat.ecart_type, np.std(valeurs), places=9)
+
+    def test_chargement_en_masse_reconstruit_les_stats(self):
+        with AgregatModel(self.db_path).chargement_en_masse():
+            self.conso_model.add_consommations_bulk([
+                (2, 1, 60, float(jour), f"2025-03-{jour:02d} 12:00:00") for jour in range(1, 29)
+            ])
+        self.assertEtatsAJour()
+        self.conso_model.add_consommation(2, 1, 60, 40.0, "2025-03-29 12:00:00")
+        self.assertEtatsAJour()
+
+    def test_stats_energie_sql_sans_annulation(self):
+        # Grandes valeurs peu dispersées : SUM(x²)/n - moyenne² perdrait toute la précision
+        valeurs = 1e6 + np.random.default_rng(0).normal(0.0, 0.01, 500)
+        self.conso_model.add_consommations_bulk([
+            (2, 1, 60, float(v), f"2025-04-{1 + i % 28:02d} 12:00:00") for i, v in enumerate(valeurs)
+        ])
+        stats = self.conso_model.get_stats_energie(id_equipement=2)
+        self.assertEqual(stats["nb_mesures"], len(valeurs))
+        self.assertAlmostEqual(stats["moyenne_kwh"], np.mean(valeurs), places=6)
+        self.assertAlmostEqual(stats["ecart_type"], np.std(valeurs), delta=1e-4)
+
+if __name__ == '__main__':
+    unittest.main()
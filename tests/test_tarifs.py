@@ -0,0 +1,76 @@
+import unittest
+
+import numpy as np
+
+from analysis.tarifs import GrilleTarifaire
+from model.tarif_model import TarifModel
+from tests.utils_tests import TestCaseBaseTemporaire
+
+def _tarif(id_source, date_effet, cout_kwh, heure_debut=0, heure_fin=24):
+    return {"id_source": id_source, "date_effet": date_effet, "cout_kwh": cout_kwh,
+            "heure_debut": heure_debut, "heure_fin": heure_fin}
+
+class TestGrilleTarifaire(unittest.TestCase):
+    def setUp(self):
+        self.tarifs = [
+            _tarif(1, "1970-01-01 00:00:00", 500.0),
+            _tarif(1, "2025-03-01 00:00:00", 600.0),
+            # Pointe 18 h - 22 h à partir de juin ; le reste de la journée garde 600
+            _tarif(1, "2025-06-01 00:00:00", 900.0, 18, 22),
+            _tarif(2, "2025-01-15 00:00:00", 800.0),
+        ]
+        self.grille = GrilleTarifaire(self.tarifs, defauts={1: 1000.0, 2: 750.0})
+
+    def _par_boucle(self, id_source, date):
+        versions = [t for t in self.tarifs if t["id_source"] == id_source
+                    and np.datetime64(t["date_effet"]) <= date]
+        heure = int(date.astype("datetime64[h]").astype(np.int64) % 24)
+        for tarif in reversed(versions):
+            if tarif["heure_debut"] <= heure < tarif["heure_fin"]:
+                return tarif["cout_kwh"]
+        return {1: 1000.0, 2: 750.0}[id_source]
+
+    def test_identique_a_la_recherche_par_boucle(self):
+        rng = np.random.default_rng(0)
+        dates = np.datetime64("2024-12-01T00:00:00") + rng.integers(0, 300 * 86400, 500).astype("timedelta64[s]")
+        sources = rng.integers(1, 3, 500)
+        attendus = [self._par_boucle(s, d) for s, d in zip(sources, dates)]
+        np.testing.assert_array_equal(self.grille.prix(sources, dates), attendus)
+
+    def test_plages_horaires_et_defauts(self):
+        dates = np.array(["2025-07-01T19:30", "2025-07-01T08:00", "2025-01-01T08:00", "NaT"], dtype="datetime64[s]")
+        np.testing.assert_array_equal(self.grille.prix([1, 1, 2, 1], dates), [900.0, 600.0, 750.0, 1000.0])
+        np.testing.assert_array_equal(self.grille.couts([1, 1], dates[:2], [2.0, np.nan]), [1800.0, 0.0])
+        vide = GrilleTarifaire([], defauts={3: 42.0})
+        self.assertEqual(vide.prix([3], dates[:1]).tolist(), [42.0])
+
+class TestTarifModel(TestCaseBaseTemporaire):
+    DONNEES = "INSERT INTO SOURCE_ENERGIE (nom_source, cout_kwh) VALUES ('JIRAMA', 500);"
+
+    def setUp(self):
+        # La migration crée un tarif initial par source existante
+        super().setUp()
+        self.model = TarifModel(self.db_path)
+
+    def test_modifier_le_prix_ne_reecrit_pas_le_passe(self):
+        self.db.execute("INSERT INTO SOURCE_ENERGIE (nom_source, cout_kwh) VALUES ('Groupe', 800)")
+        self.db.execute("UPDATE SOURCE_ENERGIE SET cout_kwh = 700 WHERE nom_source = 'JIRAMA'")
+        tarifs = self.model.get_tarifs()
+        self.assertEqual([(t["id_source"], t["cout_kwh"]) for t in tarifs], [(1, 500.0), (1, 700.0), (2, 800.0)])
+        self.assertEqual(tarifs[0]["date_effet"], "1970-01-01 00:00:00")
+        self.assertTrue(tarifs[1]["date_effet"].endswith(":00:00"))
+
+        grille = self.model.get_grille()
+        self.assertEqual(grille.prix([1], np.array(["2025-01-10T07:00"], dtype="datetime64[s]")).tolist(), [500.0])
+        self.assertEqual(grille.prix([1], np.array(["2100-01-01T00:00"], dtype="datetime64[s]")).tolist(), [700.0])
+
+    def test_tarif_heures_pleines(self):
+        self.assertIsNotNone(self.model.ajouter_tarif(1, 900.0, "2025-06-01", heure_debut=18, heure_fin=22))
+        self.assertIsNone(self.model.ajouter_tarif(1, 900.0, "2025-06-01", heure_debut=22, heure_fin=18))
+        en_vigueur = self.model.get_tarifs_en_vigueur("2025-07-01 00:00:00")
+        self.assertEqual([(t["heure_debut"], t["heure_fin"], t["cout_kwh"]) for t in en_vigueur], [(18, 22, 900.0)])
+        prix = self.model.get_grille().prix([1, 1], np.array(["2025-07-01T20:00", "2025-07-01T09:00"], dtype="datetime64[s]"))
+        self.assertEqual(prix.tolist(), [900.0, 500.0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+"""
+Base SQLite temporaire pour les tests des modèles.
+
+    class TestMonModele(TestCaseBaseTemporaire):
+        DONNEES = "INSERT INTO BATIMENT (nom) VALUES ('Bloc A');"
+
+        def setUp(self):
+            super().setUp() # self.db_path, self.db
+            self.model = MonModele(self.db_path)
+
+La base part du schéma d'origine (model/db.txt) ; les migrations en attente
+s'appliquent à l'ouverture par get_database, après l'insertion de DONNEES
+(ce qui vérifie au passage qu'elles reprennent les lignes existantes).
+"""
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from config.settings import BASE_DIR
+from model.database import get_database
+
+SCHEMA_PATH = BASE_DIR / "model" / "db.txt"
+
+
+def creer_base_temporaire(donnees=None):
+    """Crée une base SQLite temporaire avec le schéma d'origine et le script SQL `donnees`."""
+    fd, db_path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA_PATH.read_text(encoding="utf-8"))
+    if donnees:
+        conn.executescript(donnees)
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+class TestCaseBaseTemporaire(unittest.TestCase):
+    DONNEES = None # Script SQL exécuté avant les migrations
+
+    def setUp(self):
+        self.db_path = creer_base_temporaire(self.DONNEES)
+        self.db = get_database(self.db_path)
+
+    def tearDown(self):
+        self.db.close_all()
+        os.remove(self.db_path)
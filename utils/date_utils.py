@@ -0,0 +1,186 @@
+"""
+Conversions et découpages de dates, scalaires et vectorisés (NumPy).
+
+Les dates sont stockées sans fuseau ; comme strftime('%s') de SQLite, on les
+interprète comme UTC, ce qui conserve l'heure murale lors des allers-retours.
+
+Les fonctions vectorisées travaillent sur des tableaux datetime64 (NaT pour une
+date absente ou invalide) et traitent des millions d'horodatages en un appel :
+
+    dates = parser_iso(["2025-01-10 07:00:00", "2025-01-12T08:30:00"])
+    cles, codes = codes_periode(dates, "semaine")  # (['2025-01-06'], [0, 0])
+    totaux = np.bincount(codes, weights=energies, minlength=len(cles))
+"""
+import calendar
+from datetime import datetime, timedelta
+
+import numpy as np
+
+EPOCH = datetime(1970, 1, 1)
+NAT_EPOCH = np.iinfo(np.int64).min # Représentation entière de NaT
+
+GRAINS = ("heure", "jour", "semaine", "mois", "annee")
+# Unité datetime64 de chaque grain (la semaine est un jour : le lundi)
+UNITES_GRAIN = {"heure": "h", "jour": "D", "semaine": "D", "mois": "M", "annee": "Y"}
+
+
+def vers_epoch(valeur):
+    """
+    Convertit une date en secondes epoch (int).
+
+    Args:
+        valeur: datetime, chaîne ISO ('YYYY-MM-DD HH:MM:SS' ou avec 'T'),
+            np.datetime64, entier epoch ou None.
+
+    Returns:
+        int ou None. Lève ValueError si la chaîne n'est pas une date ISO.
+    """
+    if valeur is None:
+        return None
+    if isinstance(valeur, (int, np.integer)):
+        return int(valeur)
+    if isinstance(valeur, np.datetime64):
+        return int(valeur.astype("datetime64[s]").astype(np.int64))
+    if isinstance(valeur, str):
+        valeur = datetime.fromisoformat(valeur)
+    return calendar.timegm(valeur.timetuple())
+
+
+def epoch_vers_datetime(epoch):
+    """Secondes epoch -> datetime naïf (None si epoch est None)."""
+    if epoch is None:
+        return None
+    return EPOCH + timedelta(seconds=int(epoch))
+
+
+def epochs_vers_datetime64(epochs):
+    """Séquence d'epochs (None accepté) -> tableau datetime64[s] (None -> NaT)."""
+    return np.array([NAT_EPOCH if e is None else e for e in epochs], dtype=np.int64).view("datetime64[s]")
+
+
+def parser_iso(chaines, invalides_en_nat=True):
+    """
+    Convertit des chaînes ISO ('YYYY-MM-DD', 'YYYY-MM-DD HH:MM:SS', séparateur
+    'T' accepté) en datetime64[s], sans passer par datetime.fromisoformat.
+
+    Args:
+        chaines (iterable): Chaînes, datetime ou None (-> NaT).
+        invalides_en_nat (bool): Remplacer les chaînes invalides par NaT au lieu
+            de lever ValueError.
+
+    Returns:
+        np.ndarray: datetime64[s].
+    """
+    if not isinstance(chaines, np.ndarray):
+        chaines = list(chaines)
+    try:
+        return np.asarray(chaines, dtype="datetime64[s]")
+    except ValueError:
+        if not invalides_en_nat:
+            raise
+    # Repli élément par élément, seulement quand une valeur est invalide
+    resultat = np.empty(len(chaines), dtype="datetime64[s]")
+    for i, chaine in enumerate(chaines):
+        try:
+            resultat[i] = np.datetime64(chaine, "s") if chaine is not None else np.datetime64("NaT")
+        except ValueError:
+            resultat[i] = np.datetime64("NaT")
+    return resultat
+
+
+def tronquer(dates, grain):
+    """
+    Tronque des datetime64 au début de l'heure, du jour, de la semaine ISO
+    (lundi), du mois ou de l'année. NaT reste NaT.
+
+    Returns:
+        np.ndarray: datetime64 à l'unité du grain ('h', 'D', 'M' ou 'Y').
+    """
+    if grain not in UNITES_GRAIN:
+        raise ValueError(f"Le grain doit être parmi {', '.join(GRAINS)}.")
+    dates = np.asarray(dates)
+    if grain != "semaine":
+        return dates.astype(f"datetime64[{UNITES_GRAIN[grain]}]")
+    jours = dates.astype("datetime64[D]")
+    return jours - jour_semaine(jours).astype("timedelta64[D]")
+
+
+def heure_du_jour(dates):
+    """Heure 0..23 de chaque date (int8), -1 pour NaT."""
+    dates = np.asarray(dates).astype("datetime64[h]")
+    heures = (dates.view(np.int64) % 24).astype(np.int8)
+    heures[np.isnat(dates)] = -1
+    return heures
+
+
+def jour_semaine(dates):
+    """Jour de la semaine 0 (lundi) .. 6 (dimanche) de chaque date (int8), -1 pour NaT."""
+    jours = np.asarray(dates).astype("datetime64[D]")
+    # Le 1970-01-01 était un jeudi (3)
+    codes = ((jours.view(np.int64) + 3) % 7).astype(np.int8)
+    codes[np.isnat(jours)] = -1
+    return codes
+
+
+def formater_cles(debuts, grain):
+    """
+    Clés texte de périodes déjà tronquées, au format des agrégats SQL :
+    heure 'YYYY-MM-DD HH:00:00', jour et semaine 'YYYY-MM-DD', mois 'YYYY-MM', année 'YYYY'.
+    """
+    if grain == "heure":
+        return np.char.replace(np.datetime_as_string(debuts, unit="s"), "T", " ")
+    return np.datetime_as_string(debuts)
+
+
+def regrouper_periodes(dates, grain):
+    """
+    Regroupe des dates par période en un appel vectorisé.
+
+    Args:
+        dates (array-like): datetime64 (NaT ignoré).
+        grain (str): 'heure', 'jour', 'semaine', 'mois' ou 'annee'.
+
+    Returns:
+        tuple: (debuts, codes) où debuts est le tableau trié des débuts de période
+               présents (datetime64 à l'unité du grain) et codes l'indice de la
+               période de chaque date (int64, -1 pour NaT), prêt pour np.bincount.
+    """
+    debuts = tronquer(dates, grain)
+    valides = ~np.isnat(debuts)
+    entiers = debuts.view(np.int64)[valides]
+    codes = np.full(len(debuts), -1, dtype=np.int64)
+    if not len(entiers):
+        return debuts[:0], codes
+
+    minimum = entiers.min()
+    etendue = int(entiers.max() - minimum) + 1
+    if etendue <= 4 * len(entiers) + 1024:
+        # Périodes contiguës (cas usuel) : table de présence, sans tri
+        decalages = entiers - minimum
+        presentes = np.zeros(etendue, dtype=bool)
+        presentes[decalages] = True
+        rang = np.cumsum(presentes) - 1
+        codes[valides] = rang[decalages]
+        uniques = (np.flatnonzero(presentes) + minimum).view(debuts.dtype)
+    else:
+        uniques, inverse = np.unique(entiers, return_inverse=True)
+        codes[valides] = inverse.ravel()
+        uniques = uniques.view(debuts.dtype)
+    return uniques, codes
+
+
+def codes_periode(dates, grain):
+    """
+    Comme regrouper_periodes, avec les clés texte des périodes (voir formater_cles)
+    au lieu des débuts datetime64 : (cles, codes).
+    """
+    debuts, codes = regrouper_periodes(dates, grain)
+    return formater_cles(debuts, grain), codes
+
+
+def cles_periode(dates, grain):
+    """Clé de période de chaque date (tableau de chaînes, '' pour NaT)."""
+    cles, codes = codes_periode(dates, grain)
+    resultat = np.full(len(codes), "", dtype=cles.dtype if len(cles) else "<U1")
+    resultat[codes >= 0] = cles[codes[codes >= 0]]
+    return resultat
@@ -4,8 +4,11 @@ from PySide6.QtGui import QColor # Import QColor
 from datetime import datetime, timedelta
 
 from model.coupure_model import CoupureModel
+from utils.date_utils import epoch_vers_datetime
 from analysis.statistiques import Statistique
 from analysis.efficacite import Efficacite # For new analysis type
+from view.components.indicateur_chargement import IndicateurChargement
+from view.chargement import ChargeurArrierePlan
 
 class AlertesView(QDialog):
     def __init__(self, parent=None):
@@ -17,11 +20,17 @@ class AlertesView(QDialog):
         self.statistique_analyzer = Statistique()
         self.efficacite_analyzer = Efficacite() # Instantiate Efficacite for new analysis
 
+        # Lectures et analyses hors du thread de l'interface
+        self.chargeur = ChargeurArrierePlan(self)
+        self.chargeur.resultat_pret.connect(self._afficher_alertes)
+        self.chargeur.erreur.connect(self._afficher_erreur)
+
         self.main_layout = QVBoxLayout(self)
 
         self._create_filter_fields()
         self._create_alerts_table()
         self._create_buttons() # For potential actions like "Mark as reviewed"
+        self.main_layout.addWidget(IndicateurChargement(self.chargeur, parent=self))
 
         self._load_alerts()
 
@@ -76,14 +85,19 @@ class AlertesView(QDialog):
         # button_layout.addWidget(self.mark_resolved_button)
         self.main_layout.addLayout(button_layout)
 
+    def actualiser(self):
+        """Recharge les alertes (fenêtre réutilisée par le registre de vues)."""
+        self._load_alerts()
+
     def _load_alerts(self):
-        self.table_widget.setRowCount(0)
-        
         date_debut_str = self.date_debut_input.dateTime().toString("yyyy-MM-dd HH:mm:ss") if self.date_debut_input.dateTime().isValid() else None
         date_fin_str = self.date_fin_input.dateTime().toString("yyyy-MM-dd HH:mm:ss") if self.date_fin_input.dateTime().isValid() else None
         selected_alert_type = self.alert_type_combo.currentData()
         selected_status = self.status_combo.currentData()
+        self.chargeur.lancer(self._calculer_alertes, date_debut_str, date_fin_str, selected_alert_type, selected_status)
 
+    def _calculer_alertes(self, date_debut_str, date_fin_str, selected_alert_type, selected_status):
+        # Exécuté dans le pool : aucun accès aux widgets
         all_alerts = []
 
         # 1. Coupures
@@ -92,7 +106,7 @@ class AlertesView(QDialog):
             alert_type = "Coupure"
             status = "Actif" if cp["fin_coupure"] is None else "Résolu"
             description = f"Coupure à {cp['nom_batiment']}. Cause: {cp['cause'] or 'N/A'}"
-            alert_date = datetime.fromisoformat(cp["debut_coupure"])
+            alert_date = epoch_vers_datetime(cp["debut_epoch"])
 
             all_alerts.append({
                 "date": alert_date,
@@ -104,12 +118,14 @@ class AlertesView(QDialog):
             })
 
         # 2. Anomalies Consommation (from Statistique)
-        anomalies_conso = self.statistique_analyzer.anomalies() # Using default factor
+        # Z-score par rapport à la référence de l'équipement à la même heure
+        anomalies_conso = self.statistique_analyzer.anomalies_contextuelles()
         for ano in anomalies_conso:
             alert_type = "Anomalie Consommation"
             status = "Actif" # Anomalies are usually "active" until reviewed
-            description = f"Pic de consommation: {ano['energie_kwh']:.2f} kWh sur {ano['nom_equipement']}"
-            alert_date = datetime.fromisoformat(ano["date_heure"])
+            description = f"Pic de consommation: {ano['energie_kwh']:.2f} kWh sur {ano['nom_equipement']} " \
+                          f"(z = {ano['z_score']:.1f}, habituel {ano['moyenne_reference']:.2f} kWh)"
+            alert_date = epoch_vers_datetime(ano["date_epoch"])
             
             all_alerts.append({
                 "date": alert_date,
@@ -121,6 +137,7 @@ class AlertesView(QDialog):
             })
 
         # 3. Gaspillage Équipement (from Efficacite)
+        self.efficacite_analyzer.calculer_bilan() # Bilan à jour à chaque actualisation
         gaspillage_equip = self.efficacite_analyzer.detecter_gaspillage()
         for gaspil in gaspillage_equip: # Corrected variable name
             alert_type = "Gaspillage Équipement"
@@ -139,31 +156,22 @@ class AlertesView(QDialog):
                 "status": status
             })
             
-        # 4. Consommation élevée pendant les heures de coupure (New analysis to be implemented)
-        # Placeholder for now, will add when analysis is ready
-        # conso_pdt_coupure_alerts = self.efficacite_analyzer.analyze_conso_during_coupure()
-        # for cpc_alert in conso_pdt_coupure_alerts:
-        #     ...
+        # 4. Consommation pendant les coupures du même bâtiment (from Efficacite)
+        all_alerts.extend(self.efficacite_analyzer.analyze_conso_during_coupure())
 
-        # Apply filters
+        # Apply filters (bornes analysées une seule fois, hors de la boucle)
+        date_debut_dt = self._parse_borne(date_debut_str)
+        date_fin_dt = self._parse_borne(date_fin_str)
         filtered_alerts = []
         for alert in all_alerts:
             match = True
             
-            # Filter by Date
-            if date_debut_str:
-                try:
-                    date_debut_dt = datetime.fromisoformat(date_debut_str)
-                    if alert["date"] < date_debut_dt:
-                        match = False
-                except ValueError: pass
-            
-            if date_fin_str:
-                try:
-                    date_fin_dt = datetime.fromisoformat(date_fin_str)
-                    if alert["date"] > date_fin_dt:
-                        match = False
-                except ValueError: pass
+            # Filter by Date (alertes sans date valide conservées)
+            if alert["date"] is not None:
+                if date_debut_dt and alert["date"] < date_debut_dt:
+                    match = False
+                if date_fin_dt and alert["date"] > date_fin_dt:
+                    match = False
 
             # Filter by Type
             if selected_alert_type is not None and alert["type"] != selected_alert_type:
@@ -177,12 +185,15 @@ class AlertesView(QDialog):
                 filtered_alerts.append(alert)
 
         # Sort alerts by date, most recent first
-        filtered_alerts.sort(key=lambda x: x["date"], reverse=True)
+        filtered_alerts.sort(key=lambda x: x["date"] or datetime.min, reverse=True)
+        return filtered_alerts
 
+    def _afficher_alertes(self, filtered_alerts):
         # Populate table
+        self.table_widget.setRowCount(0)
         self.table_widget.setRowCount(len(filtered_alerts))
         for row, alert in enumerate(filtered_alerts):
-            self.table_widget.setItem(row, 0, QTableWidgetItem(alert["date"].strftime("%Y-%m-%d %H:%M")))
+            self.table_widget.setItem(row, 0, QTableWidgetItem(alert["date"].strftime("%Y-%m-%d %H:%M") if alert["date"] else "N/A"))
             self.table_widget.setItem(row, 1, QTableWidgetItem(alert["type"]))
             self.table_widget.setItem(row, 2, QTableWidgetItem(alert["source"]))
             self.table_widget.setItem(row, 3, QTableWidgetItem(alert["equip_bat"]))
@@ -192,6 +203,16 @@ class AlertesView(QDialog):
                 status_item.setForeground(QColor("red"))
             self.table_widget.setItem(row, 5, status_item)
 
+    def _afficher_erreur(self, message):
+        QMessageBox.critical(self, "Erreur", f"Chargement des alertes impossible : {message}")
+
+    @staticmethod
+    def _parse_borne(date_str):
+        try:
+            return datetime.fromisoformat(date_str) if date_str else None
+        except ValueError:
+            return None
+
 if __name__ == '__main__':
     import sys
     import os
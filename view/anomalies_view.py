@@ -6,7 +6,10 @@ from model.equipement_model import EquipementModel
 from model.source_model import SourceModel
 from analysis.statistiques import Statistique
 from view.components.matplotlib_widget import MatplotlibWidget
-from datetime import datetime
+from view.components.indicateur_chargement import IndicateurChargement
+from view.chargement import ChargeurArrierePlan
+from view.components.combos import recharger_combo
+from utils.date_utils import vers_epoch, epochs_vers_datetime64
 
 class AnomaliesView(QDialog):
     def __init__(self, parent=None):
@@ -19,12 +22,18 @@ class AnomaliesView(QDialog):
         self.source_model = SourceModel()
         self.statistique_analyzer = Statistique()
 
+        # Lecture des colonnes et détection hors du thread de l'interface
+        self.chargeur = ChargeurArrierePlan(self)
+        self.chargeur.resultat_pret.connect(self._afficher_anomalies)
+        self.chargeur.erreur.connect(self._afficher_erreur)
+
         self.main_layout = QVBoxLayout(self)
 
         self._create_filter_fields()
         self._create_anomalies_chart_section()
         self._create_anomalies_table()
         self._create_buttons() # For potential actions like "Mark as reviewed"
+        self.main_layout.addWidget(IndicateurChargement(self.chargeur, parent=self))
 
         self._load_anomalies()
 
@@ -59,6 +68,12 @@ class AnomaliesView(QDialog):
 
         self.main_layout.addLayout(filter_layout)
 
+    def actualiser(self):
+        """Recharge les filtres et les anomalies (fenêtre réutilisée par le registre de vues)."""
+        recharger_combo(self.equipement_filter_combo, self._load_equipements_to_combo, garder=1)
+        recharger_combo(self.source_filter_combo, self._load_sources_to_combo, garder=1)
+        self._load_anomalies()
+
     def _load_equipements_to_combo(self):
         equipements = self.equipement_model.get_all_equipements()
         for e in equipements:
@@ -89,20 +104,23 @@ class AnomaliesView(QDialog):
         self.main_layout.addLayout(button_layout)
 
     def _load_anomalies(self):
-        self.table_widget.setRowCount(0)
-        
         date_debut_str = self.date_debut_input.text() or None
         date_fin_str = self.date_fin_input.text() or None
         selected_equipement_id = self.equipement_filter_combo.currentData()
         selected_source_id = self.source_filter_combo.currentData()
+        self.chargeur.lancer(self._calculer_anomalies, date_debut_str, date_fin_str,
+                             selected_equipement_id, selected_source_id)
 
-        all_consos_raw = self.consommation_model.get_all_consommation()
-        
-        filtered_consos_for_table = []
+    def _calculer_anomalies(self, date_debut_str, date_fin_str, selected_equipement_id, selected_source_id):
+        # Exécuté dans le pool : aucun accès aux widgets
+        # Série complète en colonnes (dates déjà en datetime64, triées)
+        colonnes = self.consommation_model.get_consommation_colonnes()
         
-        # Anomalies data from Statistique analyzer
-        all_anomalies_raw = self.statistique_analyzer.anomalies(facteur=2) # Using default factor for now
+        # Anomalies : z-score par équipement et heure, calculé sur les colonnes déjà chargées
+        all_anomalies_raw = self.statistique_analyzer.anomalies_contextuelles(seuil_z=2.0, colonnes=colonnes)
 
+        debut_epoch = self._parse_borne(date_debut_str)
+        fin_epoch = self._parse_borne(date_fin_str)
         filtered_anomalies = []
         
         for anomaly in all_anomalies_raw:
@@ -115,30 +133,22 @@ class AnomaliesView(QDialog):
             if selected_source_id is not None and anomaly["id_source"] != selected_source_id:
                 match = False
 
-            # Convert date_heure to datetime object for proper comparison and aggregation
-            conso_datetime = datetime.fromisoformat(anomaly["date_heure"])
-            
-            # Filter by Date (using datetime objects)
-            if date_debut_str:
-                try:
-                    date_debut_dt = datetime.fromisoformat(date_debut_str)
-                    if conso_datetime < date_debut_dt:
-                        match = False
-                except ValueError:
-                    pass
-            
-            if date_fin_str:
-                try:
-                    date_fin_dt = datetime.fromisoformat(date_fin_str)
-                    if conso_datetime > date_fin_dt:
-                        match = False
-                except ValueError:
-                    pass
+            # Filter by Date (comparaison d'entiers epoch)
+            conso_epoch = anomaly["date_epoch"]
+            if conso_epoch is not None:
+                if debut_epoch is not None and conso_epoch < debut_epoch:
+                    match = False
+                if fin_epoch is not None and conso_epoch > fin_epoch:
+                    match = False
             
             if match:
                 filtered_anomalies.append(anomaly)
-                
+        return colonnes, filtered_anomalies
+
+    def _afficher_anomalies(self, resultat):
+        colonnes, filtered_anomalies = resultat
         # Populate table
+        self.table_widget.setRowCount(0)
         self.table_widget.setRowCount(len(filtered_anomalies))
         for row, anomaly in enumerate(filtered_anomalies):
             self.table_widget.setItem(row, 0, QTableWidgetItem(str(anomaly["id_conso"])))
@@ -146,30 +156,37 @@ class AnomaliesView(QDialog):
             self.table_widget.setItem(row, 2, QTableWidgetItem(anomaly["nom_source"]))
             self.table_widget.setItem(row, 3, QTableWidgetItem(anomaly["date_heure"]))
             self.table_widget.setItem(row, 4, QTableWidgetItem(f"{anomaly['energie_kwh']:.2f}"))
-            # Z-score calculation might be needed here or passed from Statistique
-            self.table_widget.setItem(row, 5, QTableWidgetItem("N/A")) # Placeholder for Z-score
+            self.table_widget.setItem(row, 5, QTableWidgetItem(f"{anomaly['z_score']:.2f}"))
 
         # Draw chart
-        self._draw_anomalies_chart(all_consos_raw, filtered_anomalies)
+        self._draw_anomalies_chart(colonnes, filtered_anomalies)
 
-    def _draw_anomalies_chart(self, all_consos, anomalies_to_highlight):
+    def _afficher_erreur(self, message):
+        QMessageBox.critical(self, "Erreur", f"Chargement des anomalies impossible : {message}")
+
+    @staticmethod
+    def _parse_borne(date_str):
+        try:
+            return vers_epoch(date_str) if date_str else None
+        except ValueError:
+            return None
+
+    def _draw_anomalies_chart(self, colonnes, anomalies_to_highlight):
         fig = self.anomalies_chart.get_figure()
         fig.clear()
         ax = fig.add_subplot(111)
 
-        if not all_consos:
+        if len(colonnes["date_heure"]) == 0:
             ax.text(0.5, 0.5, "Aucune donnée de consommation\nà afficher pour les anomalies", ha='center', va='center', transform=ax.transAxes)
             fig.tight_layout()
             self.anomalies_chart.canvas.draw_idle()
             return
             
-        all_consos.sort(key=lambda x: datetime.fromisoformat(x['date_heure']))
-        
-        dates = [datetime.fromisoformat(item['date_heure']) for item in all_consos]
-        energies = [item['energie_kwh'] for item in all_consos]
+        dates = colonnes["date_heure"]
+        energies = colonnes["energie_kwh"]
         
         # Prepare anomaly data for plotting
-        anomaly_dates = [datetime.fromisoformat(item['date_heure']) for item in anomalies_to_highlight]
+        anomaly_dates = epochs_vers_datetime64([item['date_epoch'] for item in anomalies_to_highlight])
         anomaly_energies = [item['energie_kwh'] for item in anomalies_to_highlight]
 
         ax.plot(dates, energies, label='Consommation Normale', color='blue', alpha=0.7, zorder=1)
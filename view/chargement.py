@@ -0,0 +1,177 @@
+"""
+Chargement des données hors du thread de l'interface.
+
+Les requêtes et les analyses (bilan d'efficacité, anomalies, coûts...) prennent
+de quelques millisecondes à plusieurs secondes selon la taille de la base ; les
+lancer dans un slot bloquait la fenêtre. ChargeurArrierePlan exécute une
+fonction dans un QThreadPool et renvoie son résultat au thread de l'interface
+par signal :
+
+    self.chargeur = ChargeurArrierePlan(self)
+    self.chargeur.resultat_pret.connect(self._afficher_alertes)
+    self.chargeur.lancer(self._calculer_alertes, date_debut, date_fin)
+
+La fonction lancée ne doit pas toucher aux widgets : on lit les filtres avant
+de lancer, et on remplit les widgets dans le slot qui reçoit le résultat.
+
+Chaque lancement reçoit un jeton ; relancer (changement de filtre) rend les
+tâches précédentes obsolètes. Celles qui n'ont pas démarré sont retirées de la
+file, et le résultat de celle en cours est ignoré. Une fonction lancée avec
+avec_progression=True reçoit un rappel progression(pourcentage) qui lève
+TacheAnnulee dès qu'elle est obsolète, ce qui l'interrompt entre deux étapes.
+
+Les connexions SQLite étant propres à chaque thread (voir model.database), les
+modèles peuvent être utilisés tels quels depuis la tâche ; les connexions
+ouvertes par la tâche sont fermées à sa fin.
+"""
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QCoreApplication, Signal, Slot
+
+from model.database import fermer_connexions_du_thread
+
+
+class TacheAnnulee(Exception):
+    """Levée par le rappel de progression d'une tâche devenue obsolète."""
+
+
+class _Relais(QObject):
+    # Émis depuis le thread de la tâche, reçus (en file) dans le thread du chargeur
+    termine = Signal(int, object)
+    echec = Signal(int, str)
+    avance = Signal(int, int)
+
+
+class _Tache(QRunnable):
+    def __init__(self, jeton, relais, fonction, args, kwargs):
+        super().__init__()
+        self.jeton = jeton
+        self.relais = relais
+        self.fonction = fonction
+        self.args = args
+        self.kwargs = kwargs
+
+    def run(self):
+        try:
+            resultat = self.fonction(*self.args, **self.kwargs)
+        except TacheAnnulee:
+            return
+        except Exception as e:
+            self._emettre(self.relais.echec, str(e))
+            return
+        finally:
+            # Le thread du pool ne garde pas sa connexion d'une tâche à l'autre
+            fermer_connexions_du_thread()
+        self._emettre(self.relais.termine, resultat)
+
+    def _emettre(self, signal, valeur):
+        try:
+            signal.emit(self.jeton, valeur)
+        except RuntimeError:
+            pass # Vue détruite pendant le calcul : plus personne à prévenir
+
+
+class ChargeurArrierePlan(QObject):
+    resultat_pret = Signal(object)
+    erreur = Signal(str)
+    en_cours = Signal(bool)
+    progression = Signal(int) # Pourcentage, pour les tâches lancées avec_progression
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Un thread par chargeur : les tâches d'une vue s'exécutent dans l'ordre,
+        # les vues se chargent en parallèle
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self._jeton = 0
+        self._occupe = False
+
+        self._relais = _Relais(self)
+        self._relais.termine.connect(self._on_termine)
+        self._relais.echec.connect(self._on_echec)
+        self._relais.avance.connect(self._on_avance)
+
+    @property
+    def occupe(self):
+        """True tant que le dernier lancement n'a pas rendu son résultat."""
+        return self._occupe
+
+    def lancer(self, fonction, *args, avec_progression=False, **kwargs):
+        """
+        Exécute fonction(*args, **kwargs) dans le pool ; le résultat arrive par
+        resultat_pret (ou erreur) si aucun autre lancement n'a eu lieu entre-temps.
+
+        Args:
+            avec_progression (bool): Passe aussi progression=rappel(pourcentage)
+                à la fonction (voir TacheAnnulee).
+
+        Returns:
+            int: Jeton du lancement.
+        """
+        self._jeton += 1
+        jeton = self._jeton
+        self.pool.clear() # Les tâches obsolètes pas encore démarrées ne tourneront pas
+        if avec_progression:
+            kwargs["progression"] = self._rappel_progression(jeton)
+        self._changer_etat(True)
+        self.pool.start(_Tache(jeton, self._relais, fonction, args, kwargs))
+        return jeton
+
+    def _rappel_progression(self, jeton):
+        relais = self._relais
+
+        def progression(pourcentage):
+            # Appelé depuis la tâche : lit le jeton courant sans verrou (entier, GIL)
+            if jeton != self._jeton:
+                raise TacheAnnulee()
+            try:
+                relais.avance.emit(jeton, int(pourcentage))
+            except RuntimeError:
+                raise TacheAnnulee()
+
+        return progression
+
+    def annuler(self):
+        """Rend obsolètes toutes les tâches lancées ; leurs résultats seront ignorés."""
+        self._jeton += 1
+        self.pool.clear()
+        self._changer_etat(False)
+
+    def arreter(self):
+        """Annule puis attend la fin de la tâche en cours (fermeture de fenêtre)."""
+        self.annuler()
+        self.pool.waitForDone()
+
+    def attendre(self, delai_ms=-1):
+        """
+        Attend la fin des tâches puis traite les signaux en attente, ce qui
+        délivre le résultat de façon synchrone (tests, scripts).
+
+        Returns:
+            bool: False si le délai a expiré avant la fin des tâches.
+        """
+        fini = self.pool.waitForDone(delai_ms)
+        QCoreApplication.processEvents()
+        return fini
+
+    def _changer_etat(self, occupe):
+        if occupe != self._occupe:
+            self._occupe = occupe
+            self.en_cours.emit(occupe)
+
+    @Slot(int, object)
+    def _on_termine(self, jeton, resultat):
+        if jeton != self._jeton:
+            return
+        self._changer_etat(False)
+        self.resultat_pret.emit(resultat)
+
+    @Slot(int, str)
+    def _on_echec(self, jeton, message):
+        if jeton != self._jeton:
+            return
+        self._changer_etat(False)
+        self.erreur.emit(message)
+
+    @Slot(int, int)
+    def _on_avance(self, jeton, pourcentage):
+        if jeton == self._jeton:
+            self.progression.emit(pourcentage)
@@ -1,9 +1,7 @@
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, QHeaderView
 from PySide6.QtGui import QColor
 
-from model.coupure_model import CoupureModel
-from analysis.statistiques import Statistique
-from datetime import datetime
+from utils.date_utils import epoch_vers_datetime
 from config.colors import AppColors # Import AppColors
 
 class AlertsTable(QWidget):
@@ -13,11 +11,7 @@ class AlertsTable(QWidget):
         self.table_widget = QTableWidget()
         self.layout.addWidget(self.table_widget)
         
-        self.coupure_model = CoupureModel()
-        self.statistique_analyzer = Statistique()
-        
         self.setup_table()
-        self.populate_data()
 
     def setup_table(self):
         self.table_widget.setColumnCount(3)
@@ -26,16 +20,16 @@ class AlertsTable(QWidget):
         self.table_widget.verticalHeader().setVisible(False)
         self.table_widget.setEditTriggers(QTableWidget.NoEditTriggers) # Make table read-only
 
-    def populate_data(self):
-        # Fetch data
-        coupures = self.coupure_model.get_all_coupures()
-        anomalies = self.statistique_analyzer.anomalies()
+    def populate_data(self, snapshot):
+        """Remplit la table depuis un DashboardSnapshot (analysis.dashboard_snapshot)."""
+        coupures = snapshot.coupures
+        anomalies = snapshot.anomalies
         
         # Combine and sort events
         events = []
         for coupure in coupures:
             events.append({
-                "date": datetime.fromisoformat(coupure["debut_coupure"]),
+                "date": epoch_vers_datetime(coupure["debut_epoch"]),
                 "type": "Coupure",
                 "description": f"Coupure à {coupure['nom_batiment']}. Fin: {coupure['fin_coupure'] or 'En cours'}. Cause: {coupure['cause'] or 'N/A'}",
                 "severity": "high"
@@ -43,9 +37,9 @@ class AlertsTable(QWidget):
             
         for anomalie in anomalies:
             events.append({
-                "date": datetime.fromisoformat(anomalie["date_heure"]),
+                "date": epoch_vers_datetime(anomalie["date_epoch"]),
                 "type": "Anomalie",
-                "description": f"Pic de consommation sur {anomalie['nom_equipement']}: {anomalie['energie_kwh']:.2f} kWh",
+                "description": f"Pic de consommation sur {anomalie['nom_equipement']}: {anomalie['energie_kwh']:.2f} kWh (z = {anomalie['z_score']:.1f})",
                 "severity": "medium"
             })
 
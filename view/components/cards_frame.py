@@ -2,9 +2,6 @@ from PySide6.QtWidgets import QWidget, QHBoxLayout, QVBoxLayout, QLabel
 from PySide6.QtGui import QFont
 from PySide6.QtCore import Qt
 
-from analysis.couts import Couts
-from analysis.statistiques import Statistique
-from model.coupure_model import CoupureModel
 from config.colors import AppColors # Import AppColors
 
 class CardWidget(QWidget):
@@ -51,20 +48,14 @@ class CardsFrame(QWidget):
         self.layout.addWidget(self.cost_card)
         self.layout.addWidget(self.alerts_card)
 
-        # Initialize models and analyzers
-        self.coupure_model = CoupureModel()
-        self.couts_analyzer = Couts()
-        self.statistique_analyzer = Statistique()
-        
-    def update_data(self):
+    def update_data(self, snapshot):
+        """Met à jour les cartes depuis un DashboardSnapshot (analysis.dashboard_snapshot)."""
         # 1. Update Current Source Status
         # Simplified: Check for ongoing coupures. If yes, Groupe, else JIRAMA.
-        current_coupures = self.coupure_model.get_current_coupures()
-        current_source = "Groupe électrogène" if current_coupures else "JIRAMA"
-        self.source_card.set_value(current_source)
+        self.source_card.set_value(snapshot.source_actuelle)
         
         # 2. Update Total Monthly Cost
-        couts_par_mois = self.couts_analyzer.calculer_cout_par_periode(periode='mois')
+        couts_par_mois = snapshot.couts_par_mois
         # Assuming we are in the current month
         current_month_key = list(couts_par_mois.keys())[-1] if couts_par_mois else "N/A"
         total_cost_month = f"{couts_par_mois.get(current_month_key, 0):,.2f} Ariary"
@@ -72,9 +63,7 @@ class CardsFrame(QWidget):
         
         # 3. Update Critical Alerts Count
         # (ongoing coupures + anomalies)
-        num_ongoing_coupures = len(current_coupures)
-        num_anomalies = len(self.statistique_analyzer.anomalies())
-        total_alerts = num_ongoing_coupures + num_anomalies
+        total_alerts = snapshot.nombre_alertes
         self.alerts_card.set_value(total_alerts)
         
         # Style alerts card based on value
@@ -0,0 +1,19 @@
+def recharger_combo(combo, remplir, garder=0):
+    """
+    Recharge une liste déroulante d'une fenêtre réutilisée sans perdre la sélection.
+
+    Args:
+        combo (QComboBox): Liste à recharger.
+        remplir (callable): Ajoute les éléments (les méthodes _load_*_to_combo des vues).
+        garder (int): Nombre d'éléments fixes en tête à conserver (ex. "Tous").
+    """
+    selection = combo.currentData()
+    combo.blockSignals(True) # Pas de rechargement des données à chaque élément ajouté
+    try:
+        while combo.count() > garder:
+            combo.removeItem(garder)
+        remplir()
+        index = combo.findData(selection) if selection is not None else -1
+        combo.setCurrentIndex(max(index, 0))
+    finally:
+        combo.blockSignals(False)
@@ -0,0 +1,32 @@
+from PySide6.QtWidgets import QProgressBar
+
+
+class IndicateurChargement(QProgressBar):
+    """
+    Barre de progression affichée tant qu'un des chargeurs suivis travaille
+    (voir view.chargement). Indéterminée jusqu'au premier pourcentage reçu.
+    """
+
+    def __init__(self, *chargeurs, parent=None):
+        super().__init__(parent)
+        self.setTextVisible(False)
+        self.setMaximumHeight(12)
+        self.setMaximumWidth(200)
+        self._chargeurs = []
+        for chargeur in chargeurs:
+            self.suivre(chargeur)
+        self.hide()
+
+    def suivre(self, chargeur):
+        self._chargeurs.append(chargeur)
+        chargeur.en_cours.connect(self._on_en_cours)
+        chargeur.progression.connect(self._on_progression)
+
+    def _on_en_cours(self, actif):
+        if actif:
+            self.setRange(0, 0) # Mode indéterminé (animation)
+        self.setVisible(any(chargeur.occupe for chargeur in self._chargeurs))
+
+    def _on_progression(self, pourcentage):
+        self.setRange(0, 100)
+        self.setValue(pourcentage)
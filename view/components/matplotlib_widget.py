@@ -1,14 +1,37 @@
 from PySide6.QtWidgets import QWidget, QVBoxLayout
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
 
 class MatplotlibWidget(QWidget):
+    """
+    Zone de graphique matplotlib. La figure et son canevas ne sont créés qu'au
+    premier accès : matplotlib (la plus grosse partie des imports de l'application)
+    n'est importé qu'au premier tracé, après l'affichage de la fenêtre.
+    """
+
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.figure = Figure()
-        self.canvas = FigureCanvas(self.figure)
+        self._figure = None
+        self._canvas = None
         self.layout = QVBoxLayout(self)
-        self.layout.addWidget(self.canvas)
+
+    def _creer_canevas(self):
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+        from matplotlib.figure import Figure
+
+        self._figure = Figure()
+        self._canvas = FigureCanvas(self._figure)
+        self.layout.addWidget(self._canvas)
+
+    @property
+    def figure(self):
+        if self._figure is None:
+            self._creer_canevas()
+        return self._figure
+
+    @property
+    def canvas(self):
+        if self._canvas is None:
+            self._creer_canevas()
+        return self._canvas
 
     def get_figure(self):
         return self.figure
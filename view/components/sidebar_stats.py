@@ -1,8 +1,6 @@
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel
 import numpy as np
 from view.components.matplotlib_widget import MatplotlibWidget
-from analysis.couts import Couts
-from analysis.efficacite import Efficacite
 from config.colors import AppColors # Import AppColors
 
 class SidebarStats(QWidget):
@@ -18,23 +16,17 @@ class SidebarStats(QWidget):
         # --- Top Equipments Chart ---
         self.top_equip_chart = MatplotlibWidget(self)
         self.layout.addWidget(self.top_equip_chart)
-        
-        # --- Analysis instances ---
-        self.couts_analyzer = Couts()
-        self.efficacite_analyzer = Efficacite()
-
-        self.draw_charts()
 
-    def draw_charts(self):
-        self.draw_source_distribution()
-        self.draw_top_equipments()
+    def draw_charts(self, snapshot):
+        """Trace les graphiques depuis un DashboardSnapshot (analysis.dashboard_snapshot)."""
+        self.draw_source_distribution(snapshot.comparaison_couts)
+        self.draw_top_equipments(snapshot.top_equipements)
     
-    def draw_source_distribution(self):
+    def draw_source_distribution(self, data):
         fig = self.source_dist_chart.get_figure()
         fig.clear()
         ax = fig.add_subplot(111)
         
-        data = self.couts_analyzer.comparer_couts_sources()
         sources = [key for key in data.keys() if key != "difference"]
         couts = [data[key] for key in sources]
 
@@ -48,7 +40,7 @@ class SidebarStats(QWidget):
         ax.set_title("Répartition des Coûts par Source")
         self.source_dist_chart.canvas.draw_idle()
 
-    def draw_top_equipments(self):
+    def draw_top_equipments(self, data):
         fig = self.top_equip_chart.get_figure()
         fig.clear()
         
@@ -59,8 +51,6 @@ class SidebarStats(QWidget):
 
         ax = fig.add_subplot(111)
 
-        data = self.efficacite_analyzer.get_equipements_plus_energivores(top_n=5)
-        
         if not data:
             ax.text(0.5, 0.5, "Données d'équipements\nindisponibles", ha='center', va='center', transform=ax.transAxes)
         else:
@@ -5,6 +5,7 @@ from datetime import datetime # Moved this import to the top
 from model.consommation_model import ConsommationModel
 from model.equipement_model import EquipementModel
 from model.source_model import SourceModel
+from view.components.combos import recharger_combo
 
 class ConsommationAddView(QDialog):
     def __init__(self, parent=None):
@@ -63,6 +64,11 @@ class ConsommationAddView(QDialog):
         energie_layout.addWidget(self.energie_input)
         self.main_layout.addLayout(energie_layout)
 
+    def actualiser(self):
+        """Recharge les listes (fenêtre réutilisée par le registre de vues)."""
+        recharger_combo(self.equipement_combo, self._load_equipements_to_combo)
+        recharger_combo(self.source_combo, self._load_sources_to_combo)
+
     def _load_equipements_to_combo(self):
         equipements = self.equipement_model.get_all_equipements()
         self.equipement_combo.clear()
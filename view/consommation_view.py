@@ -1,14 +1,17 @@
 from PySide6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget, QTableWidgetItem, QHeaderView, QLineEdit, QLabel, QComboBox, QMessageBox, QDateTimeEdit
 from PySide6.QtCore import Qt, QDateTime
-from datetime import datetime # Import datetime for date parsing
 
 from model.consommation_model import ConsommationModel
 from model.equipement_model import EquipementModel
 from model.source_model import SourceModel
-from analysis.statistiques import Statistique # Import Statistique for aggregation
 from view.components.matplotlib_widget import MatplotlibWidget # Import MatplotlibWidget
+from view.components.indicateur_chargement import IndicateurChargement
+from view.chargement import ChargeurArrierePlan
+from view.components.combos import recharger_combo
 
 class ConsommationView(QDialog):
+    TAILLE_PAGE = 200
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Suivi de Consommation")
@@ -17,7 +20,19 @@ class ConsommationView(QDialog):
         self.consommation_model = ConsommationModel()
         self.equipement_model = EquipementModel()
         self.source_model = SourceModel()
-        self.statistique_analyzer = Statistique() # Instantiate Statistique
+
+        # État de la pagination par clé de la table
+        self._filtres = {}
+        self._curseur_page = None
+        self._derniere_page_chargee = True
+
+        # Requêtes hors du thread de l'interface : première page + graphique, puis pages suivantes
+        self.chargeur = ChargeurArrierePlan(self)
+        self.chargeur.resultat_pret.connect(self._afficher_consommations)
+        self.chargeur.erreur.connect(self._afficher_erreur)
+        self.chargeur_page = ChargeurArrierePlan(self)
+        self.chargeur_page.resultat_pret.connect(self._afficher_page)
+        self.chargeur_page.erreur.connect(self._afficher_erreur)
 
         self.main_layout = QVBoxLayout(self)
 
@@ -25,6 +40,7 @@ class ConsommationView(QDialog):
         self._create_aggregation_graph_section() # New method for graph
         self._create_table_widget()
         self._create_buttons()
+        self.main_layout.addWidget(IndicateurChargement(self.chargeur, self.chargeur_page, parent=self))
         self._load_consommations()
 
     def _create_filter_fields(self):
@@ -84,6 +100,12 @@ class ConsommationView(QDialog):
 
         self.main_layout.addLayout(graph_section_layout)
 
+    def actualiser(self):
+        """Recharge les filtres et les données (fenêtre réutilisée par le registre de vues)."""
+        recharger_combo(self.equipement_filter_combo, self._load_equipements_to_combo, garder=1)
+        recharger_combo(self.source_filter_combo, self._load_sources_to_combo, garder=1)
+        self._load_consommations()
+
     def _load_equipements_to_combo(self):
         equipements = self.equipement_model.get_all_equipements()
         for e in equipements:
@@ -101,6 +123,7 @@ class ConsommationView(QDialog):
         self.table_widget.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
         self.table_widget.setSelectionBehavior(QTableWidget.SelectRows)
         self.table_widget.setSelectionMode(QTableWidget.SingleSelection)
+        self.table_widget.verticalScrollBar().valueChanged.connect(self._on_table_scrolled)
         self.main_layout.addWidget(self.table_widget)
 
     def _create_buttons(self):
@@ -109,58 +132,58 @@ class ConsommationView(QDialog):
         self.main_layout.addLayout(button_layout)
 
     def _load_consommations(self):
-        self.table_widget.setRowCount(0)
-        
         # Get filter values
         date_debut_str = self.date_debut_input.dateTime().toString("yyyy-MM-dd HH:mm:ss") if self.date_debut_input.dateTime().isValid() else None
         date_fin_str = self.date_fin_input.dateTime().toString("yyyy-MM-dd HH:mm:ss") if self.date_fin_input.dateTime().isValid() else None
-        selected_equipement_id = self.equipement_filter_combo.currentData()
-        selected_source_id = self.source_filter_combo.currentData()
         selected_period = self.aggregation_period_combo.currentData() # Get selected period
 
-        all_consos_raw = self.consommation_model.get_all_consommation()
-        
-        filtered_consos_for_table = []
-        filtered_consos_for_graph = [] # Data in (date_time_obj, energie_kwh) format
-
-        for conso in all_consos_raw:
-            match = True
-            
-            # Filter by Equipement
-            if selected_equipement_id is not None and conso["id_equipement"] != selected_equipement_id:
-                match = False
-            # Filter by Source
-            if selected_source_id is not None and conso["id_source"] != selected_source_id:
-                match = False
-
-            # Convert date_heure to datetime object for proper comparison and aggregation
-            conso_datetime = datetime.fromisoformat(conso["date_heure"])
-            
-            # Filter by Date (using datetime objects)
-            if date_debut_str:
-                try:
-                    date_debut_dt = datetime.fromisoformat(date_debut_str)
-                    if conso_datetime < date_debut_dt:
-                        match = False
-                except ValueError:
-                    pass # Invalid date format, skip filter
-            
-            if date_fin_str:
-                try:
-                    date_fin_dt = datetime.fromisoformat(date_fin_str)
-                    if conso_datetime > date_fin_dt:
-                        match = False
-                except ValueError:
-                    pass # Invalid date format, skip filter
-            
-            if match:
-                filtered_consos_for_table.append(conso)
-                filtered_consos_for_graph.append((conso_datetime, conso["energie_kwh"]))
-
-
-        # Populate table
-        self.table_widget.setRowCount(len(filtered_consos_for_table))
-        for row, conso in enumerate(filtered_consos_for_table):
+        # Les filtres sont appliqués en SQL ; la table est remplie page par page au défilement
+        self._filtres = {
+            "id_equipement": self.equipement_filter_combo.currentData(),
+            "id_source": self.source_filter_combo.currentData(),
+            "date_debut": date_debut_str,
+            "date_fin": date_fin_str,
+        }
+        # Les pages des anciens filtres ne doivent plus arriver dans la table
+        self.chargeur_page.annuler()
+        self._curseur_page = None
+        self._derniere_page_chargee = True # Pas de page suivante avant la première
+        self.chargeur.lancer(self._calculer_consommations, dict(self._filtres), selected_period)
+
+    def _calculer_consommations(self, filtres, periode):
+        # Exécuté dans le pool : aucun accès aux widgets
+        page, curseur = self.consommation_model.rechercher_consommations(taille_page=self.TAILLE_PAGE, **filtres)
+        # Graphique agrégé en SQL sur l'ensemble filtré
+        aggregated_data = self.consommation_model.agreger_consommations(periode=periode, **filtres)
+        return page, curseur, aggregated_data, periode
+
+    def _afficher_consommations(self, resultat):
+        page, curseur, aggregated_data, periode = resultat
+        self.table_widget.setRowCount(0)
+        self._ajouter_page(page, curseur)
+        self._draw_aggregation_graph(aggregated_data, periode)
+
+    def _load_next_page(self):
+        if self._derniere_page_chargee or self.chargeur_page.occupe:
+            return
+        self.chargeur_page.lancer(
+            self.consommation_model.rechercher_consommations,
+            apres=self._curseur_page, taille_page=self.TAILLE_PAGE, **self._filtres
+        )
+
+    def _afficher_page(self, resultat):
+        page, curseur = resultat
+        self._ajouter_page(page, curseur)
+
+    def _ajouter_page(self, page, curseur):
+        self._curseur_page = curseur
+        self._derniere_page_chargee = curseur is None
+
+        # Populate table (ajout à la suite des pages déjà affichées)
+        first_row = self.table_widget.rowCount()
+        self.table_widget.setRowCount(first_row + len(page))
+        for offset, conso in enumerate(page):
+            row = first_row + offset
             self.table_widget.setItem(row, 0, QTableWidgetItem(str(conso["id_conso"])))
             self.table_widget.setItem(row, 1, QTableWidgetItem(conso["nom_equipement"]))
             self.table_widget.setItem(row, 2, QTableWidgetItem(conso["nom_source"]))
@@ -168,21 +191,24 @@ class ConsommationView(QDialog):
             self.table_widget.setItem(row, 4, QTableWidgetItem(str(conso["duree_minutes"])))
             self.table_widget.setItem(row, 5, QTableWidgetItem(str(conso["energie_kwh"])))
             self.table_widget.setItem(row, 6, QTableWidgetItem(conso["batiment"]))
-        
-        # Draw aggregation graph
-        self._draw_aggregation_graph(filtered_consos_for_graph, selected_period)
 
-    def _draw_aggregation_graph(self, consommations, periode):
+    def _afficher_erreur(self, message):
+        QMessageBox.critical(self, "Erreur", f"Chargement des consommations impossible : {message}")
+
+    def _on_table_scrolled(self, value):
+        # Charge la page suivante quand l'utilisateur approche du bas de la table
+        scroll_bar = self.table_widget.verticalScrollBar()
+        if value >= scroll_bar.maximum() - 5:
+            self._load_next_page()
+
+    def _draw_aggregation_graph(self, aggregated_data, periode):
         fig = self.aggregation_chart.get_figure()
         fig.clear()
         ax = fig.add_subplot(111)
 
-        if not consommations:
+        if not aggregated_data:
             ax.text(0.5, 0.5, "Aucune donnée de consommation\nà afficher pour le graphique", ha='center', va='center', transform=ax.transAxes)
         else:
-            # Aggregate data using Statistique analyzer
-            aggregated_data = self.statistique_analyzer.agreger_par_periode(consommations, periode=periode)
-
             dates = list(aggregated_data.keys())
             energies = list(aggregated_data.values())
 
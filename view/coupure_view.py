@@ -4,6 +4,7 @@ from datetime import datetime
 
 from model.coupure_model import CoupureModel
 from model.batiment_model import BatimentModel
+from view.components.combos import recharger_combo
 
 class CoupureView(QDialog):
     def __init__(self, parent=None):
@@ -53,6 +54,11 @@ class CoupureView(QDialog):
         self.main_layout.addLayout(input_layout_bottom)
 
 
+    def actualiser(self):
+        """Recharge la liste des bâtiments et la table (fenêtre réutilisée par le registre de vues)."""
+        recharger_combo(self.batiment_combo, self._load_batiments_to_combo)
+        self._load_coupures()
+
     def _load_batiments_to_combo(self):
         batiments = self.batiment_model.get_all_batiments()
         self.batiment_combo.clear()
@@ -1,10 +1,12 @@
 from PySide6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget, QTableWidgetItem, QHeaderView, QLineEdit, QLabel, QComboBox, QMessageBox, QWidget, QDateTimeEdit
 from PySide6.QtCore import Qt, QDateTime
-from datetime import datetime
-
 from model.coupure_model import CoupureModel
 from model.batiment_model import BatimentModel
 from view.components.matplotlib_widget import MatplotlibWidget # For potential future graphs
+from view.components.indicateur_chargement import IndicateurChargement
+from view.chargement import ChargeurArrierePlan
+from view.components.combos import recharger_combo
+from utils.date_utils import vers_epoch
 
 class CoupuresHistoryView(QDialog):
     def __init__(self, parent=None):
@@ -15,10 +17,15 @@ class CoupuresHistoryView(QDialog):
         self.coupure_model = CoupureModel()
         self.batiment_model = BatimentModel()
 
+        self.chargeur = ChargeurArrierePlan(self)
+        self.chargeur.resultat_pret.connect(self._afficher_coupure_history)
+        self.chargeur.erreur.connect(self._afficher_erreur)
+
         self.main_layout = QVBoxLayout(self)
 
         self._create_filter_fields()
         self._create_history_table()
+        self.main_layout.addWidget(IndicateurChargement(self.chargeur, parent=self))
         # self._create_history_graph() # Optional: for future graph
         self._load_coupure_history()
 
@@ -49,6 +56,11 @@ class CoupuresHistoryView(QDialog):
 
         self.main_layout.addLayout(filter_layout)
 
+    def actualiser(self):
+        """Recharge le filtre et l'historique (fenêtre réutilisée par le registre de vues)."""
+        recharger_combo(self.batiment_filter_combo, self._load_batiments_to_combo, garder=1)
+        self._load_coupure_history()
+
     def _load_batiments_to_combo(self):
         batiments = self.batiment_model.get_all_batiments()
         for b in batiments:
@@ -63,13 +75,18 @@ class CoupuresHistoryView(QDialog):
         self.main_layout.addWidget(self.table_widget)
 
     def _load_coupure_history(self):
-        self.table_widget.setRowCount(0)
-        
         date_debut_str = self.date_debut_input.dateTime().toString("yyyy-MM-dd HH:mm:ss") if self.date_debut_input.dateTime().isValid() else None
         date_fin_str = self.date_fin_input.dateTime().toString("yyyy-MM-dd HH:mm:ss") if self.date_fin_input.dateTime().isValid() else None
         selected_batiment_id = self.batiment_filter_combo.currentData()
+        self.chargeur.lancer(self._calculer_coupure_history, date_debut_str, date_fin_str, selected_batiment_id)
 
+    def _calculer_coupure_history(self, date_debut_str, date_fin_str, selected_batiment_id):
+        # Exécuté dans le pool : aucun accès aux widgets
         all_coupures = self.coupure_model.get_all_coupures()
+
+        # Bornes converties une fois en epoch ; les coupures portent déjà debut_epoch
+        debut_epoch = self._parse_borne(date_debut_str)
+        fin_epoch = self._parse_borne(date_fin_str)
         
         filtered_coupures = []
         for coupure in all_coupures:
@@ -79,30 +96,21 @@ class CoupuresHistoryView(QDialog):
             if selected_batiment_id is not None and coupure["id_batiment"] != selected_batiment_id:
                 match = False
 
-            # Convert debut_coupure to datetime object for proper comparison
-            coupure_debut_dt = datetime.fromisoformat(coupure["debut_coupure"])
-            
             # Filter by Date
-            if date_debut_str:
-                try:
-                    date_debut_dt = datetime.fromisoformat(date_debut_str)
-                    if coupure_debut_dt < date_debut_dt:
-                        match = False
-                except ValueError:
-                    pass
-            
-            if date_fin_str:
-                try:
-                    date_fin_dt = datetime.fromisoformat(date_fin_str)
-                    if coupure_debut_dt > date_fin_dt:
-                        match = False
-                except ValueError:
-                    pass
+            coupure_debut = coupure["debut_epoch"]
+            if coupure_debut is not None:
+                if debut_epoch is not None and coupure_debut < debut_epoch:
+                    match = False
+                if fin_epoch is not None and coupure_debut > fin_epoch:
+                    match = False
             
             if match:
                 filtered_coupures.append(coupure)
+        return filtered_coupures
 
+    def _afficher_coupure_history(self, filtered_coupures):
         # Populate table
+        self.table_widget.setRowCount(0)
         self.table_widget.setRowCount(len(filtered_coupures))
         for row, cp in enumerate(filtered_coupures):
             self.table_widget.setItem(row, 0, QTableWidgetItem(str(cp["id_coupure"])))
@@ -111,6 +119,16 @@ class CoupuresHistoryView(QDialog):
             self.table_widget.setItem(row, 3, QTableWidgetItem(cp["fin_coupure"] or "En cours"))
             self.table_widget.setItem(row, 4, QTableWidgetItem(cp["cause"] or "N/A"))
 
+    def _afficher_erreur(self, message):
+        QMessageBox.critical(self, "Erreur", f"Chargement de l'historique impossible : {message}")
+
+    @staticmethod
+    def _parse_borne(date_str):
+        try:
+            return vers_epoch(date_str) if date_str else None
+        except ValueError:
+            return None
+
 
 if __name__ == '__main__':
     import sys
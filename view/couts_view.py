@@ -1,7 +1,9 @@
-from PySide6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QWidget, QScrollArea
+from PySide6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QWidget, QScrollArea, QMessageBox
 from PySide6.QtCore import Qt
 
 from view.components.matplotlib_widget import MatplotlibWidget
+from view.components.indicateur_chargement import IndicateurChargement
+from view.chargement import ChargeurArrierePlan
 from analysis.couts import Couts
 
 class CoutsView(QDialog):
@@ -12,9 +14,15 @@ class CoutsView(QDialog):
 
         self.couts_analyzer = Couts()
 
+        # Coûts calculés hors du thread de l'interface
+        self.chargeur = ChargeurArrierePlan(self)
+        self.chargeur.resultat_pret.connect(self._afficher_donnees)
+        self.chargeur.erreur.connect(self._afficher_erreur)
+
         self.main_layout = QVBoxLayout(self)
 
         self._create_widgets()
+        self.main_layout.addWidget(IndicateurChargement(self.chargeur, parent=self))
         self._update_data()
 
     def _create_widgets(self):
@@ -36,6 +44,11 @@ class CoutsView(QDialog):
         self.comparison_layout.addWidget(self.difference_label)
         self.content_layout.addLayout(self.comparison_layout)
 
+        # Tarifs en vigueur (historique TARIF_SOURCE : les coûts passés gardent leur tarif)
+        self.tarifs_label = QLabel("Tarifs en vigueur: N/A")
+        self.tarifs_label.setWordWrap(True)
+        self.content_layout.addWidget(self.tarifs_label)
+
         # 2. Cost Comparison Graph
         self.cost_comparison_chart = MatplotlibWidget(self)
         self.cost_comparison_chart.setMinimumHeight(300)
@@ -50,9 +63,25 @@ class CoutsView(QDialog):
         self.surcout_coupures_label = QLabel("Surcoût Coupures: N/A")
         self.content_layout.addWidget(self.surcout_coupures_label)
 
+    def actualiser(self):
+        """Recalcule les coûts (fenêtre réutilisée par le registre de vues)."""
+        self._update_data()
+
     def _update_data(self):
+        self.chargeur.lancer(self._calculer_donnees)
+
+    def _calculer_donnees(self):
+        # Exécuté dans le pool : aucun accès aux widgets
+        return {
+            "comparaison": self.couts_analyzer.comparer_couts_sources(),
+            "tarifs": self.couts_analyzer.tarif_model.get_tarifs_en_vigueur(),
+            "couts_par_jour": self.couts_analyzer.calculer_cout_par_periode(periode='jour', repartir=True),
+            "surcout_coupures": self.couts_analyzer.calculer_surcout_coupures(),
+        }
+
+    def _afficher_donnees(self, donnees):
         # Update Comparison Cards
-        comparaison_data = self.couts_analyzer.comparer_couts_sources()
+        comparaison_data = donnees["comparaison"]
         if comparaison_data:
             self.total_jirama_label.setText(f"Coût Total JIRAMA: {comparaison_data['JIRAMA']:.2f} Ariary")
             self.total_groupe_label.setText(f"Coût Total Groupe Électrogène: {comparaison_data['Groupe électrogène']:.2f} Ariary")
@@ -62,16 +91,28 @@ class CoutsView(QDialog):
             self.total_groupe_label.setText("Coût Total Groupe Électrogène: N/A")
             self.difference_label.setText("Différence: N/A")
 
+        self.tarifs_label.setText(self._formater_tarifs(donnees["tarifs"]))
+
         # Draw Cost Comparison Graph
         self._draw_cost_comparison_chart(comparaison_data)
 
         # Draw Cost by Period Graph
-        couts_par_jour_data = self.couts_analyzer.calculer_cout_par_periode(periode='jour')
-        self._draw_cost_by_period_chart(couts_par_jour_data)
+        self._draw_cost_by_period_chart(donnees["couts_par_jour"])
 
         # Update Surcoût Coupures
-        surcout_coupures = self.couts_analyzer.calculer_surcout_coupures()
-        self.surcout_coupures_label.setText(f"Surcoût Coupures (estimation): {surcout_coupures:.2f} Ariary")
+        self.surcout_coupures_label.setText(f"Surcoût Coupures (estimation): {donnees['surcout_coupures']:.2f} Ariary")
+
+    def _afficher_erreur(self, message):
+        QMessageBox.critical(self, "Erreur", f"Calcul des coûts impossible : {message}")
+
+    def _formater_tarifs(self, tarifs):
+        if not tarifs:
+            return "Tarifs en vigueur: N/A"
+        parties = []
+        for tarif in tarifs:
+            plage = "" if (tarif["heure_debut"], tarif["heure_fin"]) == (0, 24) else f" ({tarif['heure_debut']}h-{tarif['heure_fin']}h)"
+            parties.append(f"{tarif['nom_source']}{plage}: {tarif['cout_kwh']:,.2f} Ariary/kWh")
+        return "Tarifs en vigueur: " + " | ".join(parties)
 
     def _draw_cost_comparison_chart(self, comparaison_data):
         fig = self.cost_comparison_chart.get_figure()
@@ -5,6 +5,9 @@ from model.equipement_model import EquipementModel
 from model.type_equipement_model import TypeEquipementModel
 from analysis.efficacite import Efficacite
 from view.components.matplotlib_widget import MatplotlibWidget
+from view.components.indicateur_chargement import IndicateurChargement
+from view.chargement import ChargeurArrierePlan
+from view.components.combos import recharger_combo
 
 class EfficaciteView(QDialog):
     def __init__(self, parent=None):
@@ -16,9 +19,15 @@ class EfficaciteView(QDialog):
         self.type_equipement_model = TypeEquipementModel()
         self.efficacite_analyzer = Efficacite()
 
+        # Bilan calculé hors du thread de l'interface
+        self.chargeur = ChargeurArrierePlan(self)
+        self.chargeur.resultat_pret.connect(self._afficher_donnees)
+        self.chargeur.erreur.connect(self._afficher_erreur)
+
         self.main_layout = QVBoxLayout(self)
 
         self._create_widgets()
+        self.main_layout.addWidget(IndicateurChargement(self.chargeur, parent=self))
         self._update_data()
 
     def _create_widgets(self):
@@ -69,24 +78,42 @@ class EfficaciteView(QDialog):
         self.rendement_type_table.setEditTriggers(QTableWidget.NoEditTriggers)
         self.content_layout.addWidget(self.rendement_type_table)
 
+    def actualiser(self):
+        """Recharge la liste des équipements et le bilan (fenêtre réutilisée par le registre de vues)."""
+        recharger_combo(self.equipement_combo, self._load_equipements_to_combo, garder=1)
+        self._update_data()
+
     def _load_equipements_to_combo(self):
         equipements = self.equipement_model.get_all_equipements()
         for e in equipements:
             self.equipement_combo.addItem(f"{e['nom_equipement']} ({e['nom_batiment']})", e["id_equipement"])
 
     def _update_data(self):
-        self._draw_top_equipments_chart()
-        self._populate_gaspillage_table()
-        self._populate_rendement_type_table()
-        self._update_equipement_analysis() # Update initial selection
-
-    def _draw_top_equipments_chart(self):
+        self.chargeur.lancer(self._calculer_donnees)
+
+    def _calculer_donnees(self):
+        # Exécuté dans le pool : aucun accès aux widgets
+        self.efficacite_analyzer.calculer_bilan() # Une seule passe pour toute la vue
+        return {
+            "top_equipements": self.efficacite_analyzer.get_equipements_plus_energivores(top_n=5),
+            "gaspillage": self.efficacite_analyzer.detecter_gaspillage(),
+            "rendements": self.efficacite_analyzer.get_rendements_par_type(),
+        }
+
+    def _afficher_donnees(self, donnees):
+        self._draw_top_equipments_chart(donnees["top_equipements"])
+        self._populate_gaspillage_table(donnees["gaspillage"])
+        self._populate_rendement_type_table(donnees["rendements"])
+        self._update_equipement_analysis() # Update initial selection (bilan déjà en cache)
+
+    def _afficher_erreur(self, message):
+        QMessageBox.critical(self, "Erreur", f"Calcul de l'efficacité impossible : {message}")
+
+    def _draw_top_equipments_chart(self, data):
         fig = self.top_equip_chart.get_figure()
         fig.clear()
         ax = fig.add_subplot(111)
 
-        data = self.efficacite_analyzer.get_equipements_plus_energivores(top_n=5)
-        
         if not data:
             ax.text(0.5, 0.5, "Aucune donnée d'équipements\nénergivores à afficher", ha='center', va='center', transform=ax.transAxes)
         else:
@@ -127,9 +154,8 @@ class EfficaciteView(QDialog):
             self.efficacite_equip_label.setText("Consommation réelle vs théorique: N/A")
             self.kwh_par_heure_label.setText("kWh par heure d'utilisation: N/A")
 
-    def _populate_gaspillage_table(self):
+    def _populate_gaspillage_table(self, gaspillage_data):
         self.gaspillage_table.setRowCount(0)
-        gaspillage_data = self.efficacite_analyzer.detecter_gaspillage()
         self.gaspillage_table.setRowCount(len(gaspillage_data))
         for row, item in enumerate(gaspillage_data):
             self.gaspillage_table.setItem(row, 0, QTableWidgetItem(item["nom_equipement"]))
@@ -137,17 +163,8 @@ class EfficaciteView(QDialog):
             self.gaspillage_table.setItem(row, 2, QTableWidgetItem(f"{item['conso_theorique_estimee']:.2f}"))
             self.gaspillage_table.setItem(row, 3, QTableWidgetItem(f"{item['pourcentage_ecart']:.2f}%"))
 
-    def _populate_rendement_type_table(self):
+    def _populate_rendement_type_table(self, rendement_data):
         self.rendement_type_table.setRowCount(0)
-        all_types = self.type_equipement_model.get_all_types_equipement()
-        
-        # Calculate rendement for each type
-        rendement_data = []
-        for type_equip in all_types:
-            rendement_info = self.efficacite_analyzer.calculer_rendement_par_type_equipement(type_equip["id_type"])
-            if rendement_info:
-                rendement_data.append(rendement_info)
-
         self.rendement_type_table.setRowCount(len(rendement_data))
         for row, item in enumerate(rendement_data):
             self.rendement_type_table.setItem(row, 0, QTableWidgetItem(item["nom_type"]))
@@ -4,6 +4,7 @@ from PySide6.QtCore import Qt
 from model.equipement_model import EquipementModel
 from model.type_equipement_model import TypeEquipementModel
 from model.batiment_model import BatimentModel # Assuming BatimentModel exists
+from view.components.combos import recharger_combo
 
 class EquipementView(QDialog):
     def __init__(self, parent=None):
@@ -47,6 +48,12 @@ class EquipementView(QDialog):
 
         self.main_layout.addLayout(input_layout)
 
+    def actualiser(self):
+        """Recharge les listes et la table (fenêtre réutilisée par le registre de vues)."""
+        recharger_combo(self.type_equipement_combo, self._load_type_equipements_to_combo)
+        recharger_combo(self.batiment_combo, self._load_batiments_to_combo)
+        self._load_equipements()
+
     def _load_type_equipements_to_combo(self):
         types = self.type_equipement_model.get_all_types_equipement()
         self.type_equipement_combo.clear()
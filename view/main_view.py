@@ -1,5 +1,7 @@
+import time
+
 from PySide6.QtWidgets import QMainWindow, QApplication, QVBoxLayout, QHBoxLayout, QWidget, QLabel, QGridLayout, QComboBox
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, Signal, QTimer
 
 # Import actual MainChart component
 from view.components.main_chart import MainChart
@@ -7,6 +9,10 @@ from view.components.sidebar_stats import SidebarStats
 from view.components.cards_frame import CardsFrame
 from view.components.alerts_table import AlertsTable
 from model.batiment_model import BatimentModel
+from view.components.indicateur_chargement import IndicateurChargement
+from view.chargement import ChargeurArrierePlan
+from model.modification_model import ModificationModel
+from analysis.dashboard_snapshot import DashboardService, DEPENDANCES, champs_a_recalculer
 
 
 class MainView(QMainWindow):
@@ -23,6 +29,15 @@ class MainView(QMainWindow):
     show_simulation_view_triggered = Signal() # Define the new signal
     refresh_all_triggered = Signal() # New signal for refreshing all components
 
+    INTERVALLE_VERIFICATION_MS = 5000
+    # Composant -> (méthode de mise à jour, champs de l'instantané affichés)
+    COMPOSANTS = {
+        "cards_frame": ("update_data", {"coupures", "anomalies", "couts_par_mois"}),
+        "main_chart": ("draw_chart", {"totaux_heure"}),
+        "sidebar_stats": ("draw_charts", {"comparaison_couts", "top_equipements"}),
+        "alerts_table": ("populate_data", {"coupures", "anomalies"}),
+    }
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("SmartEnergyMG - Gestion Intelligente de l'Énergie")
@@ -69,8 +84,25 @@ class MainView(QMainWindow):
         self._create_menu_bar()
         self._load_batiments_to_combo()
         self.building_combo.currentIndexChanged.connect(self._on_building_selected)
+        self.dashboard_service = DashboardService()
+        # L'instantané est calculé hors du thread de l'interface ; un nouveau
+        # rafraîchissement (changement de bâtiment) rend le précédent obsolète
+        self.chargeur = ChargeurArrierePlan(self)
+        self.chargeur.resultat_pret.connect(self._afficher_dashboard)
+        self.chargeur.erreur.connect(self._afficher_erreur_dashboard)
+        self.indicateur_chargement = IndicateurChargement(self.chargeur, parent=self)
+        self.statusBar().addPermanentWidget(self.indicateur_chargement)
+        self._debut_rafraichissement = None
+        self._snapshot = None
+        self._champs_en_attente = set() # Demandés mais pas encore affichés
+        # Actualisation automatique : un tour de minuterie sans écriture en base ne coûte
+        # qu'une lecture des compteurs de JOURNAL_MODIFICATIONS
+        self.modification_model = ModificationModel()
         self.refresh_all_triggered.connect(self._refresh_dashboard_components) # Connect signal to internal method
         self._refresh_dashboard_components() # Initial refresh
+        self.timer_actualisation = QTimer(self)
+        self.timer_actualisation.timeout.connect(self._verifier_modifications)
+        self.timer_actualisation.start(self.INTERVALLE_VERIFICATION_MS)
 
     def _load_batiments_to_combo(self):
         self.building_combo.clear()
@@ -81,7 +113,8 @@ class MainView(QMainWindow):
             self.building_combo.addItem(b["nom"], b["id_batiment"])
 
     def _on_building_selected(self):
-        self._refresh_dashboard_components()
+        # Seule la courbe horaire dépend du bâtiment
+        self._actualiser({"totaux_heure"})
 
     def _create_menu_bar(self):
         menu_bar = self.menuBar()
@@ -135,12 +168,43 @@ class MainView(QMainWindow):
         help_menu.addAction("À propos")
 
     def _refresh_dashboard_components(self):
+        # Rafraîchissement demandé : tout est recalculé, et les écritures déjà faites sont prises en compte
+        self.modification_model.tables_modifiees()
+        self._actualiser(set(DEPENDANCES))
+
+    def _verifier_modifications(self):
+        if self.chargeur.occupe:
+            return # Les écritures seront vues au tour suivant
+        tables = self.modification_model.tables_modifiees()
+        if tables or self._champs_en_attente:
+            self._actualiser(champs_a_recalculer(tables))
+
+    def _actualiser(self, champs):
+        # Les champs d'un calcul remplacé par un plus récent restent à recalculer
+        self._champs_en_attente |= champs
+        if not self._champs_en_attente:
+            return
         building_id = self.building_combo.currentData()
-        # Refresh CardsFrame
-        self.cards_frame.update_data()
-        # Refresh MainChart
-        self.main_chart.draw_chart(building_id)
-        # Refresh SidebarStats
-        self.sidebar_stats.draw_charts()
-        # Refresh AlertsTable
-        self.alerts_table.populate_data()
+        self._debut_rafraichissement = time.perf_counter()
+        self.statusBar().showMessage("Actualisation du tableau de bord...")
+        self.chargeur.lancer(self.dashboard_service.snapshot, building_id, champs=set(self._champs_en_attente),
+                             precedent=self._snapshot, avec_progression=True)
+
+    def _afficher_dashboard(self, snapshot):
+        self._snapshot = snapshot
+        self._champs_en_attente = set()
+        # Seuls les composants qui affichent un champ recalculé sont redessinés
+        for nom, (methode, champs) in self.COMPOSANTS.items():
+            if champs & snapshot.recalcules:
+                getattr(getattr(self, nom), methode)(snapshot)
+        self.statusBar().showMessage(
+            f"Tableau de bord actualisé en {(time.perf_counter() - self._debut_rafraichissement) * 1000:.0f} ms "
+            f"(données : {snapshot.duree_totale * 1000:.0f} ms, {len(snapshot.durees)} étape(s))"
+        )
+
+    def _afficher_erreur_dashboard(self, message):
+        self.statusBar().showMessage(f"Échec de l'actualisation du tableau de bord : {message}")
+
+    def closeEvent(self, event):
+        self.chargeur.arreter()
+        super().closeEvent(event)
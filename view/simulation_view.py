@@ -1,9 +1,14 @@
-from PySide6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLineEdit, QLabel, QMessageBox, QDateTimeEdit
+from PySide6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLineEdit, QLabel, QMessageBox, QDateTimeEdit, QComboBox
 from PySide6.QtCore import Qt, QDateTime
+from PySide6.QtGui import QIntValidator
 from datetime import datetime, timedelta
 
 from analysis.couts import Couts
 from model.consommation_model import ConsommationModel # To get average consumption
+from model.batiment_model import BatimentModel
+from view.chargement import ChargeurArrierePlan
+from view.components.combos import recharger_combo
+from view.components.indicateur_chargement import IndicateurChargement
 
 class SimulationView(QDialog):
     def __init__(self, parent=None):
@@ -14,11 +19,17 @@ class SimulationView(QDialog):
         self.couts_analyzer = Couts()
         self.consommation_model = ConsommationModel() # To get average consumption
 
+        # La simulation Monte Carlo peut prendre plusieurs secondes : hors du thread de l'interface
+        self.chargeur_monte_carlo = ChargeurArrierePlan(self)
+        self.chargeur_monte_carlo.resultat_pret.connect(self._afficher_monte_carlo)
+        self.chargeur_monte_carlo.erreur.connect(self._afficher_erreur_monte_carlo)
+
         self.main_layout = QVBoxLayout(self)
 
         self._create_input_fields()
         self._create_buttons()
         self._create_result_display()
+        self._create_monte_carlo_section()
 
     def _create_input_fields(self):
         # Date/Heure de début de coupure
@@ -51,6 +62,40 @@ class SimulationView(QDialog):
         self.result_label.setAlignment(Qt.AlignCenter)
         self.main_layout.addWidget(self.result_label)
 
+    def _create_monte_carlo_section(self):
+        # Distribution du coût tirée de l'historique des coupures du bâtiment
+        self.main_layout.addWidget(QLabel("Simulation Monte Carlo (historique des coupures):"))
+        mc_layout = QHBoxLayout()
+        self.batiment_combo = QComboBox(self)
+        self.batiment_combo.addItem("Tous les bâtiments", None)
+        self._load_batiments_to_combo()
+        mc_layout.addWidget(self.batiment_combo)
+
+        self.scenarios_input = QLineEdit(self)
+        self.scenarios_input.setText("100000")
+        self.scenarios_input.setPlaceholderText(f"Nombre de scénarios (max {Couts.NB_SCENARIOS_MAX:,})")
+        self.scenarios_input.setValidator(QIntValidator(1, Couts.NB_SCENARIOS_MAX, self))
+        mc_layout.addWidget(self.scenarios_input)
+
+        self.monte_carlo_button = QPushButton("Simulation Monte Carlo", self)
+        self.monte_carlo_button.clicked.connect(self._simulate_monte_carlo)
+        self.chargeur_monte_carlo.en_cours.connect(lambda actif: self.monte_carlo_button.setEnabled(not actif))
+        mc_layout.addWidget(self.monte_carlo_button)
+        self.main_layout.addLayout(mc_layout)
+        self.main_layout.addWidget(IndicateurChargement(self.chargeur_monte_carlo, parent=self))
+
+        self.monte_carlo_label = QLabel("Coût par coupure: N/A")
+        self.monte_carlo_label.setAlignment(Qt.AlignCenter)
+        self.main_layout.addWidget(self.monte_carlo_label)
+
+    def _load_batiments_to_combo(self):
+        for batiment in BatimentModel().get_all_batiments():
+            self.batiment_combo.addItem(batiment["nom"], batiment["id_batiment"])
+
+    def actualiser(self):
+        """Recharge la liste des bâtiments (fenêtre réutilisée par le registre de vues)."""
+        recharger_combo(self.batiment_combo, self._load_batiments_to_combo, garder=1)
+
     def _simulate_impact(self):
         start_datetime = self.start_datetime_input.dateTime().toPython() # Get QDateTime and convert to Python datetime
         duration_str = self.duration_input.text()
@@ -77,6 +122,42 @@ class SimulationView(QDialog):
             self.result_label.setText(f"Erreur de simulation: {error_message}")
             self.result_label.setStyleSheet("color: red; font-size: 16px; font-weight: bold;")
 
+    def _simulate_monte_carlo(self):
+        try:
+            nb_scenarios = int(self.scenarios_input.text())
+            if nb_scenarios <= 0:
+                raise ValueError
+        except ValueError:
+            QMessageBox.warning(self, "Erreur", "Le nombre de scénarios doit être un entier positif.")
+            return
+        if nb_scenarios > Couts.NB_SCENARIOS_MAX:
+            QMessageBox.warning(self, "Erreur", f"Le nombre de scénarios est limité à {Couts.NB_SCENARIOS_MAX:,}.")
+            return
+
+        self.monte_carlo_label.setText("Simulation en cours...")
+        self.monte_carlo_label.setStyleSheet("")
+        self.chargeur_monte_carlo.lancer(
+            self.couts_analyzer.simuler_coupures_monte_carlo, self.batiment_combo.currentData(), nb_scenarios
+        )
+
+    def _afficher_monte_carlo(self, resultat_et_erreur):
+        resultat, error_message = resultat_et_erreur
+        if resultat is None:
+            self.monte_carlo_label.setText(f"Erreur de simulation: {error_message}")
+            self.monte_carlo_label.setStyleSheet("color: red; font-weight: bold;")
+            return
+
+        self.monte_carlo_label.setText(
+            f"{resultat['nb_scenarios']:,} scénarios (durée moyenne {resultat['duree_moyenne_h']:.1f} h) — "
+            f"Moyenne: {resultat['moyenne']:,.2f} | P50: {resultat['p50']:,.2f} | "
+            f"P95: {resultat['p95']:,.2f} | Pire cas: {resultat['pire']:,.2f} Ariary"
+        )
+        self.monte_carlo_label.setStyleSheet("color: green; font-weight: bold;")
+
+    def _afficher_erreur_monte_carlo(self, message):
+        self.monte_carlo_label.setText(f"Erreur de simulation: {message}")
+        self.monte_carlo_label.setStyleSheet("color: red; font-weight: bold;")
+
 if __name__ == '__main__':
     import sys
     import os
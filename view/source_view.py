@@ -66,6 +66,10 @@ class SourceView(QDialog):
 
         self.main_layout.addLayout(button_layout)
 
+    def actualiser(self):
+        """Recharge la table (fenêtre réutilisée par le registre de vues)."""
+        self._load_sources()
+
     def _load_sources(self):
         self.table_widget.setRowCount(0)
         sources = self.source_model.get_all_sources()